@@ -78,6 +78,10 @@ def create_app(config_name=None):
             from app.models.initial_data import init_basic_data
             init_basic_data()
         
+        # 绑定robots.txt缓存，用于持久化缓存的数据库访问
+        from app.services.robots_cache import robots_cache
+        robots_cache.init_app(app)
+        
         # 启动任务调度器
         from app.services.task_scheduler import start_scheduler
         start_scheduler()
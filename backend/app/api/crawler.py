@@ -13,6 +13,11 @@ from datetime import datetime, timedelta
 from app.api import bp
 from app.utils.response import success_response, error_response
 from app.services.crawler_manager import crawler_manager
+from app.services.http_pool import http_pool
+from app.services.dns_cache import dns_cache
+from app.services.detail_fetcher import detail_fetcher
+from app.services.html_decoder import html_decoder
+from app.services.page_archive import page_archive
 
 @bp.route('/crawler/tasks', methods=['GET'])
 def get_crawler_tasks():
@@ -119,7 +124,12 @@ def crawler_health():
         return success_response({
             'status': 'healthy',
             'message': '爬虫系统运行正常',
-            'running_tasks_count': len(running_tasks)
+            'running_tasks_count': len(running_tasks),
+            'http_pool': http_pool.get_stats(),
+            'dns_cache': dns_cache.get_stats(),
+            'detail_fetcher': detail_fetcher.get_stats(),
+            'page_archive': page_archive.get_stats(),
+            'html_decoder': html_decoder.get_stats()
         })
 
     except Exception as e:
@@ -8,6 +8,7 @@
 - 更新医院信息
 - 删除医院
 - 医院官网验证
+- 医院官网批量验证任务
 - 批量操作
 
 作者：MiniMax Agent
@@ -20,9 +21,10 @@ from sqlalchemy import or_, and_
 from datetime import datetime, timedelta
 import hashlib
 from app.api import bp
-from app.models import Hospital, HospitalAlias, Region, TenderRecord
+from app.models import Hospital, HospitalAlias, Region, TenderRecord, ScanHistory
 from app import db
 from app.services.crawler_service import verify_website
+from app.services.verification_job import apply_verification_result, verification_job_manager
 from app.utils.response import success_response, error_response
 
 @bp.route('/hospitals', methods=['GET'])
@@ -104,6 +106,8 @@ def get_hospital(hospital_id):
         'status': hospital.status,
         'verified': hospital.verified,
         'verification_date': hospital.verification_date.isoformat() if hospital.verification_date else None,
+        'ssl_expires_at': hospital.ssl_expires_at.isoformat() if hospital.ssl_expires_at else None,
+        'ssl_issuer': hospital.ssl_issuer,
         'tender_count': hospital.tender_count,
         'description': hospital.description,
         'specialties': hospital.specialties,
@@ -271,14 +275,7 @@ def verify_hospital_website(hospital_id):
         verification_result = verify_website(hospital.website_url)
         
         # 更新医院验证信息
-        hospital.verified = verification_result['is_valid']
-        hospital.verification_date = datetime.utcnow()
-        hospital.last_scan_time = datetime.utcnow()
-        
-        if verification_result['is_valid']:
-            hospital.scan_success_count += 1
-        else:
-            hospital.scan_failed_count += 1
+        apply_verification_result(hospital, verification_result)
         
         db.session.commit()
         
@@ -292,6 +289,86 @@ def verify_hospital_website(hospital_id):
         current_app.logger.error(f'验证医院官网失败: {str(e)}')
         return error_response('验证医院官网失败', 500)
 
+@bp.route('/hospitals/verify-jobs', methods=['POST'])
+def create_verify_job():
+    """创建医院官网批量验证任务"""
+    
+    data = request.get_json() or {}
+    filters = {
+        'unverified_only': bool(data.get('unverified_only', False))
+    }
+    
+    if data.get('region_id'):
+        region = Region.query.get(data['region_id'])
+        if not region:
+            return error_response('指定的行政区不存在', 400)
+        filters['region_id'] = region.id
+    
+    # 验证过期时间：stale_since（ISO时间）或 stale_days（天数）
+    if data.get('stale_since'):
+        try:
+            filters['stale_since'] = datetime.fromisoformat(data['stale_since'])
+        except (TypeError, ValueError):
+            return error_response('stale_since 格式错误，应为ISO时间格式', 400)
+    elif data.get('stale_days'):
+        try:
+            filters['stale_since'] = datetime.utcnow() - timedelta(days=int(data['stale_days']))
+        except (TypeError, ValueError):
+            return error_response('stale_days 必须为整数', 400)
+    
+    if data.get('max_concurrency'):
+        try:
+            filters['max_concurrency'] = max(1, min(int(data['max_concurrency']), 100))
+        except (TypeError, ValueError):
+            return error_response('max_concurrency 必须为整数', 400)
+    
+    try:
+        job = verification_job_manager.create_job(current_app._get_current_object(), filters)
+        
+        return success_response({
+            'job': job.to_dict(),
+            'message': '批量验证任务已启动'
+        }, 201)
+        
+    except RuntimeError as e:
+        return error_response(str(e), 409)
+    except Exception as e:
+        current_app.logger.error(f'创建批量验证任务失败: {str(e)}')
+        return error_response('创建批量验证任务失败', 500)
+
+@bp.route('/hospitals/verify-jobs', methods=['GET'])
+def get_verify_jobs():
+    """获取批量验证任务列表"""
+    
+    return success_response({'jobs': verification_job_manager.get_all_jobs()})
+
+@bp.route('/hospitals/verify-jobs/<job_id>', methods=['GET'])
+def get_verify_job(job_id):
+    """获取批量验证任务进度"""
+    
+    job = verification_job_manager.get_job(job_id)
+    if job:
+        return success_response({'job': job.to_dict()})
+    
+    # 服务重启后内存中的任务已丢失，从扫描历史中查询结果
+    scan = ScanHistory.query.filter_by(task_id=job_id, scan_type='hospital_scan').first()
+    if not scan:
+        return error_response('任务不存在', 404)
+    
+    return success_response({'job': scan.to_dict()})
+
+@bp.route('/hospitals/verify-jobs/<job_id>/cancel', methods=['POST'])
+def cancel_verify_job(job_id):
+    """取消批量验证任务"""
+    
+    if not verification_job_manager.cancel_job(job_id):
+        return error_response('任务不存在或已结束', 400)
+    
+    return success_response({
+        'job_id': job_id,
+        'message': '批量验证任务正在取消'
+    })
+
 @bp.route('/hospitals/statistics', methods=['GET'])
 def get_hospital_statistics():
     """获取医院统计信息"""
@@ -12,9 +12,10 @@ from flask import request, jsonify, current_app
 from sqlalchemy import or_, and_, desc, asc
 from datetime import datetime, timedelta
 from app.api import bp
-from app.models import TenderRecord, Hospital, Region
+from app.models import TenderRecord, Hospital, Region, ScanHistory
 from app import db
 from app.utils.response import success_response, error_response
+from app.services.tender_monitor import tender_monitor
 
 @bp.route('/tenders', methods=['GET'])
 def get_tenders():
@@ -168,6 +169,47 @@ def get_tender(tender_id):
     
     return success_response({'tender': tender_dict})
 
+@bp.route('/tenders/backfill', methods=['POST'])
+def create_tender_backfill():
+    """补抓医院招投标栏目的全部历史分页（后台执行）"""
+    
+    data = request.get_json() or {}
+    hospital = Hospital.query.get(data.get('hospital_id') or 0)
+    if not hospital:
+        return error_response('医院不存在', 404)
+    if not hospital.website_url:
+        return error_response('医院未设置官网地址', 400)
+    
+    max_pages = None
+    if data.get('max_pages'):
+        try:
+            max_pages = max(1, int(data['max_pages']))
+        except (TypeError, ValueError):
+            return error_response('max_pages 必须为整数', 400)
+    
+    try:
+        task_id = tender_monitor.start_backfill(current_app._get_current_object(), hospital.id, max_pages)
+        
+        return success_response({
+            'task_id': task_id,
+            'hospital_id': hospital.id,
+            'message': '招投标补抓任务已启动'
+        }, 202)
+        
+    except Exception as e:
+        current_app.logger.error(f'创建招投标补抓任务失败: {str(e)}')
+        return error_response('创建补抓任务失败', 500)
+
+@bp.route('/tenders/backfill/<task_id>', methods=['GET'])
+def get_tender_backfill(task_id):
+    """获取招投标补抓任务进度"""
+    
+    scan = ScanHistory.query.filter_by(task_id=task_id).first()
+    if not scan:
+        return error_response('任务不存在或尚未开始', 404)
+    
+    return success_response({'task': scan.to_dict()})
+
 @bp.route('/tenders/statistics', methods=['GET'])
 def get_tender_statistics():
     """获取招投标统计信息"""
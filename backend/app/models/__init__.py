@@ -9,9 +9,10 @@
 日期：2025-11-18
 """
 
+import json
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Boolean, Enum, 
+    Column, Integer, BigInteger, String, Text, DateTime, Boolean, Enum, 
     Numeric, ForeignKey, Index, UniqueConstraint, TIMESTAMP
 )
 from sqlalchemy.ext.declarative import declarative_base
@@ -109,6 +110,8 @@ class Hospital(db.Model):
     website_url = Column(String(500), comment='官网地址', unique=True)
     domain_name = Column(String(100), comment='域名')
     is_https = Column(Boolean, default=False, comment='是否使用HTTPS')
+    ssl_expires_at = Column(TIMESTAMP, comment='SSL证书过期时间')
+    ssl_issuer = Column(String(200), comment='SSL证书签发者')
     
     # 分类信息
     hospital_type = Column(HospitalType, default='public', comment='医院类型')
@@ -132,6 +135,14 @@ class Hospital(db.Model):
     verification_date = Column(TIMESTAMP, comment='验证时间')
     last_scan_time = Column(TIMESTAMP, comment='最后扫描时间')
     last_success_scan_time = Column(TIMESTAMP, comment='最后成功扫描时间')
+    next_scan_at = Column(TIMESTAMP, comment='下次招投标扫描时间（为空时立即扫描）')
+    last_tender_scan_at = Column(TIMESTAMP, comment='最后一次招投标扫描时间（官网验证不更新）')
+    
+    # 扫描频率估计
+    publish_rate = Column(Numeric(10, 4), comment='近期招投标发布频率（条/天）')
+    change_rate = Column(Numeric(10, 4), comment='招投标列表变化频率（次/天）')
+    change_events = Column(Numeric(10, 4), comment='每次扫描发现的变化数（指数滑动平均）')
+    scan_interval_days = Column(Numeric(10, 4), comment='招投标扫描间隔天数（指数滑动平均）')
     
     # 统计信息
     tender_count = Column(Integer, default=0, comment='招投标记录数')
@@ -158,6 +169,8 @@ class Hospital(db.Model):
         Index('idx_hospitals_type', 'hospital_type'),
         Index('idx_hospitals_status', 'status'),
         Index('idx_hospitals_scan_time', 'last_scan_time'),
+        Index('idx_hospitals_next_scan', 'status', 'next_scan_at'),
+        Index('idx_hospitals_ssl_expires', 'ssl_expires_at'),
         Index('idx_hospitals_search', 'name', 'official_name', 'address'),
     )
     
@@ -175,6 +188,8 @@ class Hospital(db.Model):
             'website_url': self.website_url,
             'domain_name': self.domain_name,
             'is_https': self.is_https,
+            'ssl_expires_at': self.ssl_expires_at.isoformat() if self.ssl_expires_at else None,
+            'ssl_issuer': self.ssl_issuer,
             'hospital_type': self.hospital_type,
             'hospital_level': self.hospital_level,
             'ownership': self.ownership,
@@ -191,6 +206,10 @@ class Hospital(db.Model):
             'verification_date': self.verification_date.isoformat() if self.verification_date else None,
             'last_scan_time': self.last_scan_time.isoformat() if self.last_scan_time else None,
             'last_success_scan_time': self.last_success_scan_time.isoformat() if self.last_success_scan_time else None,
+            'next_scan_at': self.next_scan_at.isoformat() if self.next_scan_at else None,
+            'last_tender_scan_at': self.last_tender_scan_at.isoformat() if self.last_tender_scan_at else None,
+            'publish_rate': float(self.publish_rate) if self.publish_rate is not None else None,
+            'change_rate': float(self.change_rate) if self.change_rate is not None else None,
             'tender_count': self.tender_count,
             'scan_success_count': self.scan_success_count,
             'scan_failed_count': self.scan_failed_count,
@@ -373,6 +392,9 @@ class ScanHistory(db.Model):
     success_count = Column(Integer, default=0, comment='成功数量')
     failed_count = Column(Integer, default=0, comment='失败数量')
     new_records = Column(Integer, default=0, comment='新记录数')
+    pages_fetched = Column(Integer, default=0, comment='请求页面数')
+    fetches_saved = Column(Integer, default=0, comment='条件请求未修改(304)节省的抓取数')
+    pages_unchanged = Column(Integer, default=0, comment='内容哈希未变化而跳过解析的页面数')
     
     # 结果信息
     records_found = Column(Integer, default=0, comment='发现的记录数')
@@ -415,6 +437,9 @@ class ScanHistory(db.Model):
             'success_count': self.success_count,
             'failed_count': self.failed_count,
             'new_records': self.new_records,
+            'pages_fetched': self.pages_fetched,
+            'fetches_saved': self.fetches_saved,
+            'pages_unchanged': self.pages_unchanged,
             'records_found': self.records_found,
             'hospitals_discovered': self.hospitals_discovered,
             'tenders_found': self.tenders_found,
@@ -423,6 +448,229 @@ class ScanHistory(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class PageFetchState(db.Model):
+    """页面抓取状态表（用于条件请求的增量抓取）"""
+    
+    __tablename__ = 'page_fetch_state'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    url = Column(String(500), unique=True, nullable=False, comment='页面地址')
+    hospital_id = Column(Integer, ForeignKey('hospitals.id'), comment='医院ID')
+    
+    # 缓存校验信息
+    etag = Column(String(200), comment='ETag')
+    last_modified = Column(String(100), comment='Last-Modified')
+    content_length = Column(Integer, comment='内容长度')
+    body_hash = Column(String(64), comment='响应内容哈希（原始字节的SHA-256）')
+    
+    # 抓取统计
+    last_status = Column(Integer, comment='最后一次HTTP状态码')
+    last_fetched_at = Column(TIMESTAMP, comment='最后抓取时间')
+    last_changed_at = Column(TIMESTAMP, comment='最后变化时间')
+    fetch_count = Column(Integer, default=0, comment='抓取次数')
+    not_modified_count = Column(Integer, default=0, comment='未修改(304)次数')
+    
+    created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # 索引
+    __table_args__ = (
+        Index('idx_page_fetch_state_hospital', 'hospital_id'),
+    )
+    
+    def __repr__(self):
+        return f'<PageFetchState {self.url}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'url': self.url,
+            'hospital_id': self.hospital_id,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'content_length': self.content_length,
+            'body_hash': self.body_hash,
+            'last_status': self.last_status,
+            'last_fetched_at': self.last_fetched_at.isoformat() if self.last_fetched_at else None,
+            'last_changed_at': self.last_changed_at.isoformat() if self.last_changed_at else None,
+            'fetch_count': self.fetch_count,
+            'not_modified_count': self.not_modified_count,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class TenderColumn(db.Model):
+    """招投标栏目表（首页识别出的栏目，定时监控直接抓取）"""
+
+    __tablename__ = 'tender_columns'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    hospital_id = Column(Integer, ForeignKey('hospitals.id'), nullable=False, comment='医院ID')
+    url = Column(String(500), nullable=False, comment='栏目地址')
+
+    # 栏目信息
+    title = Column(String(200), comment='栏目名称')
+    section = Column(String(50), comment='栏目类型')
+    source = Column(String(20), comment='识别来源：navigation / content / sitemap / feed')
+    confidence = Column(Numeric(3, 2), default=0, comment='识别置信度')
+    active = Column(Boolean, default=True, comment='最近一次识别时是否仍存在')
+    seen_signatures = Column(Text, comment='上次扫描的列表头部条目签名（JSON数组，用于增量扫描）')
+
+    # 抓取统计
+    miss_count = Column(Integer, default=0, comment='连续未命中次数（抓取失败或无招投标信息）')
+    discovered_at = Column(TIMESTAMP, default=datetime.utcnow, comment='首次识别时间')
+    last_discovered_at = Column(TIMESTAMP, default=datetime.utcnow, comment='最后一次在首页识别到的时间')
+    last_hit_at = Column(TIMESTAMP, comment='最后一次提取到招投标信息的时间')
+    feed_updated_at = Column(TIMESTAMP, comment='站点地图/订阅源中已处理的最新条目更新时间')
+
+    created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # 索引
+    __table_args__ = (
+        UniqueConstraint('hospital_id', 'url', name='uq_tender_column'),
+        Index('idx_tender_columns_hospital', 'hospital_id', 'active'),
+    )
+
+    def __repr__(self):
+        return f'<TenderColumn {self.hospital_id}: {self.url}>'
+
+    def to_column(self):
+        """转换为监控服务使用的栏目字典"""
+        return {
+            'title': self.title,
+            'url': self.url,
+            'section': self.section,
+            'source': self.source,
+            'confidence': float(self.confidence or 0),
+            'signatures': json.loads(self.seen_signatures) if self.seen_signatures else None,
+            'feed_updated_at': self.feed_updated_at,
+        }
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'hospital_id': self.hospital_id,
+            'url': self.url,
+            'title': self.title,
+            'section': self.section,
+            'source': self.source,
+            'confidence': float(self.confidence) if self.confidence is not None else None,
+            'active': self.active,
+            'miss_count': self.miss_count,
+            'discovered_at': self.discovered_at.isoformat() if self.discovered_at else None,
+            'last_discovered_at': self.last_discovered_at.isoformat() if self.last_discovered_at else None,
+            'last_hit_at': self.last_hit_at.isoformat() if self.last_hit_at else None,
+            'feed_updated_at': self.feed_updated_at.isoformat() if self.feed_updated_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class SelectorTemplate(db.Model):
+    """招投标列表选择器模板表（每家医院一个，识别出列表结构后直接按模板提取）"""
+
+    __tablename__ = 'selector_templates'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    hospital_id = Column(Integer, ForeignKey('hospitals.id'), unique=True, nullable=False, comment='医院ID')
+
+    # 模板内容
+    kind = Column(String(20), nullable=False, comment='模板类型：list / table')
+    selector = Column(String(500), nullable=False, comment='招投标行CSS选择器')
+    row_count = Column(Integer, default=0, comment='学习时匹配的行数')
+
+    # 使用统计
+    hit_count = Column(Integer, default=0, comment='模板命中次数')
+    miss_count = Column(Integer, default=0, comment='模板失效次数')
+    learned_at = Column(TIMESTAMP, default=datetime.utcnow, comment='学习时间')
+    last_matched_at = Column(TIMESTAMP, comment='最后命中时间')
+
+    created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SelectorTemplate {self.hospital_id}: {self.selector}>'
+
+    def to_template(self):
+        """转换为提取器使用的模板字典"""
+        return {
+            'kind': self.kind,
+            'selector': self.selector,
+            'row_count': self.row_count,
+        }
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'hospital_id': self.hospital_id,
+            'kind': self.kind,
+            'selector': self.selector,
+            'row_count': self.row_count,
+            'hit_count': self.hit_count,
+            'miss_count': self.miss_count,
+            'learned_at': self.learned_at.isoformat() if self.learned_at else None,
+            'last_matched_at': self.last_matched_at.isoformat() if self.last_matched_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class CrawledUrl(db.Model):
+    """已处理的详情页URL表（跨扫描的抓取边界）"""
+    
+    __tablename__ = 'crawled_urls'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    hospital_id = Column(Integer, ForeignKey('hospitals.id'), nullable=False, comment='医院ID')
+    fingerprint = Column(BigInteger, nullable=False, comment='规范化URL的64位指纹')
+    url = Column(String(500), comment='规范化URL')
+    first_seen_at = Column(TIMESTAMP, default=datetime.utcnow, comment='首次处理时间')
+    
+    # 索引
+    __table_args__ = (
+        UniqueConstraint('hospital_id', 'fingerprint', name='uq_crawled_url'),
+    )
+    
+    def __repr__(self):
+        return f'<CrawledUrl {self.url}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'hospital_id': self.hospital_id,
+            'fingerprint': self.fingerprint,
+            'url': self.url,
+            'first_seen_at': self.first_seen_at.isoformat() if self.first_seen_at else None
+        }
+
+class RobotsCacheEntry(db.Model):
+    """robots.txt缓存表"""
+    
+    __tablename__ = 'robots_cache'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    origin = Column(String(255), unique=True, nullable=False, comment='协议+主机')
+    status_code = Column(Integer, comment='HTTP状态码')
+    content = Column(Text, comment='robots.txt内容')
+    fetched_at = Column(TIMESTAMP, default=datetime.utcnow, comment='抓取时间')
+    expires_at = Column(TIMESTAMP, nullable=False, comment='过期时间')
+    
+    # 索引
+    __table_args__ = (
+        Index('idx_robots_cache_expires', 'expires_at'),
+    )
+    
+    def __repr__(self):
+        return f'<RobotsCacheEntry {self.origin}({self.status_code})>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'origin': self.origin,
+            'status_code': self.status_code,
+            'fetched_at': self.fetched_at.isoformat() if self.fetched_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None
+        }
+
 class Settings(db.Model):
     """系统设置表"""
     
@@ -0,0 +1,156 @@
+"""
+抓取边界
+
+记录哪些URL已经抓取过，避免同一页面以不同形式被重复抓取，包括：
+- 单次扫描内：按URL指纹写入布隆过滤器，每个URL最多抓取一次
+  （位数组按容量和误判率计算，每次扫描使用随机盐值，误判不会在下次扫描重复出现）
+- 跨扫描：已处理的详情页URL指纹持久化到数据库（精确集合），扫描开始时按医院加载，
+  站点地图中没有更新时间的条目不再重复抓取详情页
+- 按医院划分范围：同一次扫描的各医院共享一个布隆过滤器，去重键包含医院ID，
+  多家医院共用同一栏目页面（集团医院、区域采购平台）时各自抓取
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import hashlib
+import math
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config import Config
+from app.services.url_canonical import url_fingerprint
+
+
+class BloomFilter:
+    """布隆过滤器（线程安全）"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, salt: bytes = None):
+        """
+        Args:
+            capacity: 预计写入的元素数，超过后误判率上升
+            error_rate: 达到容量时的误判率
+            salt: 哈希盐值，默认随机生成
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.salt = salt if salt is not None else os.urandom(16)
+        self.count = 0
+
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, value: int):
+        digest = hashlib.blake2b(value.to_bytes(8, 'big', signed=True), digest_size=16, salt=self.salt).digest()
+        # 双重哈希生成k个位置
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, value: int) -> bool:
+        """写入元素，返回写入前是否（可能）已存在"""
+        positions = self._positions(value)
+        with self._lock:
+            present = all(self._bits[position >> 3] & (1 << (position & 7)) for position in positions)
+            if not present:
+                for position in positions:
+                    self._bits[position >> 3] |= 1 << (position & 7)
+                self.count += 1
+        return present
+
+    def __contains__(self, value: int) -> bool:
+        positions = self._positions(value)
+        with self._lock:
+            return all(self._bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+
+class CrawlFrontier:
+    """单次扫描的抓取边界（各抓取线程共享）"""
+
+    def __init__(self, known: Optional[Iterable[Tuple[int, int]]] = None, capacity: int = None,
+                 error_rate: float = None):
+        """
+        Args:
+            known: 之前扫描已处理的URL [(医院ID, URL指纹)]（持久化的精确集合）
+            capacity / error_rate: 布隆过滤器参数，默认读取配置
+        """
+        crawler_config = Config.CRAWLER_CONFIG
+        self.enabled = crawler_config.get('FRONTIER_ENABLED', True)
+        self._seen = BloomFilter(
+            capacity or crawler_config.get('FRONTIER_BLOOM_CAPACITY', 200000),
+            error_rate or crawler_config.get('FRONTIER_BLOOM_ERROR_RATE', 0.001)
+        )
+        self._known = set(known or ())
+        self._lock = threading.Lock()
+
+        self.stats = {'admitted': 0, 'duplicates': 0, 'known_skips': 0}
+
+    def scope(self, hospital_id: int) -> 'FrontierScope':
+        """指定医院范围内的抓取边界"""
+        return FrontierScope(self, hospital_id)
+
+    def admit(self, url: str, hospital_id: int = None) -> bool:
+        """该医院本次扫描是否首次遇到该URL（首次遇到时记入布隆过滤器，调用方随后抓取）"""
+        if not self.enabled:
+            return True
+        fingerprint = url_fingerprint(url)
+        if fingerprint is None:
+            return True
+        duplicate = self._seen.add(_scoped(fingerprint, hospital_id))
+        with self._lock:
+            self.stats['duplicates' if duplicate else 'admitted'] += 1
+        return not duplicate
+
+    def is_known(self, url: str, hospital_id: int = None) -> bool:
+        """URL是否已在该医院之前的扫描中处理过"""
+        if not self.enabled:
+            return False
+        fingerprint = url_fingerprint(url)
+        with self._lock:
+            known = fingerprint is not None and (hospital_id, fingerprint) in self._known
+            if known:
+                self.stats['known_skips'] += 1
+        return known
+
+    def remember(self, url: str, hospital_id: int = None) -> Optional[int]:
+        """记录已处理的URL（调用方负责持久化），返回URL指纹"""
+        fingerprint = url_fingerprint(url)
+        if fingerprint is not None:
+            with self._lock:
+                self._known.add((hospital_id, fingerprint))
+        return fingerprint
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取抓取边界统计"""
+        with self._lock:
+            stats = dict(self.stats, known_urls=len(self._known))
+        stats.update(bloom_entries=self._seen.count, bloom_bytes=(self._seen.size + 7) // 8)
+        return stats
+
+
+class FrontierScope:
+    """单个医院范围内的抓取边界（抓取任务使用）"""
+
+    def __init__(self, frontier: CrawlFrontier, hospital_id: int):
+        self.frontier = frontier
+        self.hospital_id = hospital_id
+
+    def admit(self, url: str) -> bool:
+        return self.frontier.admit(url, self.hospital_id)
+
+    def is_known(self, url: str) -> bool:
+        return self.frontier.is_known(url, self.hospital_id)
+
+    def remember(self, url: str) -> Optional[int]:
+        return self.frontier.remember(url, self.hospital_id)
+
+
+def _scoped(fingerprint: int, hospital_id: Optional[int]) -> int:
+    """布隆过滤器的去重键：URL指纹与医院ID组合"""
+    if hospital_id is None:
+        return fingerprint
+    digest = hashlib.blake2b(f'{hospital_id}|{fingerprint}'.encode('ascii'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
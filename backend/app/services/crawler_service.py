@@ -16,16 +16,24 @@
 
 import requests
 import hashlib
-import ssl
-import socket
 from urllib.parse import urlparse, urljoin
-from urllib import robotparser
 import re
-from bs4 import BeautifulSoup
 import logging
 from datetime import datetime
 import time
 import random
+from typing import Any, Dict, Iterable, List
+
+from app.services.fetch_engine import AsyncFetchEngine, run_batch
+from app.services.politeness import politeness_scheduler
+from app.services.http_pool import http_pool
+from app.services.robots_cache import robots_cache
+from app.services.html_decoder import html_decoder
+from app.services.html_parser import parse_html
+from app.services.keyword_matcher import KeywordAutomaton
+from app.services.stream_reader import is_html_response, looks_binary_url, read_body
+from app.services.tls_inspector import get_peer_certificate, tls_inspector
+from app.services.url_canonical import canonicalize
 
 class CrawlerService:
     """爬虫服务类"""
@@ -35,13 +43,21 @@ class CrawlerService:
         self.config = {
             'timeout': 30,
             'max_retries': 3,
-            'delay_range': (1, 5),
             'user_agents': [
                 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             ]
         }
+        
+        # 医院相关关键词
+        self.hospital_keywords = [
+            '医院', '医疗', '医护', '门诊', '住院', '手术', '医生', '护士',
+            '科室', '急诊', '体检', '挂号', '医保', '药品', '治疗',
+            'hospital', 'medical', 'clinic', 'healthcare', 'doctor'
+        ]
+        # 页面文本已转为小写，关键词同样按小写编译
+        self.hospital_matcher = KeywordAutomaton(keyword.lower() for keyword in self.hospital_keywords)
     
     def verify_website(self, url):
         """
@@ -60,6 +76,7 @@ class CrawlerService:
             'http_status': None,
             'response_time': None,
             'ssl_valid': False,
+            'ssl_info': None,
             'robots_txt_ok': False,
             'content_score': 0,
             'hospital_indicators': [],
@@ -80,16 +97,27 @@ class CrawlerService:
             result['url'] = parsed_url['url']
             
             # 2. HTTP请求
+            if looks_binary_url(parsed_url['url']):
+                result['errors'].append('URL指向非HTML资源')
+                return result
+            
             response = self._make_request(parsed_url['url'])
             if not response:
                 result['errors'].append('无法访问网站')
                 return result
             
+            if response.content_skipped:
+                result['errors'].append('页面内容不是HTML，已跳过下载')
+            elif response.content_truncated:
+                result['errors'].append('页面内容超过大小上限，仅分析了前部内容')
+            
             result['http_status'] = response.status_code
             result['response_time'] = round((time.time() - start_time) * 1000, 2)
             
-            # 3. SSL证书检查
-            result['ssl_valid'] = self._check_ssl_certificate(parsed_url['domain'])
+            # 3. SSL证书检查（优先使用本次HTTPS请求的证书）
+            ssl_info = self._check_ssl_certificate(parsed_url['domain'], response)
+            result['ssl_info'] = ssl_info
+            result['ssl_valid'] = ssl_info['valid']
             
             # 4. robots.txt检查
             result['robots_txt_ok'] = self._check_robots_txt(parsed_url['url'])
@@ -108,16 +136,60 @@ class CrawlerService:
         
         return result
     
+    async def verify_websites_async(self, urls: Iterable[str], max_concurrency: int = None,
+                                    per_host_limit: int = None) -> List[Dict[str, Any]]:
+        """
+        批量并发验证网站
+        
+        Args:
+            urls: 网站URL列表
+            max_concurrency: 全局并发数，默认读取CRAWLER_CONFIG['BATCH_CONCURRENCY']
+            per_host_limit: 单主机并发数，默认读取CRAWLER_CONFIG['PER_HOST_CONCURRENT']
+        
+        Returns:
+            list: 与输入顺序一致的验证结果，格式同verify_website
+        """
+        urls = list(urls)
+        engine = AsyncFetchEngine(max_concurrency, per_host_limit)
+        results = await engine.run(urls, self.verify_website, key_func=self._host_key)
+        
+        # 执行异常的任务补充为失败结果，保持返回格式一致
+        return [
+            result if result is not None else self._failed_result(url, '验证任务执行失败')
+            for url, result in zip(urls, results)
+        ]
+    
+    def _host_key(self, url):
+        """计算URL所属主机，用于单主机并发限制"""
+        parsed_url = self._parse_and_normalize_url(url)
+        return parsed_url['domain'] if parsed_url else (url or '')
+    
+    def _failed_result(self, url, error):
+        """构造失败的验证结果"""
+        return {
+            'is_valid': False,
+            'url': url,
+            'domain': None,
+            'http_status': None,
+            'response_time': None,
+            'ssl_valid': False,
+            'ssl_info': None,
+            'robots_txt_ok': False,
+            'content_score': 0,
+            'hospital_indicators': [],
+            'verification_score': 0,
+            'errors': [error]
+        }
+    
     def _parse_and_normalize_url(self, url):
         """解析和标准化URL"""
         try:
-            # 添加http://如果缺失协议
-            if not url.startswith(('http://', 'https://')):
-                url = 'http://' + url
+            # 补全协议、统一大小写、去掉片段和跟踪参数
+            url = canonicalize(url)
+            if url is None:
+                return None
             
             parsed = urlparse(url)
-            if not parsed.netloc:
-                return None
             
             return {
                 'url': url,
@@ -141,15 +213,30 @@ class CrawlerService:
                 'Upgrade-Insecure-Requests': '1'
             }
             
-            response = requests.get(
+            # 按主机等待礼貌抓取间隔（其他主机的请求不受影响）
+            politeness_scheduler.acquire(urlparse(url).netloc.lower())
+            
+            # 通过按主机的会话池请求，复用keep-alive连接
+            response = http_pool.get(
                 url,
                 headers=headers,
                 timeout=self.config['timeout'],
-                allow_redirects=True
+                allow_redirects=True,
+                stream=True
             )
             
-            # 添加随机延迟
-            time.sleep(random.uniform(*self.config['delay_range']))
+            # 在读取响应体之前取出TLS证书，读取完成后连接会归还连接池
+            response.peer_certificate = get_peer_certificate(response)
+            
+            # 非HTML内容不下载；HTML按字节上限流式读取，限制单个抓取的内存占用
+            response.content_skipped = not is_html_response(response)
+            response.content_truncated = False
+            if response.content_skipped:
+                response.close()
+                response._content = b''
+                response._content_consumed = True
+            else:
+                _, response.content_truncated = read_body(response)
             
             return response
             
@@ -157,35 +244,44 @@ class CrawlerService:
             self.logger.error(f'HTTP请求失败: {str(e)}')
             return None
     
-    def _check_ssl_certificate(self, domain):
-        """检查SSL证书"""
-        try:
-            context = ssl.create_default_context()
-            with socket.create_connection((domain, 443), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
-                    # 简单的证书有效期检查
-                    return True
-        except Exception:
-            return False
+    def _check_ssl_certificate(self, domain, response=None):
+        """
+        检查SSL证书
+        
+        优先读取HTTPS请求所用连接的证书；最终地址不是HTTPS时才独立握手探测，
+        探测结果按域名缓存。
+        
+        Args:
+            domain: 域名（可含端口）
+            response: 本次验证的HTTP响应
+        
+        Returns:
+            dict: 证书信息（valid、not_after、issuer、san、hostname_match等）
+        """
+        if response is not None and urlparse(response.url).scheme == 'https':
+            ssl_info = tls_inspector.from_response(response, urlparse(response.url).hostname)
+            if ssl_info is not None:
+                return ssl_info
+        
+        hostname = urlparse(f'//{domain}').hostname or domain
+        return tls_inspector.probe(hostname)
     
     def _check_robots_txt(self, url):
-        """检查robots.txt"""
+        """检查robots.txt（按协议+主机缓存，避免重复下载）"""
         try:
-            parsed = urlparse(url)
-            robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-            
-            rp = robotparser.RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
-            
-            # 检查是否可以抓取当前页面
-            return rp.can_fetch('*', url)
+            # 检查是否可以抓取当前页面，robots.txt无法获取时视为检查未通过
+            return bool(robots_cache.can_fetch(url))
         except Exception:
             return False
     
-    def _analyze_content(self, response):
-        """分析网页内容"""
+    def _analyze_content(self, response, soup=None):
+        """
+        分析网页内容
+        
+        Args:
+            response: HTTP响应
+            soup: 已解析的DOM，传入时不再重复解析
+        """
         result = {
             'content_score': 0,
             'hospital_indicators': [],
@@ -196,7 +292,10 @@ class CrawlerService:
         
         try:
             # 解析HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            if soup is None:
+                # 先识别编码再解析，避免BeautifulSoup逐个猜测编码
+                html, _ = html_decoder.decode_response(response, urlparse(response.url).netloc.lower())
+                soup = parse_html(html)
             
             # 提取页面标题
             title_tag = soup.find('title')
@@ -208,19 +307,15 @@ class CrawlerService:
             if desc_meta:
                 result['page_description'] = desc_meta.get('content', '').strip()
             
-            # 医院相关关键词
-            hospital_keywords = [
-                '医院', '医疗', '医护', '门诊', '住院', '手术', '医生', '护士',
-                '科室', '急诊', '体检', '挂号', '医保', '药品', '治疗',
-                'hospital', 'medical', 'clinic', 'healthcare', 'doctor'
-            ]
-            
             # 获取页面文本内容
             page_text = soup.get_text().lower()
             
+            # 一次扫描统计全部关键词的出现次数
+            keyword_counts = self.hospital_matcher.counts(page_text)
+            
             # 检查关键词出现情况
-            for keyword in hospital_keywords:
-                count = page_text.count(keyword.lower())
+            for keyword in self.hospital_keywords:
+                count = keyword_counts.get(keyword.lower(), 0)
                 if count > 0:
                     result['hospital_keywords'].append({
                         'keyword': keyword,
@@ -322,6 +417,45 @@ def verify_website(url):
     """
     return crawler_service.verify_website(url)
 
+async def verify_websites_async(urls, max_concurrency=None, per_host_limit=None):
+    """
+    批量并发验证网站URL的快捷函数（异步）
+    
+    Args:
+        urls: 网站URL列表
+        max_concurrency: 全局并发数
+        per_host_limit: 单主机并发数
+    
+    Returns:
+        list: 验证结果列表
+    """
+    return await crawler_service.verify_websites_async(urls, max_concurrency, per_host_limit)
+
+def verify_websites(urls, max_concurrency=None, per_host_limit=None):
+    """
+    批量并发验证网站URL的快捷函数（同步）
+    
+    Args:
+        urls: 网站URL列表
+        max_concurrency: 全局并发数
+        per_host_limit: 单主机并发数
+    
+    Returns:
+        list: 验证结果列表
+    """
+    urls = list(urls)
+    results = run_batch(
+        urls,
+        crawler_service.verify_website,
+        max_concurrency=max_concurrency,
+        per_host_limit=per_host_limit,
+        key_func=crawler_service._host_key
+    )
+    return [
+        result if result is not None else crawler_service._failed_result(url, '验证任务执行失败')
+        for url, result in zip(urls, results)
+    ]
+
 def search_hospitals_websites(hospital_name, region_name=None, max_results=10):
     """
     搜索医院官网的函数（需要集成搜索引擎API）
@@ -0,0 +1,225 @@
+"""
+招投标详情页抓取
+
+列表扫描入库新招投标后，在后台并发抓取详情页并补全字段，包括：
+- 列表扫描只负责入队，不等待详情页抓取
+- 基于异步批量抓取引擎的有限并发（全局并发数和单主机并发数）
+- 按详情页URL缓存提取结果，同一详情页不重复抓取
+- 按完整详情页重新提取预算、截止日期、发布日期和正文，分批更新招投标记录
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+from app import db
+from app.models import TenderRecord
+from app.services.fetch_engine import host_of, run_batch
+from app.services.parse_pool import parse_pool
+from app.services.tender_extractor import tender_extractor
+
+
+class DetailFetchService:
+    """招投标详情页抓取服务"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+        crawler_config = Config.CRAWLER_CONFIG
+        self.enabled = crawler_config.get('DETAIL_FETCH_ENABLED', True)
+        self.max_concurrency = crawler_config.get('DETAIL_CONCURRENCY', 10)
+        self.per_host_limit = crawler_config.get('DETAIL_PER_HOST_CONCURRENT', 1)
+        self.batch_size = crawler_config.get('DETAIL_BATCH_SIZE', 50)
+        self.cache_ttl = crawler_config.get('DETAIL_CACHE_TTL', 86400)
+        self.cache_size = crawler_config.get('DETAIL_CACHE_SIZE', 5000)
+        self.idle_timeout = crawler_config.get('DETAIL_IDLE_TIMEOUT', 60)
+
+        self._queue: 'queue.Queue[Tuple[int, str]]' = queue.Queue(crawler_config.get('DETAIL_QUEUE_SIZE', 10000))
+        self._cache: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+        self.stats = {
+            'queued': 0,
+            'dropped': 0,
+            'fetched': 0,
+            'cache_hits': 0,
+            'failed': 0,
+            'updated': 0,
+        }
+
+    def enqueue(self, app, items: Iterable[Tuple[int, str]]) -> int:
+        """
+        将新招投标的详情页加入抓取队列（立即返回）
+
+        Args:
+            app: Flask应用，后台线程在其上下文中更新数据库
+            items: (招投标记录ID, 详情页URL) 列表
+
+        Returns:
+            入队数量
+        """
+        if not self.enabled:
+            return 0
+
+        count = 0
+        for tender_id, url in items:
+            if not url:
+                continue
+            try:
+                self._queue.put_nowait((tender_id, url))
+                count += 1
+            except queue.Full:
+                self.stats['dropped'] += 1
+
+        self.stats['queued'] += count
+        if count:
+            self._ensure_worker(app)
+        return count
+
+    def _ensure_worker(self, app):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, args=(app,), name='detail-fetcher', daemon=True)
+                self._worker.start()
+
+    def _run(self, app):
+        """后台线程：分批取出队列中的详情页，抓取后批量更新；空闲一段时间后退出"""
+        with app.app_context():
+            while True:
+                try:
+                    batch = [self._queue.get(timeout=self.idle_timeout)]
+                except queue.Empty:
+                    # 退出前在锁内再次确认队列为空，避免与入队竞争导致任务滞留
+                    with self._lock:
+                        if self._queue.empty():
+                            self._worker = None
+                            return
+                    continue
+
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                try:
+                    self._process_batch(batch)
+                except Exception as e:
+                    db.session.rollback()
+                    self.logger.error(f'详情页批量处理失败: {str(e)}')
+                finally:
+                    db.session.remove()
+
+    def _process_batch(self, batch: List[Tuple[int, str]]):
+        """抓取一批详情页（缓存命中的不再抓取）并更新招投标记录"""
+        fields_by_url: Dict[str, Optional[Dict[str, Any]]] = {}
+        to_fetch = []
+        for _, url in batch:
+            if url in fields_by_url:
+                continue
+            hit, fields = self._cache_get(url)
+            if hit:
+                fields_by_url[url] = fields
+                self.stats['cache_hits'] += 1
+            else:
+                fields_by_url[url] = None
+                to_fetch.append(url)
+
+        if to_fetch:
+            results = run_batch(
+                to_fetch,
+                self._fetch_detail,
+                max_concurrency=self.max_concurrency,
+                per_host_limit=self.per_host_limit,
+                key_func=host_of
+            )
+            for url, fields in zip(to_fetch, results):
+                fields_by_url[url] = fields
+                if fields:
+                    self._cache_put(url, fields)
+                    self.stats['fetched'] += 1
+                else:
+                    self.stats['failed'] += 1
+
+        updates = {tender_id: fields_by_url[url] for tender_id, url in batch if fields_by_url.get(url)}
+        if not updates:
+            return
+
+        for record in TenderRecord.query.filter(TenderRecord.id.in_(list(updates))):
+            self.apply_fields(record, updates[record.id])
+        db.session.commit()
+        self.stats['updated'] += len(updates)
+
+    def remember(self, url: str, fields: Dict[str, Any]):
+        """记录已在其他流程中抓取的详情页字段，后续入队时直接使用，不再重复抓取"""
+        if fields:
+            self._cache_put(url, fields)
+
+    def _fetch_detail(self, url: str) -> Optional[Dict[str, Any]]:
+        """抓取并解析单个详情页（在抓取线程中执行）"""
+        page = tender_extractor.fetch_page_conditional(url, decode=False)
+        if page['status'] != 'ok':
+            return None
+        try:
+            return parse_pool.parse_detail(page['content'], page['encoding'], page['final_url'],
+                                           archive={'kind': 'detail'})
+        except Exception as e:
+            self.logger.error(f'详情页解析失败 {url}: {str(e)}')
+            return None
+
+    def apply_fields(self, record: TenderRecord, fields: Dict[str, Any]):
+        """用详情页字段补全招投标记录（发布日期只在缺失时填写）"""
+        if fields.get('content'):
+            record.content = fields['content']
+        if fields.get('budget_amount') is not None:
+            record.budget_amount = fields['budget_amount']
+            record.budget_currency = fields.get('budget_currency') or 'CNY'
+        if fields.get('deadline_date'):
+            record.deadline_date = self._parse_date(fields['deadline_date']) or record.deadline_date
+        if fields.get('publish_date') and record.publish_date is None:
+            record.publish_date = self._parse_date(fields['publish_date'])
+
+    def _parse_date(self, value: str) -> Optional[datetime]:
+        try:
+            return datetime.strptime(value, '%Y-%m-%d')
+        except (ValueError, TypeError):
+            return None
+
+    def _cache_get(self, url: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is None:
+                return False, None
+            expires_at, fields = entry
+            if expires_at < time.time():
+                del self._cache[url]
+                return False, None
+            self._cache.move_to_end(url)
+            return True, fields
+
+    def _cache_put(self, url: str, fields: Dict[str, Any]):
+        with self._lock:
+            self._cache[url] = (time.time() + self.cache_ttl, fields)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取详情页抓取统计"""
+        with self._lock:
+            cache_size = len(self._cache)
+        return dict(self.stats, pending=self._queue.qsize(), cache_size=cache_size)
+
+
+# 创建全局详情页抓取服务实例
+detail_fetcher = DetailFetchService()
@@ -0,0 +1,205 @@
+"""
+DNS解析缓存
+
+进程内共享的域名解析缓存，避免同一次验证中HTTP请求、SSL探测、robots.txt
+抓取各自重复解析域名，包括：
+- 带TTL的解析结果缓存（LRU容量上限）
+- 解析失败的否定缓存
+- 同步/异步两种解析接口，并发解析同一域名时只查询一次
+- 命中率统计
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import asyncio
+import ipaddress
+import socket
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+
+
+class DnsCache:
+    """DNS解析缓存"""
+
+    def __init__(self, ttl: int = None, negative_ttl: int = None, max_entries: int = None):
+        self.logger = logging.getLogger(__name__)
+
+        crawler_config = Config.CRAWLER_CONFIG
+        self.ttl = ttl or crawler_config.get('DNS_CACHE_TTL', 300)
+        self.negative_ttl = negative_ttl or crawler_config.get('DNS_NEGATIVE_TTL', 60)
+        self.max_entries = max_entries or crawler_config.get('DNS_CACHE_SIZE', 20000)
+
+        # 主机名 -> (地址列表, 过期时间)，地址列表为空表示解析失败
+        self._entries: 'OrderedDict[str, Tuple[List[str], float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._resolve_locks: Dict[str, threading.Lock] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'negative_hits': 0,
+            'lookups': 0,
+            'failures': 0,
+        }
+
+    def resolve(self, host: str) -> List[str]:
+        """
+        解析主机名（同步）
+
+        Args:
+            host: 主机名
+
+        Returns:
+            IP地址列表（IPv4优先）
+
+        Raises:
+            socket.gaierror: 解析失败（含否定缓存命中）
+        """
+        host = self._normalize(host)
+        if self._is_ip(host):
+            return [host]
+
+        addresses = self._get_cached(host)
+        if addresses is not None:
+            return self._check(host, addresses)
+
+        with self._lock:
+            resolve_lock = self._resolve_locks.setdefault(host, threading.Lock())
+
+        with resolve_lock:
+            addresses = self._get_cached(host, count=False)
+            if addresses is None:
+                try:
+                    infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                except socket.gaierror:
+                    infos = []
+                addresses = self._store(host, infos)
+
+        with self._lock:
+            self._resolve_locks.pop(host, None)
+
+        return self._check(host, addresses)
+
+    async def resolve_async(self, host: str) -> List[str]:
+        """
+        解析主机名（异步），与同步接口共享缓存
+
+        Raises:
+            socket.gaierror: 解析失败（含否定缓存命中）
+        """
+        host = self._normalize(host)
+        if self._is_ip(host):
+            return [host]
+
+        addresses = self._get_cached(host)
+        if addresses is not None:
+            return self._check(host, addresses)
+
+        future = self._inflight.get(host)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._inflight[host] = future
+            try:
+                try:
+                    infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                except socket.gaierror:
+                    infos = []
+                future.set_result(self._store(host, infos))
+            except BaseException:
+                # 解析被取消等情况下，等待中的协程改为自行解析
+                future.cancel()
+                raise
+            finally:
+                self._inflight.pop(host, None)
+
+            return self._check(host, future.result())
+
+        try:
+            addresses = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            return await self.resolve_async(host)
+        return self._check(host, addresses)
+
+    def resolve_address(self, host: str) -> str:
+        """解析主机名并返回首选IP地址"""
+        return self.resolve(host)[0]
+
+    def invalidate(self, host: str):
+        """使某个主机名的缓存失效（例如连接失败后）"""
+        with self._lock:
+            self._entries.pop(self._normalize(host), None)
+
+    def get_stats(self) -> Dict[str, float]:
+        """获取缓存统计信息"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+
+        total = stats['hits'] + stats['negative_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['negative_hits']) / total, 4) if total else 0.0
+        return stats
+
+    def _normalize(self, host: str) -> str:
+        return (host or '').strip().lower().rstrip('.').strip('[]')
+
+    def _is_ip(self, host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+            return True
+        except ValueError:
+            return False
+
+    def _check(self, host: str, addresses: List[str]) -> List[str]:
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, f'无法解析域名: {host}')
+        return addresses
+
+    def _get_cached(self, host: str, count: bool = True) -> Optional[List[str]]:
+        with self._lock:
+            cached = self._entries.get(host)
+            if cached is not None and cached[1] > time.monotonic():
+                self._entries.move_to_end(host)
+                if count:
+                    self._stats['hits' if cached[0] else 'negative_hits'] += 1
+                return cached[0]
+
+            if cached is not None:
+                del self._entries[host]
+            if count:
+                self._stats['misses'] += 1
+            return None
+
+    def _store(self, host: str, infos) -> List[str]:
+        """保存解析结果，IPv4地址排在前面"""
+        addresses = []
+        for family, _, _, _, sockaddr in sorted(infos, key=lambda info: info[0] != socket.AF_INET):
+            if sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+
+        ttl = self.ttl if addresses else self.negative_ttl
+        with self._lock:
+            self._stats['lookups'] += 1
+            if not addresses:
+                self._stats['failures'] += 1
+
+            self._entries[host] = (addresses, time.monotonic() + ttl)
+            self._entries.move_to_end(host)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return addresses
+
+
+# 创建全局DNS解析缓存实例
+dns_cache = DnsCache()
@@ -0,0 +1,323 @@
+"""
+站点地图与订阅源读取
+
+很多医院网站的CMS会发布sitemap.xml或RSS/Atom订阅源，直接读取其中的招投标条目
+可以代替首页DOM扫描和列表页抓取，包括：
+- 信息源发现：robots.txt中的Sitemap声明，没有声明时探测常见的站点地图和订阅源路径
+- 流式解析：边下载边解析XML，逐条处理后立即释放，内存占用与站点地图大小无关
+- 支持站点地图索引（按lastmod只读取有更新的子站点地图）和gzip压缩的站点地图
+- 按lastmod / 发布时间只返回上次读取之后有更新的招投标条目
+- 条件请求（ETag / Last-Modified）：站点地图索引每次完整读取，子站点地图和其他信息源
+  按各自的校验信息和内容哈希判断是否变化
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import hashlib
+import logging
+import random
+import re
+import zlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urljoin, urlparse
+from xml.etree import ElementTree
+
+import requests
+
+from config import Config
+from app.services.http_pool import http_pool
+from app.services.politeness import politeness_scheduler
+from app.services.robots_cache import robots_cache
+from app.services.tender_extractor import tender_extractor
+from app.services.url_canonical import canonicalize
+
+# 招投标栏目中表示站点地图/订阅源的识别来源
+FEED_SOURCES = ('sitemap', 'feed')
+
+# 站点地图和订阅源的根元素
+SITEMAP_ROOTS = {'urlset': 'sitemap', 'sitemapindex': 'sitemap', 'rss': 'feed', 'feed': 'feed', 'RDF': 'feed'}
+
+# 招投标详情页URL中常见的拼音缩写和英文路径
+TENDER_PATH_PATTERN = re.compile(
+    r'zhaobiao|caigou|zbcg|zbgg|cggg|zbxx|cgxx|zbgs|zbjg|cgjg|tender|bidding|procure', re.IGNORECASE
+)
+
+
+def _local_name(tag: str) -> str:
+    """去掉命名空间的元素名"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    """解析W3C日期时间（站点地图lastmod、Atom）或RFC 822日期（RSS），统一为UTC时间"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class FeedReader:
+    """站点地图与订阅源读取器"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+        crawler_config = Config.CRAWLER_CONFIG
+        self.enabled = crawler_config.get('FEED_DISCOVERY_ENABLED', True)
+        self.probe_paths = crawler_config.get('FEED_PROBE_PATHS', ('/sitemap.xml', '/rss.xml', '/feed'))
+        self.max_bytes = crawler_config.get('FEED_MAX_BYTES', 50 * 1024 * 1024)
+        self.max_sitemaps = crawler_config.get('FEED_MAX_SITEMAPS', 10)
+        self.chunk_size = crawler_config.get('STREAM_CHUNK_SIZE', 16384)
+
+    def discover(self, site_url: str) -> List[Dict[str, Any]]:
+        """
+        发现网站的站点地图和订阅源（在抓取线程中执行）
+
+        只保留包含招投标条目的信息源，返回值与招投标栏目的格式一致，
+        source为 sitemap / feed；feed为本次读取结果，供同一次扫描直接使用。
+        """
+        if not self.enabled:
+            return []
+
+        candidates = robots_cache.sitemaps(site_url)
+        if not candidates:
+            candidates = [urljoin(site_url, path) for path in self.probe_paths]
+
+        sources = []
+        seen = set()
+        for url in candidates:
+            if url in seen:
+                continue
+            seen.add(url)
+
+            feed = self.read(url)
+            if feed['kind'] is None or not self.tender_entries(feed['entries']):
+                continue
+            sources.append({
+                'title': urlparse(url).path.rsplit('/', 1)[-1] or url,
+                'url': url,
+                'section': None,
+                'source': feed['kind'],
+                'confidence': 1.0,
+                'feed': feed,
+            })
+        return sources
+
+    def read(self, url: str, etag: str = None, last_modified: str = None,
+             since: Optional[datetime] = None,
+             validators: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        读取站点地图或订阅源（站点地图索引按lastmod读取有更新的子站点地图）
+
+        Args:
+            url: 站点地图或订阅源地址
+            etag / last_modified: 上次读取的校验信息，用于条件请求
+            since: 只读取此时间之后有更新的子站点地图
+            validators: 子站点地图上次读取的校验信息 {url: {'etag', 'last_modified', 'body_hash'}}，
+                        返回304或内容哈希相同的子站点地图不再读取条目
+
+        Returns:
+            {
+                'page': 抓取结果（格式同 TenderExtractor.fetch_page_conditional，不含页面内容）,
+                'kind': sitemap / feed，无法识别时为None,
+                'index': 是否为站点地图索引（索引未变化时子站点地图仍可能有更新，调用方不能按304/哈希跳过）,
+                'children': 子站点地图的抓取结果（未变化的标记 unchanged）,
+                'entries': 条目列表 [{'url', 'title', 'lastmod'}],
+                'latest': 全部条目中最新的更新时间
+            }
+        """
+        page, kind, entries, sitemaps = self._read_one(url, etag, last_modified)
+        validators = validators or {}
+        children = []
+
+        if sitemaps:
+            page['index'] = True
+            # 站点地图索引：先读最近更新的子站点地图
+            changed = [item for item in sitemaps if since is None or item['lastmod'] is None or item['lastmod'] > since]
+            changed.sort(key=lambda item: item['lastmod'] or datetime.min, reverse=True)
+            for item in changed[:self.max_sitemaps]:
+                validator = validators.get(item['url'], {})
+                child, child_kind, child_entries, _ = self._read_one(
+                    item['url'], validator.get('etag'), validator.get('last_modified')
+                )
+                children.append(child)
+                if child['status'] == 'not_modified' or (
+                        child['body_hash'] and child['body_hash'] == validator.get('body_hash')):
+                    child['unchanged'] = True
+                    continue
+                if child_kind:
+                    entries.extend(child_entries)
+                elif child['status'] == 'ok':
+                    child['parse_failed'] = True
+
+        latest = max((entry['lastmod'] for entry in entries if entry['lastmod']), default=None)
+        return {'page': page, 'kind': kind, 'index': bool(sitemaps), 'children': children,
+                'entries': entries, 'latest': latest}
+
+    def tender_entries(self, entries: List[Dict[str, Any]], since: Optional[datetime] = None,
+                       limit: int = None) -> List[Dict[str, Any]]:
+        """
+        筛选招投标条目（标题或URL含招投标关键词），按更新时间从新到旧排列
+
+        Args:
+            since: 只保留此时间之后更新的条目；没有更新时间的条目始终保留，由调用方按已处理的URL去重
+            limit: 最多返回的条目数
+        """
+        selected = []
+        for entry in entries:
+            if since is not None and entry['lastmod'] is not None and entry['lastmod'] <= since:
+                continue
+            path = unquote(urlparse(entry['url']).path)
+            if (tender_extractor.tender_matcher.contains_any(entry['title'] or '')
+                    or tender_extractor.tender_matcher.contains_any(path.lower())
+                    or TENDER_PATH_PATTERN.search(path)):
+                selected.append(entry)
+
+        selected.sort(key=lambda entry: entry['lastmod'] or datetime.min, reverse=True)
+        return selected[:limit] if limit else selected
+
+    def _read_one(self, url: str, etag: str = None, last_modified: str = None):
+        """流式下载并解析单个XML文档，返回 (抓取结果, 类型, 条目, 子站点地图)"""
+        crawler_config = Config.CRAWLER_CONFIG
+        page = {
+            'url': url,
+            'final_url': url,
+            'status': 'error',
+            'status_code': None,
+            'encoding': None,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_length': None,
+            'body_hash': None,
+            'truncated': False,
+            'error': None
+        }
+        kind = None
+        entries: List[Dict[str, Any]] = []
+        sitemaps: List[Dict[str, Any]] = []
+
+        headers = {'User-Agent': random.choice(crawler_config['USER_AGENTS'])}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        response = None
+        try:
+            politeness_scheduler.acquire(urlparse(url).netloc.lower())
+            response = http_pool.get(url, headers=headers, timeout=crawler_config['REQUEST_TIMEOUT'], stream=True)
+            page['status_code'] = response.status_code
+
+            if response.status_code == 304:
+                page['status'] = 'not_modified'
+                page['etag'] = response.headers.get('ETag') or etag
+                page['last_modified'] = response.headers.get('Last-Modified') or last_modified
+                return page, kind, entries, sitemaps
+            if response.status_code >= 400:
+                page['error'] = f'HTTP {response.status_code}'
+                return page, kind, entries, sitemaps
+
+            # .xml.gz 站点地图本身是gzip文件（与传输压缩无关）
+            content_type = response.headers.get('Content-Type', '')
+            gzipped = urlparse(response.url).path.endswith('.gz') or 'gzip' in content_type
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+
+            parser = ElementTree.XMLPullParser(events=('start', 'end'))
+            # 当前元素的祖先链，处理完的条目从父元素中移除，内存占用与文档大小无关
+            stack = []
+            digest = hashlib.sha256()
+            total = 0
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                digest.update(chunk)
+                if decompressor is not None:
+                    chunk = decompressor.decompress(chunk)
+                total += len(chunk)
+                parser.feed(chunk)
+                for event, element in parser.read_events():
+                    if event == 'start':
+                        if kind is None:
+                            kind = SITEMAP_ROOTS.get(_local_name(element.tag), '')
+                        stack.append(element)
+                        continue
+                    stack.pop()
+                    if self._collect(element, response.url, entries, sitemaps) and stack:
+                        stack[-1].remove(element)
+                if kind == '':
+                    # 不是站点地图或订阅源，不再继续下载
+                    break
+                if total >= self.max_bytes:
+                    page['truncated'] = True
+                    break
+
+            page.update({
+                'final_url': response.url,
+                'status': 'ok',
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_length': total,
+                'body_hash': digest.hexdigest(),
+            })
+
+        except (requests.RequestException, ElementTree.ParseError, zlib.error) as e:
+            # 解析到一半出错时保留已读取的条目
+            if entries or sitemaps:
+                page['status'] = 'ok'
+            page['error'] = str(e)
+            self.logger.debug(f'站点地图/订阅源读取失败 {url}: {str(e)}')
+        finally:
+            if response is not None:
+                response.close()
+
+        return page, kind or None, entries, sitemaps
+
+    def _collect(self, element, base_url: str, entries: List[Dict[str, Any]],
+                 sitemaps: List[Dict[str, Any]]) -> bool:
+        """处理一个结束的XML元素，是 url / sitemap / item / entry 条目时读取并返回True"""
+        name = _local_name(element.tag)
+        if name not in ('url', 'sitemap', 'item', 'entry'):
+            return False
+
+        fields: Dict[str, str] = {}
+        for child in element:
+            child_name = _local_name(child.tag)
+            if child_name == 'link' and child.get('href'):
+                # Atom：优先使用rel=alternate的链接
+                if 'link' not in fields or child.get('rel', 'alternate') == 'alternate':
+                    fields['link'] = child.get('href')
+            elif child_name not in fields:
+                fields[child_name] = (child.text or '').strip()
+        element.clear()
+
+        url = fields.get('loc') or fields.get('link')
+        if not url:
+            return True
+        item = {
+            'url': (canonicalize(url, base_url) or urljoin(base_url, url))[:500],
+            'title': fields.get('title') or None,
+            'lastmod': parse_feed_date(
+                fields.get('lastmod') or fields.get('updated') or fields.get('pubDate')
+                or fields.get('published') or fields.get('date')
+            ),
+        }
+        if name == 'sitemap':
+            sitemaps.append(item)
+        else:
+            entries.append(item)
+        return True
+
+
+# 创建全局站点地图与订阅源读取器实例
+feed_reader = FeedReader()
@@ -16,12 +16,13 @@ import re
 import json
 import requests
 import time
-import random
 from typing import List, Dict, Optional, Tuple, Any
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 import logging
 
+from app.services.politeness import politeness_scheduler
+
 class HospitalSearchService:
     """医院搜索服务类"""
     
@@ -33,7 +34,6 @@ class HospitalSearchService:
             'max_results_per_query': 20,
             'request_timeout': 30,
             'max_retries': 3,
-            'delay_range': (1, 5),
             'user_agents': [
                 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -92,8 +92,14 @@ class HospitalSearchService:
         # 搜索查询构建
         search_queries = self._build_search_queries(hospital_name, region_name)
         
+        # 搜索引擎主机，用于礼貌抓取间隔控制
+        search_host = urlparse(self.search_engines['duckduckgo']['api_url']).netloc
+        
         # 多渠道搜索
         for query in search_queries:
+            # 按主机等待礼貌抓取间隔，避免请求过于频繁
+            politeness_scheduler.acquire(search_host)
+            
             # 搜索引擎搜索
             search_results = self._search_via_search_engine(query)
             all_results.extend(search_results)
@@ -101,9 +107,6 @@ class HospitalSearchService:
             # 卫健委名录搜索
             health_results = self._search_health_commission(hospital_name, region_name)
             all_results.extend(health_results)
-            
-            # 添加延迟避免请求过于频繁
-            time.sleep(random.uniform(*self.config['delay_range']))
         
         # 去重和排序
         unique_results = self._deduplicate_results(all_results)
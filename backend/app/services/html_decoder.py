@@ -0,0 +1,202 @@
+"""
+HTML编码识别与解码
+
+很多医院网站使用GBK/GB2312编码，且响应头缺少charset或声明错误。
+在抓取线程中确定页面编码，页面只解码一次，文本供后续各阶段共享，包括：
+- 编码识别顺序：BOM、响应头charset、<meta>声明，最后才使用统计检测
+- 响应头和<meta>声明为UTF-8但内容不是合法UTF-8时视为声明错误，继续识别
+- 声明为GBK等其他编码但内容是含非ASCII字节的合法UTF-8时同样视为声明错误，按UTF-8解码
+  （网站改版为UTF-8后沿用旧模板的GBK声明很常见，GBK中文文本几乎不可能恰好是合法UTF-8）
+- 响应头中的ISO-8859-1等单字节编码多为服务器默认值，不作为可信声明
+- GB2312/GBK统一按其超集GB18030解码
+- 识别结果按主机缓存，同一网站的后续页面不再运行统计检测
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import codecs
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from config import Config
+
+try:
+    # C实现的统计检测，未安装时使用requests自带的检测库
+    import cchardet as charset_detector
+except ImportError:
+    from requests.compat import chardet as charset_detector
+
+# 响应头中的charset参数
+HEADER_CHARSET_PATTERN = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# <meta charset="gbk"> 或 <meta http-equiv="Content-Type" content="text/html; charset=gb2312">
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+# <meta>声明只在文档开头查找
+META_SCAN_BYTES = 4096
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# 服务器默认填写的单字节编码，不作为可信声明
+WEAK_HEADER_ENCODINGS = {'iso8859-1', 'cp1252'}
+
+# 按超集解码的编码
+SUPERSET_ENCODINGS = {'gb2312': 'gb18030', 'gbk': 'gb18030', 'ascii': 'utf-8'}
+
+
+def normalize_encoding(label: Optional[str]) -> Optional[str]:
+    """规范化编码名称，无法识别时返回None"""
+    if not label:
+        return None
+    try:
+        name = codecs.lookup(label.strip().strip('"\'')).name
+    except (LookupError, TypeError):
+        return None
+    return SUPERSET_ENCODINGS.get(name, name)
+
+
+def bom_encoding(content: bytes) -> Optional[str]:
+    for bom, encoding in BOMS:
+        if content.startswith(bom):
+            return encoding
+    return None
+
+
+def header_encoding(content_type: Optional[str]) -> Optional[str]:
+    """响应头Content-Type中显式声明的编码（未声明时返回None，不使用HTTP默认的ISO-8859-1）"""
+    match = HEADER_CHARSET_PATTERN.search(content_type or '')
+    return normalize_encoding(match.group(1)) if match else None
+
+
+def meta_encoding(content: bytes) -> Optional[str]:
+    match = META_CHARSET_PATTERN.search(content[:META_SCAN_BYTES])
+    return normalize_encoding(match.group(1).decode('ascii', errors='ignore')) if match else None
+
+
+def is_utf8(content: bytes) -> bool:
+    """内容是否为合法UTF-8（忽略截断在结尾的不完整字符）"""
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(content, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def decode(content: bytes, encoding: Optional[str]) -> str:
+    """按指定编码解码，非法字节替换为U+FFFD"""
+    try:
+        return str(content, encoding or 'utf-8', errors='replace')
+    except (LookupError, TypeError):
+        return str(content, 'utf-8', errors='replace')
+
+
+class HtmlDecoder:
+    """HTML编码识别器（按主机缓存识别结果）"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+        crawler_config = Config.CRAWLER_CONFIG
+        self.cache_size = crawler_config.get('ENCODING_CACHE_SIZE', 10000)
+        self.detect_bytes = crawler_config.get('ENCODING_DETECT_BYTES', 32768)
+
+        self._cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'bom': 0, 'header': 0, 'meta': 0, 'cache': 0, 'detect': 0}
+
+    def resolve(self, content: bytes, content_type: Optional[str] = None,
+                host: Optional[str] = None) -> str:
+        """
+        确定页面编码
+
+        Args:
+            content: 原始页面字节
+            content_type: 响应头Content-Type
+            host: 主机名，用于缓存识别结果
+
+        Returns:
+            编码名称
+        """
+        encoding, source = self._resolve(content, content_type, host)
+        self.stats[source] += 1
+        if host and source != 'cache':
+            with self._lock:
+                self._cache[host] = encoding
+                self._cache.move_to_end(host)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return encoding
+
+    def _resolve(self, content: bytes, content_type: Optional[str], host: Optional[str]) -> Tuple[str, str]:
+        # BOM不会误判，优先于任何声明
+        encoding = bom_encoding(content)
+        if encoding:
+            return encoding, 'bom'
+
+        encoding = header_encoding(content_type)
+        if encoding and encoding not in WEAK_HEADER_ENCODINGS and self._plausible(content, encoding):
+            return encoding, 'header'
+
+        encoding = meta_encoding(content)
+        if encoding and self._plausible(content, encoding):
+            return encoding, 'meta'
+
+        if host:
+            with self._lock:
+                encoding = self._cache.get(host)
+                if encoding:
+                    self._cache.move_to_end(host)
+            if encoding and self._plausible(content, encoding):
+                return encoding, 'cache'
+
+        return self.detect(content), 'detect'
+
+    def _plausible(self, content: bytes, encoding: str) -> bool:
+        """
+        声明的编码是否可信
+
+        GB18030等几乎可以解码任意字节，无法直接否定；内容的非ASCII部分是合法UTF-8时
+        其他编码的声明视为错误，UTF-8声明则要求内容是合法UTF-8。
+        """
+        if encoding == 'utf-8':
+            return is_utf8(content)
+        return content.isascii() or not is_utf8(content)
+
+    def detect(self, content: bytes) -> str:
+        """统计检测编码：合法UTF-8直接采用，否则对文档开头运行统计检测"""
+        if is_utf8(content):
+            return 'utf-8'
+        detected = charset_detector.detect(content[:self.detect_bytes]) or {}
+        return normalize_encoding(detected.get('encoding')) or 'gb18030'
+
+    def decode_response(self, response, host: Optional[str] = None) -> Tuple[str, str]:
+        """
+        识别响应编码并解码
+
+        Returns:
+            (HTML文本, 编码)
+        """
+        content = response.content or b''
+        encoding = self.resolve(content, response.headers.get('Content-Type'), host)
+        return decode(content, encoding), encoding
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取编码识别统计（按识别来源计数）"""
+        with self._lock:
+            cached_hosts = len(self._cache)
+        return dict(self.stats, cached_hosts=cached_hosts)
+
+
+# 创建全局HTML编码识别器实例
+html_decoder = HtmlDecoder()
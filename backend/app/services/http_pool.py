@@ -0,0 +1,219 @@
+"""
+HTTP会话池
+
+按主机管理长连接HTTP会话，复用TCP/TLS连接，包括：
+- 按主机划分的requests会话（LRU淘汰，淘汰的会话在不再使用后由垃圾回收关闭）
+- 可配置的连接池大小
+- keep-alive连接复用
+- 连接新建/复用统计
+- 建立连接时通过进程内DNS缓存解析域名
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+from config import Config
+from app.services.dns_cache import dns_cache
+
+
+class _CachedDnsMixin:
+    """建立TCP连接时使用DNS缓存的解析结果（证书校验和SNI仍使用原主机名）"""
+
+    def _new_conn(self):
+        dns_host = self._dns_host
+        try:
+            address = dns_cache.resolve_address(dns_host)
+        except OSError as e:
+            raise NewConnectionError(self, f'Failed to resolve {dns_host}: {e}')
+
+        self._dns_host = address
+        try:
+            return super()._new_conn()
+        except NewConnectionError:
+            # 缓存的地址不可达时丢弃缓存，下次重新解析
+            dns_cache.invalidate(dns_host)
+            raise
+        finally:
+            self._dns_host = dns_host
+
+
+class _CachedDnsHTTPConnection(_CachedDnsMixin, HTTPConnection):
+    pass
+
+
+class _CachedDnsHTTPSConnection(_CachedDnsMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDnsHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDnsHTTPConnection
+
+
+class _CachedDnsHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDnsHTTPSConnection
+
+
+class _CachedDnsAdapter(HTTPAdapter):
+    """使用DNS缓存连接池的适配器"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CachedDnsHTTPConnectionPool,
+            'https': _CachedDnsHTTPSConnectionPool,
+        }
+
+
+class HttpSessionPool:
+    """按主机划分的HTTP会话池"""
+
+    def __init__(self, max_hosts: int = None, pool_connections: int = None, pool_maxsize: int = None):
+        self.logger = logging.getLogger(__name__)
+
+        crawler_config = Config.CRAWLER_CONFIG
+        self.max_hosts = max_hosts or crawler_config.get('SESSION_POOL_MAX_HOSTS', 1000)
+        self.pool_connections = pool_connections or crawler_config.get('SESSION_POOL_CONNECTIONS', 4)
+        self.pool_maxsize = pool_maxsize or crawler_config.get('SESSION_POOL_MAXSIZE', 4)
+
+        # 主机 -> 会话（按最近使用排序）
+        self._sessions: 'OrderedDict[str, requests.Session]' = OrderedDict()
+        # 主机 -> 已统计的连接数，用于计算新建连接
+        self._known_connections: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._stats = {
+            'requests': 0,
+            'connections_opened': 0,
+            'connections_reused': 0,
+            'sessions_created': 0,
+            'sessions_evicted': 0,
+        }
+
+    def _create_session(self) -> requests.Session:
+        """创建带连接池的会话"""
+        session = requests.Session()
+        adapter = _CachedDnsAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=False
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """
+        获取URL所属主机的会话
+
+        Args:
+            url: 请求URL
+
+        Returns:
+            该主机的会话对象
+        """
+        host = urlparse(url).netloc.lower()
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is not None:
+                self._sessions.move_to_end(host)
+                return session
+
+            session = self._create_session()
+            self._sessions[host] = session
+            self._known_connections[host] = 0
+            self._stats['sessions_created'] += 1
+
+            # 淘汰的会话不主动关闭：其他抓取线程可能仍在使用该会话发起请求或读取流式响应，
+            # 最后一个引用释放后由垃圾回收关闭其连接
+            while len(self._sessions) > self.max_hosts:
+                old_host, _ = self._sessions.popitem(last=False)
+                self._known_connections.pop(old_host, None)
+                self._stats['sessions_evicted'] += 1
+
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        通过主机会话发起请求
+
+        Args:
+            method: HTTP方法
+            url: 请求URL
+            **kwargs: 透传给requests的参数
+
+        Returns:
+            响应对象
+        """
+        host = urlparse(url).netloc.lower()
+        session = self.get_session(url)
+
+        response = session.request(method, url, **kwargs)
+        self._record_request(host, session)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """发起GET请求"""
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """发起HEAD请求"""
+        return self.request('HEAD', url, **kwargs)
+
+    def _record_request(self, host: str, session: requests.Session):
+        """根据底层连接池的连接数变化统计新建/复用连接"""
+        total = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    total += pool.num_connections
+
+        with self._lock:
+            previous = self._known_connections.get(host, 0)
+            opened = max(0, total - previous)
+            self._known_connections[host] = max(total, previous)
+
+            self._stats['requests'] += 1
+            self._stats['connections_opened'] += opened
+            if opened == 0:
+                self._stats['connections_reused'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接池统计信息"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['active_hosts'] = len(self._sessions)
+
+        requests_count = stats['requests']
+        stats['reuse_rate'] = round(stats['connections_reused'] / requests_count, 4) if requests_count else 0.0
+        return stats
+
+    def close_all(self):
+        """关闭所有会话"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._known_connections.clear()
+
+        for session in sessions:
+            session.close()
+
+
+# 创建全局HTTP会话池实例
+http_pool = HttpSessionPool()
@@ -0,0 +1,82 @@
+"""
+招投标列表增量截断
+
+招投标列表页按发布时间倒序排列，记住每个栏目上次扫描时最前面若干条的签名（内容哈希），
+本次扫描遇到已知条目时即可停止解析，也不再继续翻页，包括：
+- 出现新条目之后连续遇到指定数量的已知条目才截断；列表头部的已知条目（置顶）不计入，
+  整页都是已知条目时解析完整页后截断（不再翻页）
+- 第2页起的分页接续第1页（第1页未截断说明已出现新条目），页面开头的已知条目同样计数
+- 记录本次扫描的列表头部签名，供下次扫描使用
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+from typing import Iterable, List, Optional
+
+from config import Config
+
+
+class IncrementalCutoff:
+    """单个栏目的增量截断状态"""
+
+    def __init__(self, known: Optional[Iterable[str]] = None, stop_after: int = None, keep: int = None,
+                 continued: bool = False):
+        """
+        Args:
+            known: 上次扫描记录的列表头部签名（按页面顺序）
+            stop_after: 连续遇到多少条已知条目后停止
+            keep: 保留的头部签名数量
+            continued: 是否为接续前一页的分页（前面的页面已出现新条目，开头的已知条目不视为置顶）
+        """
+        crawler_config = Config.CRAWLER_CONFIG
+        self.known_order: List[str] = list(known or [])
+        self.known = set(self.known_order)
+        self.stop_after = stop_after or crawler_config.get('INCREMENTAL_STOP_AFTER', 2)
+        self.keep = keep or crawler_config.get('INCREMENTAL_SIGNATURES', 10)
+
+        self.seen: List[str] = []
+        self._seen_set = set()
+        self._consecutive = 0
+        self._leading = 0
+        self.continued = continued
+        self.stopped = False
+        self.new_count = 0
+
+    def check(self, signature: str) -> bool:
+        """
+        登记一条列表条目
+
+        Returns:
+            该条目是否为已知条目（已知条目不再输出）
+        """
+        if signature not in self._seen_set:
+            self._seen_set.add(signature)
+            self.seen.append(signature)
+
+        if signature in self.known:
+            if not self.new_count and not self.continued:
+                # 新条目之前的已知条目多为置顶条目，其后仍可能有新条目
+                self._leading += 1
+                return True
+            self._consecutive += 1
+            if self._consecutive >= self.stop_after:
+                self.stopped = True
+            return True
+
+        self._consecutive = 0
+        self.new_count += 1
+        return False
+
+    def finish(self):
+        """页面解析完成：整页只有已知条目时同样截断，不再跟随分页"""
+        if not self.stopped and not self.new_count and self._leading:
+            self.stopped = True
+
+    def signatures(self) -> List[str]:
+        """本次扫描后的列表头部签名：本次遇到的条目在前，上次的头部补足"""
+        head = list(self.seen)
+        if self.stopped:
+            head.extend(signature for signature in self.known_order if signature not in self._seen_set)
+        return head[:self.keep]
@@ -0,0 +1,141 @@
+"""
+关键词多模式匹配
+
+将一组关键词编译为单个匹配自动机，一次扫描文本即可得到所有关键词的
+出现次数和位置，替代逐个关键词的 `keyword in text` 多次扫描，包括：
+- 关键词前缀树（同一起始位置的所有关键词一次取出，包含重叠匹配）
+- 预编译的候选起始位置扫描表达式（在C实现的正则引擎中跳过无关字符）
+- 关键词分组匹配（按分组优先级返回第一个命中的分组）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+_END = object()
+
+
+class KeywordAutomaton:
+    """关键词匹配自动机"""
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False):
+        """
+        Args:
+            keywords: 关键词列表（重复的关键词只保留一个）
+            ignore_case: 是否对全小写关键词忽略大小写；含大写字母的关键词（如"IT"）始终区分大小写，
+                与 `keyword in text or keyword in text.lower()` 的判断结果一致
+        """
+        self.keywords: List[str] = list(OrderedDict.fromkeys(k for k in keywords if k))
+        self.ignore_case = ignore_case
+
+        # 忽略大小写的关键词按小写字符建树，其余按原字符建树
+        self._folded_trie: Dict = {}
+        self._exact_trie: Dict = {}
+        branches = []
+        for keyword in sorted(self.keywords, key=len, reverse=True):
+            folded = ignore_case and keyword == keyword.lower()
+            node = self._folded_trie if folded else self._exact_trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[_END] = keyword
+            branches.append(f'(?i:{re.escape(keyword)})' if folded else re.escape(keyword))
+
+        # 候选起始位置扫描表达式；没有关键词时永不匹配
+        self._scanner = re.compile('|'.join(branches) or r'(?!x)x')
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        按位置顺序遍历所有匹配（包含重叠匹配）
+
+        Yields:
+            (起始位置, 关键词)
+        """
+        if not text:
+            return
+
+        length = len(text)
+        search = self._scanner.search
+        position = 0
+        while True:
+            match = search(text, position)
+            if match is None:
+                return
+
+            start = match.start()
+            yield from self._walk(self._folded_trie, text, start, length, True)
+            yield from self._walk(self._exact_trie, text, start, length, False)
+            position = start + 1
+
+    def _walk(self, node: Dict, text: str, start: int, length: int, fold: bool) -> Iterator[Tuple[int, str]]:
+        """从起始位置沿前缀树输出所有以该位置开头的关键词"""
+        index = start
+        while index < length and node:
+            char = text[index]
+            node = node.get(char.lower() if fold else char)
+            if node is None:
+                return
+            index += 1
+            keyword = node.get(_END)
+            if keyword is not None:
+                yield start, keyword
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """返回所有匹配的 (起始位置, 关键词) 列表"""
+        return list(self.iter_matches(text))
+
+    def positions(self, text: str) -> Dict[str, List[int]]:
+        """返回每个关键词的出现位置"""
+        result: Dict[str, List[int]] = {}
+        for start, keyword in self.iter_matches(text):
+            result.setdefault(keyword, []).append(start)
+        return result
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """返回每个关键词的出现次数（未出现的关键词不包含在结果中）"""
+        result: Dict[str, int] = {}
+        for _, keyword in self.iter_matches(text):
+            result[keyword] = result.get(keyword, 0) + 1
+        return result
+
+    def matched(self, text: str) -> Set[str]:
+        """返回文本中出现过的关键词集合"""
+        return {keyword for _, keyword in self.iter_matches(text)}
+
+    def contains_any(self, text: str) -> bool:
+        """文本中是否包含任一关键词"""
+        return bool(text) and self._scanner.search(text) is not None
+
+
+class KeywordGroupMatcher:
+    """关键词分组匹配器（按分组定义顺序确定优先级）"""
+
+    def __init__(self, groups: Dict[str, Iterable[str]], ignore_case: bool = False):
+        """
+        Args:
+            groups: 分组名 -> 关键词列表，按字典顺序确定优先级
+            ignore_case: 同KeywordAutomaton
+        """
+        self.groups = OrderedDict((name, list(keywords)) for name, keywords in groups.items())
+        self.automaton = KeywordAutomaton(
+            (keyword for keywords in self.groups.values() for keyword in keywords),
+            ignore_case=ignore_case
+        )
+
+    def first_group(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        返回第一个有关键词命中的分组
+
+        Args:
+            text: 待匹配文本
+            default: 没有分组命中时的返回值
+        """
+        matched = self.automaton.matched(text)
+        if matched:
+            for name, keywords in self.groups.items():
+                if any(keyword in matched for keyword in keywords):
+                    return name
+        return default
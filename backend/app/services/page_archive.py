@@ -0,0 +1,235 @@
+"""
+页面归档
+
+将抓取到的原始页面压缩后按内容寻址（html_hash）保存到滚动归档文件中，
+提取规则改进后可离线重放归档页面，无需重新抓取，包括：
+- 相同内容的页面只保存一次
+- 归档文件达到大小上限后滚动到新文件
+- 追加写入的索引文件，记录页面所在文件、偏移、来源医院和栏目
+- 后台线程压缩和写入，抓取和解析流程只负责入队
+- 按文件顺序批量读取归档页面，供重放使用
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from config import Config
+
+# 归档文件名：pages-000001.arc
+ARCHIVE_FILE_PATTERN = re.compile(r'^pages-(\d{6})\.arc$')
+INDEX_FILE = 'index.jsonl'
+
+
+class PageArchive:
+    """页面归档"""
+
+    def __init__(self, directory: str = None):
+        self.logger = logging.getLogger(__name__)
+
+        crawler_config = Config.CRAWLER_CONFIG
+        self.enabled = crawler_config.get('ARCHIVE_ENABLED', True)
+        self.directory = directory or crawler_config.get('ARCHIVE_DIR') or 'archive'
+        self.max_file_size = crawler_config.get('ARCHIVE_FILE_MAX_SIZE', 256 * 1024 * 1024)
+        self.compress_level = crawler_config.get('ARCHIVE_COMPRESS_LEVEL', 6)
+
+        self._queue: 'queue.Queue[Tuple[str, bytes, Optional[str], str, Dict[str, Any], str]]' = \
+            queue.Queue(crawler_config.get('ARCHIVE_QUEUE_SIZE', 1000))
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+        # 以下状态只在写入线程中访问
+        self._hashes: Optional[set] = None
+        self._file_number = 0
+
+        self.stats = {
+            'queued': 0,
+            'dropped': 0,
+            'stored': 0,
+            'duplicates': 0,
+            'failed': 0,
+            'bytes_raw': 0,
+            'bytes_stored': 0,
+        }
+
+    def store(self, html_hash: str, content: bytes, encoding: Optional[str], url: str,
+              meta: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        将页面加入归档队列（立即返回，队列已满时丢弃）
+
+        Args:
+            html_hash: 页面内容哈希（与解析结果的html_hash一致）
+            content: 原始页面字节
+            encoding: 响应声明的编码
+            url: 页面地址
+            meta: 来源信息，如 {'kind': 'list', 'hospital_id': 1, 'title': ..., 'section': ...}
+
+        Returns:
+            是否入队
+        """
+        if not self.enabled or not html_hash or not content:
+            return False
+
+        fetched_at = datetime.utcnow().isoformat()
+        try:
+            self._queue.put_nowait((html_hash, content, encoding, url, meta or {}, fetched_at))
+        except queue.Full:
+            self.stats['dropped'] += 1
+            return False
+
+        self.stats['queued'] += 1
+        self._ensure_worker()
+        return True
+
+    def flush(self):
+        """等待队列中的页面全部写入"""
+        self._queue.join()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='page-archive', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        """后台线程：逐个压缩并写入归档文件"""
+        while True:
+            item = self._queue.get()
+            try:
+                self._write(*item)
+            except Exception as e:
+                self.stats['failed'] += 1
+                self.logger.error(f'页面归档失败 {item[3]}: {str(e)}')
+            finally:
+                self._queue.task_done()
+
+    def _write(self, html_hash: str, content: bytes, encoding: Optional[str], url: str,
+               meta: Dict[str, Any], fetched_at: str):
+        if self._hashes is None:
+            self._load_index()
+        if html_hash in self._hashes:
+            self.stats['duplicates'] += 1
+            return
+
+        data = zlib.compress(content, self.compress_level)
+        path = self._file_path(self._file_number)
+        offset = os.path.getsize(path) if os.path.exists(path) else 0
+        if offset and offset + len(data) > self.max_file_size:
+            self._file_number += 1
+            path = self._file_path(self._file_number)
+            offset = 0
+
+        with open(path, 'ab') as f:
+            f.write(data)
+
+        entry = {
+            'html_hash': html_hash,
+            'file': os.path.basename(path),
+            'offset': offset,
+            'length': len(data),
+            'size': len(content),
+            'url': url,
+            'encoding': encoding,
+            'kind': meta.get('kind', 'list'),
+            'hospital_id': meta.get('hospital_id'),
+            'title': meta.get('title'),
+            'section': meta.get('section'),
+            'fetched_at': fetched_at,
+        }
+        # 先写数据再写索引，中断时最多留下未被索引引用的数据
+        with open(os.path.join(self.directory, INDEX_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        self._hashes.add(html_hash)
+        self.stats['stored'] += 1
+        self.stats['bytes_raw'] += len(content)
+        self.stats['bytes_stored'] += len(data)
+
+    def _load_index(self):
+        """读取已有索引和当前归档文件编号（写入线程首次写入时执行）"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._hashes = {entry['html_hash'] for entry in self.entries()}
+
+        numbers = [
+            int(match.group(1)) for match in
+            (ARCHIVE_FILE_PATTERN.match(name) for name in os.listdir(self.directory)) if match
+        ]
+        self._file_number = max(numbers, default=1)
+
+    def _file_path(self, number: int) -> str:
+        return os.path.join(self.directory, f'pages-{number:06d}.arc')
+
+    def entries(self, since: datetime = None, until: datetime = None,
+                hospital_ids: Optional[Iterable[int]] = None,
+                kinds: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        按条件读取索引
+
+        Args:
+            since / until: 抓取时间范围（UTC）
+            hospital_ids: 来源医院
+            kinds: 页面类型：homepage / list / detail
+        """
+        path = os.path.join(self.directory, INDEX_FILE)
+        if not os.path.exists(path):
+            return
+
+        since_text = since.isoformat() if since else None
+        until_text = until.isoformat() if until else None
+        hospital_ids = set(hospital_ids) if hospital_ids else None
+        kinds = set(kinds) if kinds else None
+
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 写入中断留下的不完整行
+                    continue
+                if since_text and entry['fetched_at'] < since_text:
+                    continue
+                if until_text and entry['fetched_at'] >= until_text:
+                    continue
+                if hospital_ids is not None and entry.get('hospital_id') not in hospital_ids:
+                    continue
+                if kinds is not None and entry.get('kind') not in kinds:
+                    continue
+                yield entry
+
+    def iter_pages(self, entries: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], bytes]]:
+        """按归档文件和偏移顺序读取页面，产出 (索引项, 原始页面字节)"""
+        current_file = None
+        handle = None
+        try:
+            for entry in sorted(entries, key=lambda item: (item['file'], item['offset'])):
+                if entry['file'] != current_file:
+                    if handle is not None:
+                        handle.close()
+                    current_file = entry['file']
+                    handle = open(os.path.join(self.directory, current_file), 'rb')
+                handle.seek(entry['offset'])
+                try:
+                    yield entry, zlib.decompress(handle.read(entry['length']))
+                except zlib.error as e:
+                    self.logger.error(f"归档页面损坏 {entry['file']}@{entry['offset']}: {str(e)}")
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取归档统计"""
+        return dict(self.stats, pending=self._queue.qsize(), directory=self.directory)
+
+
+# 创建全局页面归档实例
+page_archive = PageArchive()
@@ -0,0 +1,149 @@
+"""
+列表分页识别
+
+识别招投标列表页的分页结构，供分页跟随抓取使用，包括：
+- “下一页”链接识别（链接文本、rel=next、class含next）
+- 分页URL模式识别（?page=2、index_2.html、/page/2/ 等），由模式直接生成后续页地址
+- 总页数识别（“共N页”或分页栏中的最大页码）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+# 下一页链接文本
+NEXT_TEXTS = {'下一页', '下页', '后一页', '下一页>', '下一页>>', 'next', 'next>', 'nextpage', '>', '>>', '›', '»'}
+
+# 查询参数中的页码：?page=2、&pageNo=3、&p=4
+PAGE_PARAM_PATTERN = re.compile(
+    r'([?&](?:page|pageno|pageindex|pagenum|pagenumber|curpage|currpage|currentpage|p|pn|pi)=)(\d+)',
+    re.IGNORECASE
+)
+
+# 路径中的页码：index_2.html、list-3.htm、/page/2/、/list/4.html
+PAGE_PATH_PATTERN = re.compile(r'([_\-/])(\d+)(\.s?html?|\.aspx?|\.jsp|\.php|/)?$', re.IGNORECASE)
+
+# 总页数：共12页、共 12 页
+TOTAL_PAGES_PATTERN = re.compile(r'共\s*(\d+)\s*页')
+
+PAGE_MARKER = '{page}'
+
+
+def split_page_number(url: str) -> Optional[Tuple[str, int]]:
+    """
+    将URL中的页码替换为占位符
+
+    Returns:
+        (URL模式, 页码)，URL中没有可识别的页码时返回None
+    """
+    match = PAGE_PARAM_PATTERN.search(url)
+    if match:
+        return url[:match.start(2)] + PAGE_MARKER + url[match.end(2):], int(match.group(2))
+
+    parsed = urlparse(url)
+    match = PAGE_PATH_PATTERN.search(parsed.path)
+    if match and not parsed.query:
+        path = parsed.path[:match.start(2)] + PAGE_MARKER + parsed.path[match.end(2):]
+        return parsed._replace(path=path, fragment='').geturl(), int(match.group(2))
+
+    return None
+
+
+def page_url(template: str, number: int) -> str:
+    """按URL模式生成指定页码的地址"""
+    return template.replace(PAGE_MARKER, str(number))
+
+
+def _is_next_link(link) -> bool:
+    text = re.sub(r'\s+', '', link.get_text()).lower()
+    if text in NEXT_TEXTS:
+        return True
+
+    rel = link.get('rel') or []
+    if isinstance(rel, str):
+        rel = rel.split()
+    if 'next' in [value.lower() for value in rel]:
+        return True
+
+    classes = link.get('class') or []
+    if isinstance(classes, str):
+        classes = classes.split()
+    return any(value.lower() in ('next', 'nextpage', 'page-next', 'next-page') for value in classes)
+
+
+def _usable_href(href: str) -> bool:
+    href = (href or '').strip()
+    return bool(href) and not href.startswith(('#', 'javascript:', 'mailto:'))
+
+
+def find_pagination(soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+    """
+    识别页面的分页结构（URL模式和总页数按当前页为第1页推算）
+
+    Args:
+        soup: 已解析的DOM
+        url: 页面地址
+
+    Returns:
+        {
+            'next_url': 下一页地址（可能为None）,
+            'template': 分页URL模式（可能为None）,
+            'next_number': 下一页在URL模式中的页码,
+            'last_number': 最后一页在URL模式中的页码（未知时为None）
+        }
+    """
+    result = {'next_url': None, 'template': None, 'next_number': None, 'last_number': None}
+
+    next_url = None
+    numbered: List[Tuple[int, str]] = []
+    for link in soup.find_all('a', href=True):
+        href = link.get('href', '')
+        if not _usable_href(href):
+            continue
+
+        if next_url is None and _is_next_link(link):
+            candidate = urljoin(url, href.strip())
+            if candidate != url:
+                next_url = candidate
+            continue
+
+        text = link.get_text(strip=True)
+        if text.isdigit() and len(text) <= 5:
+            numbered.append((int(text), urljoin(url, href.strip())))
+
+    if next_url is None:
+        # 没有“下一页”链接时，以分页栏中页码为2的链接作为下一页
+        next_url = next((link_url for number, link_url in numbered if number == 2 and link_url != url), None)
+
+    if next_url is None:
+        return result
+    result['next_url'] = next_url
+
+    split = split_page_number(next_url)
+    if split is None:
+        return result
+    template, next_number = split
+    result['template'] = template
+    result['next_number'] = next_number
+
+    # 页面中显示的页码与URL中页码的差值（如第2页为 index_1.html 时差值为-1）
+    offset = next_number - 2
+    last_number = None
+    for number, link_url in numbered:
+        link_split = split_page_number(link_url)
+        if link_split and link_split[0] == template:
+            last_number = max(last_number or 0, link_split[1])
+
+    total = TOTAL_PAGES_PATTERN.search(soup.get_text(' ', strip=True)[-5000:])
+    if total:
+        last_number = max(last_number or 0, int(total.group(1)) + offset)
+
+    if last_number is not None and last_number >= next_number:
+        result['last_number'] = last_number
+    return result
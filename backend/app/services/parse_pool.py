@@ -0,0 +1,266 @@
+"""
+页面解析进程池
+
+将HTML解析和招投标提取放到独立进程中执行，抓取线程只负责网络请求，包括：
+- 按CPU核数创建的解析进程池
+- 输入为原始HTML字节，输出为紧凑的元组，减少进程间序列化开销
+- 栏目列表页按医院的选择器模板提取，并返回重新学习的模板
+- 栏目列表页增量解析：遇到上次扫描已知的条目即停止
+- 进程池异常时自动重建，并在当前进程内完成本次解析
+- 可配置为不使用进程池（在当前进程内解析）
+- 解析完成后将原始页面按html_hash交给页面归档
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from app.services.html_decoder import decode, html_decoder
+from app.services.page_archive import page_archive
+
+# 招投标信息元组的字段顺序
+TENDER_FIELDS = (
+    'title', 'content', 'source_url', 'publish_date', 'deadline_date',
+    'budget_amount', 'budget_currency', 'tender_type', 'tender_category',
+    'content_hash', 'source_section', 'crawl_method', 'detail_url',
+)
+
+# 招投标栏目元组的字段顺序
+COLUMN_FIELDS = ('title', 'url', 'section', 'source', 'confidence')
+
+# 解析结果
+# - columns / tenders: 栏目元组列表、招投标元组列表
+# - template / template_hit: 选择器模板、是否命中已有模板
+# - signatures / stopped: 列表头部签名、是否因遇到已知条目提前停止
+# - pagination: 分页结构（见 pagination.find_pagination）
+ParseResult = namedtuple('ParseResult', [
+    'html_hash', 'columns', 'tenders', 'template', 'template_hit', 'signatures', 'stopped', 'pagination',
+])
+
+
+def tender_to_tuple(tender: Dict[str, Any]) -> tuple:
+    return tuple(tender.get(field) for field in TENDER_FIELDS)
+
+
+def tender_from_tuple(values: tuple) -> Dict[str, Any]:
+    return dict(zip(TENDER_FIELDS, values))
+
+
+def column_from_tuple(values: tuple) -> Dict[str, Any]:
+    return dict(zip(COLUMN_FIELDS, values))
+
+
+def html_digest(html: str) -> str:
+    """页面内容哈希（解析结果和页面归档共用）"""
+    return hashlib.sha256(html.encode('utf-8', errors='ignore')).hexdigest()
+
+
+def decode_html(content: bytes, encoding: Optional[str]) -> str:
+    """按抓取时识别出的编码解码HTML（未识别时在解析进程中检测）"""
+    return decode(content, encoding or html_decoder.detect(content))
+
+
+def parse_page(content: bytes, encoding: Optional[str], url: str, find_columns: bool = False,
+               templated: bool = False, template: Optional[Dict[str, Any]] = None,
+               known_signatures: Optional[List[str]] = None, paginate: bool = False,
+               continued: bool = False) -> ParseResult:
+    """
+    解析页面并提取招投标信息（在解析进程中执行）
+
+    Args:
+        content: 原始HTML字节
+        encoding: 响应声明的编码
+        url: 页面地址（跳转后的最终地址）
+        find_columns: 是否同时识别招投标栏目
+        templated: 是否使用选择器模板提取（模板为空或不匹配时回退到启发式提取并学习模板）
+        template: 医院已保存的选择器模板
+        known_signatures: 栏目上次扫描的列表头部签名，传入时启用增量截断（仅templated时有效）
+        paginate: 是否识别分页结构
+        continued: 是否为第2页起的分页（开头的已知条目计入增量截断，不视为置顶）
+    """
+    from app.services.html_parser import parse_html
+    from app.services.incremental_cutoff import IncrementalCutoff
+    from app.services.tender_extractor import tender_extractor
+
+    html = decode_html(content, encoding)
+    html_hash = html_digest(html)
+
+    # 页面只解析一次，栏目识别和招投标提取共享同一个DOM
+    soup = parse_html(html)
+    columns = []
+    if find_columns:
+        columns = [
+            tuple(column.get(field) for field in COLUMN_FIELDS)
+            for column in tender_extractor.find_tender_columns(soup, url)
+        ]
+    pagination = tender_extractor.find_pagination(soup, url) if paginate else None
+
+    template_hit = False
+    cutoff = None
+    if templated:
+        if known_signatures is not None:
+            cutoff = IncrementalCutoff(known_signatures, continued=continued)
+        tenders, template, template_hit = tender_extractor.extract_with_template(html, url, template, soup, cutoff)
+        if cutoff is not None:
+            cutoff.finish()
+    else:
+        tenders, template = tender_extractor.extract_tender_info(html, url, soup), None
+
+    return ParseResult(
+        html_hash=html_hash,
+        columns=columns,
+        tenders=[tender_to_tuple(tender) for tender in tenders],
+        template=template,
+        template_hit=template_hit,
+        signatures=cutoff.signatures() if cutoff else None,
+        stopped=cutoff.stopped if cutoff else False,
+        pagination=pagination,
+    )
+
+
+def parse_detail_page(content: bytes, encoding: Optional[str], url: str) -> Dict[str, Any]:
+    """解析招投标详情页并提取字段（在解析进程中执行，结果包含html_hash）"""
+    from app.services.html_parser import parse_html
+    from app.services.tender_extractor import tender_extractor
+
+    html = decode_html(content, encoding)
+    fields = tender_extractor.extract_detail_fields(html, url, parse_html(html))
+    fields['html_hash'] = html_digest(html)
+    return fields
+
+
+class ParsePool:
+    """页面解析进程池"""
+
+    def __init__(self, max_workers: int = None):
+        self.logger = logging.getLogger(__name__)
+
+        configured = Config.CRAWLER_CONFIG.get('PARSE_WORKERS')
+        if max_workers is None:
+            max_workers = configured if configured is not None else (os.cpu_count() or 1)
+        self.max_workers = max_workers
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+
+        with self._lock:
+            if self._executor is None:
+                # 使用spawn启动，避免在多线程进程中fork导致锁状态被复制
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def submit(self, content: bytes, encoding: Optional[str], url: str,
+               archive: Optional[Dict[str, Any]] = None, **options) -> Future:
+        """
+        提交解析任务（options同parse_page的可选参数）
+
+        Args:
+            archive: 页面来源信息（见 PageArchive.store），传入时解析成功后归档原始页面
+
+        Returns:
+            Future，结果为 ParseResult
+        """
+        return self._archived(self._submit(parse_page, content, encoding, url, **options),
+                              content, encoding, url, archive)
+
+    def parse(self, content: bytes, encoding: Optional[str], url: str,
+              archive: Optional[Dict[str, Any]] = None, **options) -> ParseResult:
+        """提交解析任务并等待结果"""
+        result = self._run(parse_page, content, encoding, url, **options)
+        self._archive(result.html_hash, content, encoding, url, archive)
+        return result
+
+    def submit_detail(self, content: bytes, encoding: Optional[str], url: str,
+                      archive: Optional[Dict[str, Any]] = None) -> Future:
+        """提交招投标详情页解析任务"""
+        return self._archived(self._submit(parse_detail_page, content, encoding, url),
+                              content, encoding, url, archive)
+
+    def parse_detail(self, content: bytes, encoding: Optional[str], url: str,
+                     archive: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """解析招投标详情页并等待结果"""
+        result = self._run(parse_detail_page, content, encoding, url)
+        self._archive(result['html_hash'], content, encoding, url, archive)
+        return result
+
+    def _archived(self, future: Future, content: bytes, encoding: Optional[str], url: str,
+                  archive: Optional[Dict[str, Any]]) -> Future:
+        """解析成功后归档原始页面（归档只入队，不阻塞结果回调）"""
+        if archive is not None:
+            def on_done(done: Future):
+                if done.cancelled() or done.exception() is not None:
+                    return
+                result = done.result()
+                html_hash = result['html_hash'] if isinstance(result, dict) else result.html_hash
+                self._archive(html_hash, content, encoding, url, archive)
+
+            future.add_done_callback(on_done)
+        return future
+
+    def _archive(self, html_hash: str, content: bytes, encoding: Optional[str], url: str,
+                 archive: Optional[Dict[str, Any]]):
+        if archive is not None:
+            page_archive.store(html_hash, content, encoding, url, archive)
+
+    def _submit(self, func, content: bytes, encoding: Optional[str], url: str, **options) -> Future:
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(func, content, encoding, url, **options)
+            except (BrokenProcessPool, RuntimeError) as e:
+                self.logger.error(f'解析进程池不可用，重建进程池: {str(e)}')
+                self._reset(executor)
+
+        # 未启用进程池或进程池不可用时在当前进程内解析
+        future: Future = Future()
+        try:
+            future.set_result(func(content, encoding, url, **options))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _run(self, func, content: bytes, encoding: Optional[str], url: str, **options):
+        """提交解析任务并等待结果；解析进程崩溃时在当前进程内重新解析"""
+        try:
+            return self._submit(func, content, encoding, url, **options).result()
+        except BrokenProcessPool as e:
+            self.logger.error(f'解析进程异常退出，改为本地解析 {url}: {str(e)}')
+            self._reset(self._executor)
+            return func(content, encoding, url, **options)
+
+    def _reset(self, executor: Optional[ProcessPoolExecutor]):
+        """丢弃已损坏的进程池，下次提交时重新创建"""
+        with self._lock:
+            if executor is not None and self._executor is executor:
+                self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """关闭进程池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# 创建全局页面解析进程池实例
+parse_pool = ParsePool()
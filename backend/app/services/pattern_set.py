@@ -0,0 +1,106 @@
+"""
+预编译的字段匹配模式组
+
+将同一字段的多个候选正则表达式预编译为按优先级排列的模式组，包括：
+- 模式只在初始化时编译一次
+- 自动提取每个模式必须出现的字面量，文本中不包含时直接跳过该模式
+- 结果与“按列表顺序逐个 re.search，取第一个命中的模式”完全一致
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import re
+from typing import List, Optional, Pattern
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+def required_literal(pattern: str, flags: int = 0) -> str:
+    """
+    提取正则表达式匹配时必须出现的最长字面量
+
+    只分析顶层顺序结构（含分组和至少重复一次的部分），遇到分支、字符集等
+    无法确定的结构时断开；无法分析时返回空字符串（不做预过滤）。
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError, ValueError):
+        return ''
+
+    best = ''
+    current = []
+
+    def visit(items):
+        nonlocal best, current
+        for op, value in items:
+            name = str(op)
+            if name == 'LITERAL':
+                current.append(chr(value))
+                continue
+
+            if name == 'SUBPATTERN':
+                # (group, add_flags, del_flags, pattern)
+                visit(value[-1])
+                continue
+
+            if name in ('MAX_REPEAT', 'MIN_REPEAT') and value[0] >= 1:
+                # 至少出现一次的重复：内容必然出现，但与前后字面量不连续
+                flush()
+                visit(value[2])
+                flush()
+                continue
+
+            flush()
+
+    def flush():
+        nonlocal best, current
+        literal = ''.join(current)
+        if len(literal) > len(best):
+            best = literal
+        current = []
+
+    visit(parsed)
+    flush()
+    return best
+
+
+class PatternSet:
+    """按优先级排列的一组字段匹配模式"""
+
+    def __init__(self, patterns: List[str], flags: int = 0):
+        """
+        Args:
+            patterns: 正则表达式列表，靠前的优先级高
+            flags: 正则标志
+        """
+        self.ignore_case = bool(flags & re.IGNORECASE)
+        self.patterns: List[Pattern] = [re.compile(pattern, flags) for pattern in patterns]
+        self.literals: List[str] = []
+        for pattern in patterns:
+            literal = required_literal(pattern, flags)
+            # 忽略大小写时只对大小写无关的字面量做预过滤
+            if self.ignore_case and literal.lower() != literal.upper():
+                literal = ''
+            self.literals.append(literal)
+
+    def search(self, text: str) -> Optional[re.Match]:
+        """
+        查找第一个能在文本中命中的模式（按列表顺序），返回该模式的匹配结果
+
+        文本中缺少某个模式必需的字面量时，该模式不可能命中，直接跳过。
+        """
+        if not text:
+            return None
+
+        for pattern, literal in zip(self.patterns, self.literals):
+            if literal and literal not in text:
+                continue
+            match = pattern.search(text)
+            if match:
+                return match
+        return None
@@ -0,0 +1,160 @@
+"""
+礼貌抓取调度器
+
+按域名维护下一次允许抓取的时间，替代请求后在线程内的随机休眠：
+- 每个主机独立计算抓取间隔（CRAWLER_CONFIG['DELAY_RANGE']）
+- 同步/异步两种等待方式
+- 从多个主机中挑选已到抓取时间的主机并同时占用其时间片（时间片绑定到执行该任务的线程，
+  由该任务的第一次抓取使用，其他抓取不能占用）
+- 定期清理长时间未访问的主机记录
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import asyncio
+import random
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+from config import Config
+
+# 自动清理主机记录的周期（秒）
+CLEANUP_INTERVAL = 600
+
+# 超过该时间未访问的主机记录被清理（秒）
+MAX_IDLE_SECONDS = 3600
+
+
+class PolitenessScheduler:
+    """按主机的礼貌抓取调度器"""
+
+    def __init__(self, delay_range: Tuple[float, float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.delay_range = delay_range or Config.CRAWLER_CONFIG.get('DELAY_RANGE', (1, 5))
+
+        # 主机 -> 下一次允许抓取的时间（time.monotonic）
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._last_cleanup = time.monotonic()
+
+        # 当前线程执行的任务挑选时占用的时间片：主机 -> 过期时间（time.monotonic）
+        self._local = threading.local()
+
+    def _next_delay(self) -> float:
+        return random.uniform(*self.delay_range)
+
+    def wait_time(self, host: str) -> float:
+        """返回主机距离下一次允许抓取还需等待的秒数"""
+        with self._lock:
+            return max(0.0, self._next_allowed.get(host, 0.0) - time.monotonic())
+
+    def try_acquire(self, host: str) -> float:
+        """
+        尝试占用主机的抓取时间片
+
+        Args:
+            host: 主机名
+
+        Returns:
+            0表示已占用成功，否则为仍需等待的秒数
+        """
+        now = time.monotonic()
+        # 当前任务挑选时已占用的时间片直接使用
+        claims = getattr(self._local, 'claims', None)
+        if claims and claims.pop(host, 0.0) > now:
+            return 0.0
+
+        with self._lock:
+            self._cleanup_if_due(now)
+            wait = self._next_allowed.get(host, 0.0) - now
+            if wait > 0:
+                return wait
+
+            self._next_allowed[host] = now + self._next_delay()
+            return 0.0
+
+    def acquire(self, host: str):
+        """阻塞等待直到可以抓取该主机（只等待同一主机的间隔）"""
+        while True:
+            wait = self.try_acquire(host)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, host: str):
+        """异步等待直到可以抓取该主机"""
+        while True:
+            wait = self.try_acquire(host)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pick_and_claim(self, hosts: Iterable[str]) -> Tuple[Optional[str], float]:
+        """
+        从候选主机中挑选一个已到抓取时间的主机，并在同一次加锁中占用其时间片
+
+        其他调用方随后挑选时该主机不再可用，避免多个任务同时选中同一主机后在抓取时等待；
+        执行任务时通过 claimed() 将时间片绑定到执行线程，由该任务对该主机的第一次 acquire 直接使用。
+
+        Args:
+            hosts: 候选主机列表
+
+        Returns:
+            (主机, 0)；没有可用主机时返回 (None, 最短等待秒数)
+        """
+        min_wait = None
+        with self._lock:
+            now = time.monotonic()
+            self._cleanup_if_due(now)
+            for host in hosts:
+                wait = self._next_allowed.get(host, 0.0) - now
+                if wait <= 0:
+                    self._next_allowed[host] = now + self._next_delay()
+                    return host, 0.0
+                if min_wait is None or wait < min_wait:
+                    min_wait = wait
+
+        return None, (min_wait or 0.0)
+
+    @contextmanager
+    def claimed(self, host: str):
+        """
+        在当前线程中执行 pick_and_claim 挑选出的任务（时间片只供该任务使用）
+
+        占用的时间片超过最大抓取间隔未使用时失效，任务结束后未使用的时间片同样失效。
+        """
+        claims = getattr(self._local, 'claims', None)
+        if claims is None:
+            claims = self._local.claims = {}
+        claims[host] = time.monotonic() + max(self.delay_range)
+        try:
+            yield
+        finally:
+            claims.pop(host, None)
+
+    def cleanup(self, max_idle_seconds: float = MAX_IDLE_SECONDS):
+        """清理长时间未访问的主机记录"""
+        with self._lock:
+            return self._cleanup(time.monotonic(), max_idle_seconds)
+
+    def _cleanup_if_due(self, now: float):
+        """定期清理主机记录（调用方持有锁）"""
+        if now - self._last_cleanup >= CLEANUP_INTERVAL:
+            self._cleanup(now, MAX_IDLE_SECONDS)
+
+    def _cleanup(self, now: float, max_idle_seconds: float) -> int:
+        self._last_cleanup = now
+        cutoff = now - max_idle_seconds
+        expired = [host for host, ts in self._next_allowed.items() if ts < cutoff]
+        for host in expired:
+            del self._next_allowed[host]
+        return len(expired)
+
+
+# 创建全局礼貌抓取调度器实例（爬虫服务、招投标提取、医院搜索共用）
+politeness_scheduler = PolitenessScheduler()
@@ -0,0 +1,263 @@
+"""
+robots.txt缓存
+
+按协议+主机缓存robots.txt解析结果，避免每次抓取重复下载，包括：
+- 带TTL的内存缓存（LRU容量上限）
+- 404等缺失情况的否定缓存
+- 抓取失败的短期缓存
+- 可选的数据库持久化，重启后无需重新下载
+- 提供robots.txt中声明的站点地图地址，供招投标信息源发现使用
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import random
+import threading
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib import robotparser
+from urllib.parse import urlparse
+
+import requests
+
+from config import Config
+from app.services.http_pool import http_pool
+
+
+class _RobotsEntry:
+    """单个主机的robots.txt缓存项"""
+
+    __slots__ = ('parser', 'status_code', 'content', 'expires_at')
+
+    def __init__(self, parser: Optional[robotparser.RobotFileParser], status_code: Optional[int],
+                 content: Optional[str], expires_at: float):
+        self.parser = parser
+        self.status_code = status_code
+        self.content = content
+        self.expires_at = expires_at
+
+
+class RobotsCache:
+    """robots.txt规则缓存"""
+
+    def __init__(self, ttl: int = None, negative_ttl: int = None, error_ttl: int = None,
+                 max_entries: int = None, persist: bool = None):
+        self.logger = logging.getLogger(__name__)
+
+        crawler_config = Config.CRAWLER_CONFIG
+        self.ttl = ttl or crawler_config.get('ROBOTS_CACHE_TTL', 86400)
+        self.negative_ttl = negative_ttl or crawler_config.get('ROBOTS_NEGATIVE_TTL', 21600)
+        self.error_ttl = error_ttl or crawler_config.get('ROBOTS_ERROR_TTL', 600)
+        self.max_entries = max_entries or crawler_config.get('ROBOTS_CACHE_SIZE', 10000)
+        self.persist = crawler_config.get('ROBOTS_CACHE_PERSIST', False) if persist is None else persist
+
+        self.app = None
+        self._entries: 'OrderedDict[str, _RobotsEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        # 每个主机一把抓取锁，避免并发请求重复下载同一个robots.txt
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'db_hits': 0,
+            'fetches': 0,
+            'evictions': 0,
+        }
+
+    def init_app(self, app):
+        """绑定Flask应用，用于后台线程中访问数据库"""
+        self.app = app
+
+    def can_fetch(self, url: str, user_agent: str = '*') -> Optional[bool]:
+        """
+        检查URL是否允许抓取
+
+        Args:
+            url: 待抓取的URL
+            user_agent: 爬虫标识
+
+        Returns:
+            是否允许抓取；robots.txt无法获取时返回None
+        """
+        parser = self.get_parser(url)
+        if parser is None:
+            return None
+        return parser.can_fetch(user_agent, url)
+
+    def get_parser(self, url: str) -> Optional[robotparser.RobotFileParser]:
+        """获取URL所属主机的robots.txt解析器"""
+        origin = self._origin(url)
+        if not origin:
+            return None
+
+        entry = self._get_cached(origin)
+        if entry is not None:
+            return entry.parser
+
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(origin, threading.Lock())
+
+        with fetch_lock:
+            # 等待期间可能已由其他线程完成抓取
+            entry = self._get_cached(origin, count=False)
+            if entry is None:
+                entry = self._load_persisted(origin)
+            if entry is None:
+                entry = self._fetch(origin)
+                self._save_persisted(origin, entry)
+            self._store(origin, entry)
+
+        with self._lock:
+            self._fetch_locks.pop(origin, None)
+
+        return entry.parser
+
+    def sitemaps(self, url: str) -> List[str]:
+        """robots.txt中声明的站点地图地址（Sitemap指令）"""
+        parser = self.get_parser(url)
+        if parser is None:
+            return []
+        return list(parser.site_maps() or [])
+
+    def invalidate(self, url: str):
+        """使某个主机的缓存失效"""
+        origin = self._origin(url)
+        with self._lock:
+            self._entries.pop(origin, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计信息"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
+
+    def _origin(self, url: str) -> Optional[str]:
+        parsed = urlparse(url)
+        if not parsed.scheme or not parsed.netloc:
+            return None
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+    def _get_cached(self, origin: str, count: bool = True) -> Optional[_RobotsEntry]:
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry is not None and entry.expires_at > time.time():
+                self._entries.move_to_end(origin)
+                if count:
+                    self._stats['hits'] += 1
+                return entry
+
+            if entry is not None:
+                del self._entries[origin]
+            if count:
+                self._stats['misses'] += 1
+            return None
+
+    def _store(self, origin: str, entry: _RobotsEntry):
+        with self._lock:
+            self._entries[origin] = entry
+            self._entries.move_to_end(origin)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _build_entry(self, origin: str, status_code: Optional[int], content: Optional[str],
+                     expires_at: float) -> _RobotsEntry:
+        """按RobotFileParser.read的规则根据状态码构建解析器"""
+        parser = None
+        if status_code is not None and status_code < 500:
+            parser = robotparser.RobotFileParser(f"{origin}/robots.txt")
+            if status_code in (401, 403):
+                parser.disallow_all = True
+            elif status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse((content or '').splitlines())
+
+        return _RobotsEntry(parser, status_code, content, expires_at)
+
+    def _fetch(self, origin: str) -> _RobotsEntry:
+        """下载并解析robots.txt"""
+        crawler_config = Config.CRAWLER_CONFIG
+        with self._lock:
+            self._stats['fetches'] += 1
+
+        try:
+            response = http_pool.get(
+                f"{origin}/robots.txt",
+                headers={'User-Agent': random.choice(crawler_config['USER_AGENTS'])},
+                timeout=crawler_config['REQUEST_TIMEOUT']
+            )
+        except requests.RequestException as e:
+            self.logger.debug(f'robots.txt抓取失败 {origin}: {str(e)}')
+            return self._build_entry(origin, None, None, time.time() + self.error_ttl)
+
+        status_code = response.status_code
+        if status_code >= 500:
+            ttl = self.error_ttl
+        elif status_code >= 400 and status_code not in (401, 403):
+            # 否定缓存：robots.txt不存在时视为全部允许
+            ttl = self.negative_ttl
+        else:
+            ttl = self.ttl
+
+        content = response.text if status_code < 400 else None
+        return self._build_entry(origin, status_code, content, time.time() + ttl)
+
+    def _load_persisted(self, origin: str) -> Optional[_RobotsEntry]:
+        """从数据库加载未过期的缓存"""
+        if not self.persist or self.app is None:
+            return None
+
+        try:
+            from app.models import RobotsCacheEntry
+
+            with self.app.app_context():
+                record = RobotsCacheEntry.query.filter_by(origin=origin).first()
+                if record is None or record.expires_at <= datetime.utcnow():
+                    return None
+
+                remaining = (record.expires_at - datetime.utcnow()).total_seconds()
+                entry = self._build_entry(origin, record.status_code, record.content, time.time() + remaining)
+
+            with self._lock:
+                self._stats['db_hits'] += 1
+            return entry
+
+        except Exception as e:
+            self.logger.error(f'加载robots.txt缓存失败 {origin}: {str(e)}')
+            return None
+
+    def _save_persisted(self, origin: str, entry: _RobotsEntry):
+        """将抓取结果写入数据库（抓取失败的结果不持久化）"""
+        if not self.persist or self.app is None or entry.status_code is None:
+            return
+
+        try:
+            from app import db
+            from app.models import RobotsCacheEntry
+
+            with self.app.app_context():
+                record = RobotsCacheEntry.query.filter_by(origin=origin).first()
+                if record is None:
+                    record = RobotsCacheEntry(origin=origin)
+                    db.session.add(record)
+
+                record.status_code = entry.status_code
+                record.content = entry.content
+                record.fetched_at = datetime.utcnow()
+                record.expires_at = datetime.utcnow() + timedelta(seconds=max(0, entry.expires_at - time.time()))
+                db.session.commit()
+
+        except Exception as e:
+            self.logger.error(f'保存robots.txt缓存失败 {origin}: {str(e)}')
+
+
+# 创建全局robots.txt缓存实例
+robots_cache = RobotsCache()
@@ -0,0 +1,122 @@
+"""
+招投标扫描计划
+
+各医院发布招投标的频率差别很大（有的每天发布，有的一年只发布几次），
+按医院估计新数据出现的频率并据此安排下次扫描时间，包括：
+- 发布频率：近期招投标记录按发布日期统计的条数/天
+- 列表变化频率：扫描发现的变化数（新招投标条数，只有列表头部变化时计1）与扫描间隔天数
+  分别做指数滑动平均，两者之比即为次/天（各次扫描间隔不同时仍按总时长估计）；
+  扫描间隔按最后一次招投标扫描时间计算，官网验证不影响
+- 扫描间隔：预计每次扫描出现固定数量的新数据，限制在最小和最大间隔之间，并加入随机抖动
+- 到期查询：按带索引的 next_scan_at 只取出已到期的医院
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import logging
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+from config import Config
+from app import db
+from app.models import Hospital, TenderRecord
+
+
+class ScanPlanner:
+    """招投标扫描计划"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+        scheduler_config = Config.SCHEDULER_CONFIG
+        self.default_hours = scheduler_config.get('TENDER_SCAN_INTERVAL', 6)
+        self.min_hours = scheduler_config.get('SCAN_MIN_INTERVAL_HOURS', 1)
+        self.max_hours = scheduler_config.get('SCAN_MAX_INTERVAL_HOURS', 168)
+        self.target_events = scheduler_config.get('SCAN_TARGET_EVENTS', 0.5)
+        self.rate_window_days = scheduler_config.get('SCAN_RATE_WINDOW_DAYS', 90)
+        self.smoothing = scheduler_config.get('SCAN_CHANGE_SMOOTHING', 0.3)
+        self.jitter = scheduler_config.get('SCAN_JITTER', 0.1)
+        self.max_due = scheduler_config.get('SCAN_MAX_DUE_HOSPITALS', 500)
+
+    def due_hospitals(self, now: datetime = None, limit: int = None) -> List[Hospital]:
+        """已到期的医院（从未扫描过的优先，其次按到期时间先后）"""
+        now = now or datetime.utcnow()
+        return Hospital.query.filter(
+            Hospital.status == 'active',
+            Hospital.website_url.isnot(None),
+            Hospital.website_url != '',
+            db.or_(Hospital.next_scan_at.is_(None), Hospital.next_scan_at <= now)
+        ).order_by(
+            Hospital.next_scan_at.isnot(None), Hospital.next_scan_at
+        ).limit(limit or self.max_due).all()
+
+    def observe(self, hospital: Hospital, changes: int, now: datetime):
+        """
+        记录一次招投标扫描发现的变化数，更新变化频率
+
+        Args:
+            hospital: 医院
+            changes: 本次扫描发现的新招投标条数（只有列表头部变化时为1）
+            now: 本次扫描时间
+        """
+        previous_scan = hospital.last_tender_scan_at
+        hospital.last_tender_scan_at = now
+        if previous_scan is None or now <= previous_scan:
+            return
+        interval_days = (now - previous_scan).total_seconds() / 86400
+
+        # 没有历史时以默认间隔内出现 SCAN_TARGET_EVENTS 条变化为先验，单次观测不会直接得到0或极大值
+        events = float(hospital.change_events) if hospital.change_events is not None else self.target_events
+        days = float(hospital.scan_interval_days) if hospital.scan_interval_days is not None \
+            else self.default_hours / 24
+        events += self.smoothing * (changes - events)
+        days += self.smoothing * (interval_days - days)
+
+        hospital.change_events = round(events, 4)
+        hospital.scan_interval_days = round(days, 4)
+        hospital.change_rate = round(min(events / days, 999999), 4)
+
+    def plan(self, hospital: Hospital, now: datetime) -> datetime:
+        """按近期发布频率和列表变化频率安排下次扫描时间"""
+        since = now - timedelta(days=self.rate_window_days)
+        published = TenderRecord.query.filter(
+            TenderRecord.hospital_id == hospital.id,
+            TenderRecord.publish_date >= since,
+            TenderRecord.publish_date <= now
+        ).count()
+        hospital.publish_rate = round(published / self.rate_window_days, 4)
+
+        hours = self.interval_hours(hospital)
+        if self.jitter:
+            # 随机抖动，避免同时到期的医院始终在同一批扫描
+            hours *= 1 + random.uniform(-self.jitter, self.jitter)
+        hospital.next_scan_at = now + timedelta(hours=hours)
+        return hospital.next_scan_at
+
+    def interval_hours(self, hospital: Hospital) -> float:
+        """扫描间隔（小时）：预计每次扫描出现 SCAN_TARGET_EVENTS 条新数据"""
+        rates = [float(value) for value in (hospital.publish_rate, hospital.change_rate) if value is not None]
+        if hospital.change_rate is None and not any(rates):
+            # 还没有足够的扫描历史，按默认间隔扫描
+            hours = self.default_hours
+        else:
+            rate = max(rates, default=0.0)
+            hours = 24 * self.target_events / rate if rate > 0 else self.max_hours
+        return min(max(hours, self.min_hours), self.max_hours)
+
+    def defer(self, hospital_ids: Iterable[int], now: datetime):
+        """扫描未能完成的医院按最小间隔重试（避免每次调度都重复扫描）"""
+        hospital_ids = list(hospital_ids)
+        if not hospital_ids:
+            return
+        Hospital.query.filter(Hospital.id.in_(hospital_ids)).update(
+            {Hospital.next_scan_at: now + timedelta(hours=self.min_hours)}, synchronize_session=False
+        )
+
+
+# 创建全局扫描计划实例
+scan_planner = ScanPlanner()
@@ -0,0 +1,112 @@
+"""
+招投标列表选择器模板
+
+根据启发式提取的结果学习医院网站招投标列表的结构，生成可复用的CSS选择器模板，包括：
+- 由产生招投标信息的行元素反推列表容器和行的选择器
+- 选择器编译缓存（同一模板只编译一次）
+- 按模板直接选出招投标行，跳过整页DOM分析
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import soupsieve
+from bs4 import Tag
+
+from config import Config
+
+# 列表容器的class识别模式（与提取器的启发式规则一致）
+LIST_CONTAINER_PATTERN = re.compile(r'list|item|news|tender|bid')
+
+
+@lru_cache(maxsize=1024)
+def compile_selector(selector: str):
+    """编译CSS选择器（按选择器字符串缓存）"""
+    return soupsieve.compile(selector)
+
+
+def element_selector(element: Tag) -> str:
+    """生成元素自身的选择器：标签名加全部class"""
+    classes = element.get('class') or []
+    if isinstance(classes, str):
+        classes = classes.split()
+    return element.name + ''.join(f'.{soupsieve.escape(value)}' for value in classes)
+
+
+def _is_list_container(element: Tag) -> bool:
+    if element.name not in ('ul', 'ol', 'div'):
+        return False
+    classes = element.get('class') or []
+    if isinstance(classes, str):
+        classes = classes.split()
+    return any(LIST_CONTAINER_PATTERN.search(value) for value in classes)
+
+
+def row_selector(kind: str, row: Tag) -> Optional[str]:
+    """
+    生成招投标行的选择器
+
+    - 列表：最近的列表容器 + 行标签（行为容器直接子元素时使用子代选择器）
+    - 表格：最近的表格 + tr
+    """
+    if kind == 'table':
+        table = row.find_parent('table')
+        return f'{element_selector(table)} tr' if table is not None else None
+
+    container = row.parent
+    while container is not None and not _is_list_container(container):
+        container = container.parent
+    if container is None:
+        return None
+
+    combinator = ' > ' if row.parent is container else ' '
+    return f'{element_selector(container)}{combinator}{row.name}'
+
+
+def learn_template(origins: Iterable[Tuple[str, Tag]], min_rows: int = None) -> Optional[Dict[str, Any]]:
+    """
+    从启发式提取的来源元素中学习模板
+
+    Args:
+        origins: (类型, 行元素) 列表，类型为 list / table
+        min_rows: 模板至少覆盖的行数，默认读取配置
+
+    Returns:
+        模板字典 {'kind', 'selector', 'row_count'}，无法确定时返回None
+    """
+    if min_rows is None:
+        min_rows = Config.CRAWLER_CONFIG.get('TEMPLATE_MIN_ROWS', 3)
+
+    counter: Counter = Counter()
+    for kind, row in origins:
+        selector = row_selector(kind, row)
+        if selector:
+            counter[(kind, selector)] += 1
+
+    if not counter:
+        return None
+
+    (kind, selector), row_count = counter.most_common(1)[0]
+    if row_count < min_rows:
+        return None
+
+    try:
+        compile_selector(selector)
+    except Exception:
+        return None
+
+    return {'kind': kind, 'selector': selector, 'row_count': row_count}
+
+
+def select_rows(soup, template: Dict[str, Any]) -> List[Tag]:
+    """按模板选出招投标行，选择器无效时返回空列表"""
+    try:
+        return compile_selector(template['selector']).select(soup)
+    except Exception:
+        return []
@@ -0,0 +1,115 @@
+"""
+响应体流式读取
+
+以流式方式读取HTTP响应体，限制单个页面占用的内存，包括：
+- 下载前按URL扩展名和Content-Type过滤非HTML资源
+- 可配置的响应体字节上限
+- 读取到HTML结束标签后提前停止
+- 读取结果回填到响应对象，后续仍可使用response.content / response.text
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import logging
+from typing import Tuple
+from urllib.parse import urlparse
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 常见的非HTML资源扩展名（招投标附件等），命中时不发起请求
+BINARY_EXTENSIONS = (
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.wps', '.et',
+    '.zip', '.rar', '.7z', '.gz', '.tar',
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.svg', '.ico',
+    '.mp3', '.mp4', '.avi', '.wmv', '.flv', '.swf',
+    '.exe', '.msi', '.apk', '.iso', '.dwg',
+)
+
+# HTML结束标签，读取到后即可停止下载
+_HTML_END_MARKER = b'</html'
+
+
+def looks_binary_url(url: str) -> bool:
+    """根据URL扩展名判断是否为非HTML资源"""
+    path = urlparse(url).path.lower()
+    return path.endswith(BINARY_EXTENSIONS)
+
+
+def is_html_response(response) -> bool:
+    """
+    根据Content-Type判断响应是否为HTML
+
+    未声明Content-Type的响应按HTML处理，很多医院网站不返回该响应头。
+    """
+    content_type = response.headers.get('Content-Type', '')
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    if not media_type:
+        return True
+
+    allowed = Config.CRAWLER_CONFIG.get('HTML_CONTENT_TYPES', ('text/html', 'application/xhtml+xml'))
+    return media_type in allowed
+
+
+def read_body(response, max_bytes: int = None, chunk_size: int = None) -> Tuple[bytes, bool]:
+    """
+    流式读取响应体（响应需以stream=True发起）
+
+    超过字节上限或读取到HTML结束标签后停止下载，未读完的连接直接关闭，
+    不归还连接池。读取结果回填到response，后续访问response.content不会再次下载。
+
+    Args:
+        response: requests响应对象
+        max_bytes: 最大读取字节数，默认读取CRAWLER_CONFIG['MAX_CONTENT_BYTES']
+        chunk_size: 每次读取的字节数
+
+    Returns:
+        (响应体, 是否被截断)
+    """
+    crawler_config = Config.CRAWLER_CONFIG
+    max_bytes = max_bytes or crawler_config.get('MAX_CONTENT_BYTES', 2 * 1024 * 1024)
+    chunk_size = chunk_size or crawler_config.get('STREAM_CHUNK_SIZE', 16384)
+
+    chunks = []
+    received = 0
+    truncated = False
+    finished_early = False
+    tail = b''
+
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+
+            if received + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - received])
+                received = max_bytes
+                truncated = True
+                break
+
+            chunks.append(chunk)
+            received += len(chunk)
+
+            # 与上一块的末尾拼接，避免结束标签跨块时漏判
+            window = (tail + chunk).lower()
+            if _HTML_END_MARKER in window:
+                finished_early = True
+                break
+            tail = chunk[-len(_HTML_END_MARKER):]
+    finally:
+        if truncated or finished_early:
+            # 剩余数据未读取，关闭连接而不是归还连接池
+            response.close()
+
+    body = b''.join(chunks)
+    response._content = body
+    response._content_consumed = True
+
+    if truncated:
+        logger.debug(f'响应体超过 {max_bytes} 字节已截断: {response.url}')
+
+    return body, truncated
+
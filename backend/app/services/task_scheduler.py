@@ -24,6 +24,8 @@ import atexit
 import threading
 from flask import current_app
 
+from config import Config
+
 class TaskScheduler:
     """任务调度器"""
     
@@ -52,6 +54,9 @@ class TaskScheduler:
             timezone='Asia/Shanghai'
         )
         
+        # Flask应用（后台任务访问数据库时使用）
+        self.app = None
+        
         # 任务状态跟踪
         self.task_status = {}
         self.task_lock = threading.Lock()
@@ -68,6 +73,12 @@ class TaskScheduler:
         """启动调度器"""
         try:
             if not self.scheduler.running:
+                # 记录当前应用，后台线程中执行任务时推入应用上下文
+                try:
+                    self.app = current_app._get_current_object()
+                except RuntimeError:
+                    self.app = None
+                
                 self.scheduler.start()
                 self.logger.info("任务调度器启动成功")
                 
@@ -93,13 +104,13 @@ class TaskScheduler:
     def _add_default_jobs(self):
         """添加默认的定时任务"""
         try:
-            # 招投标监控任务 - 每6小时执行一次
+            # 招投标监控任务 - 定期检查并只扫描已到期的医院（各医院的扫描间隔按发布频率调整）
             self.add_recurring_job(
                 job_id='tender_monitor',
                 func=self._execute_tender_monitor,
-                trigger=IntervalTrigger(hours=6),
+                trigger=IntervalTrigger(minutes=Config.SCHEDULER_CONFIG.get('TENDER_SCAN_TICK_MINUTES', 15)),
                 args=[self.TASK_TYPES['TENDER_MONITOR']],
-                max_instances=2,
+                max_instances=1,
                 replace_existing=True
             )
             
@@ -409,14 +420,13 @@ class TaskScheduler:
     
     def _perform_tender_monitoring(self) -> Dict[str, Any]:
         """执行实际的招投标监控逻辑"""
-        # 模拟执行结果
-        return {
-            'hospitals_scanned': 150,
-            'tenders_found': 25,
-            'new_tenders': 8,
-            'important_tenders': 2,
-            'execution_time': '00:05:30'
-        }
+        if self.app is None:
+            raise RuntimeError('调度器未绑定Flask应用，无法访问数据库')
+        
+        from app.services.tender_monitor import tender_monitor
+        
+        with self.app.app_context():
+            return tender_monitor.run_due_scan()
     
     def _perform_hospital_scanning(self) -> Dict[str, Any]:
         """执行实际的医院扫描逻辑"""
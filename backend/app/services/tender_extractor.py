@@ -6,6 +6,7 @@
 - HTML内容解析和结构化提取
 - 招投标信息字段抽取
 - 内容去重和增量更新
+- 列表分页跟随抓取（下一页链接和分页URL模式）
 
 作者：MiniMax Agent
 版本：v1.0
@@ -15,13 +16,29 @@
 import re
 import hashlib
 import json
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Iterator, Optional, Tuple, Any
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup, Tag
 import requests
 import logging
 
+from config import Config
+from app.services.politeness import politeness_scheduler
+from app.services.http_pool import http_pool
+from app.services.html_decoder import decode, html_decoder
+from app.services.html_parser import parse_html
+from app.services.keyword_matcher import KeywordAutomaton, KeywordGroupMatcher
+from app.services.incremental_cutoff import IncrementalCutoff
+from app.services.pagination import find_pagination, page_url
+from app.services.pattern_set import PatternSet
+from app.services.selector_template import LIST_CONTAINER_PATTERN, learn_template, select_rows
+from app.services.stream_reader import is_html_response, looks_binary_url, read_body
+from app.services.url_canonical import canonicalize
+
 class TenderExtractor:
     """招投标信息提取器"""
     
@@ -70,6 +87,22 @@ class TenderExtractor:
             ]
         }
         
+        # 字段匹配模式组（初始化时编译，按必需字面量跳过不可能命中的模式）
+        self.field_patterns = {
+            'title': PatternSet(self.content_patterns['title'], re.IGNORECASE),
+            'date': PatternSet(self.content_patterns['date']),
+            'deadline': PatternSet(self.content_patterns['deadline']),
+            'budget': PatternSet(self.content_patterns['budget']),
+        }
+        self.date_formats = PatternSet([
+            r'(\d{4})[-年](\d{1,2})[-月](\d{1,2})[日]?',
+            r'(\d{4})/(\d{1,2})/(\d{1,2})',
+            r'(\d{1,2})[-/\.](\d{1,2})[-/\.](\d{4})',
+        ])
+        self.cell_date_pattern = re.compile(r'\d{4}[-年]\d{1,2}[-月]\d{1,2}')
+        self.cell_budget_pattern = re.compile(r'(\d+(?:\.\d+)?)\s*万元')
+        self.sentence_split_pattern = re.compile(r'[。！？\n]')
+        
         # 内容分类关键词
         self.category_keywords = {
             'construction': ['建设', '工程', '装修', '基建', '施工'],
@@ -89,6 +122,15 @@ class TenderExtractor:
             'equipment': ['设备', '器械', '仪器'],
             'other': []
         }
+        
+        # 列表容器和正文段落的class识别模式
+        self.list_class_pattern = LIST_CONTAINER_PATTERN
+        self.content_class_pattern = re.compile(r'content|article|news|item')
+        
+        # 关键词匹配自动机（一次扫描完成全部关键词匹配）
+        self.tender_matcher = KeywordAutomaton(self.tender_keywords)
+        self.type_matcher = KeywordGroupMatcher(self.type_keywords, ignore_case=True)
+        self.category_matcher = KeywordGroupMatcher(self.category_keywords, ignore_case=True)
     
     def find_tender_columns(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, Any]]:
         """
@@ -112,17 +154,17 @@ class TenderExtractor:
                 text = link.get_text(strip=True)
                 
                 # 检查链接文本和URL是否包含招投标关键词
-                if any(keyword in text or keyword in href.lower() 
-                      for keyword in self.tender_keywords):
+                if self._is_tender_link(text, href):
                     
-                    # 构建完整URL
-                    full_url = urljoin(base_url, href)
+                    # 构建完整URL（规范化后去重）
+                    full_url = canonicalize(href, base_url) or urljoin(base_url, href)
                     
                     tender_columns.append({
                         'title': text,
                         'url': full_url,
                         'section': self._identify_section_type(text, href),
-                        'source': 'navigation'
+                        'source': 'navigation',
+                        'confidence': self._column_confidence(text, href, 'navigation')
                     })
         
         # 查找页面中的招投标相关内容
@@ -130,7 +172,7 @@ class TenderExtractor:
         for element in content_elements:
             # 检查元素是否包含招投标关键词
             text = element.get_text(strip=True)
-            if any(keyword in text for keyword in self.tender_keywords):
+            if self.tender_matcher.contains_any(text):
                 
                 # 查找该元素内的链接
                 links = element.find_all('a', href=True)
@@ -138,16 +180,16 @@ class TenderExtractor:
                     href = link.get('href', '')
                     link_text = link.get_text(strip=True)
                     
-                    if any(keyword in link_text or keyword in href.lower() 
-                          for keyword in self.tender_keywords):
+                    if self._is_tender_link(link_text, href):
                         
-                        full_url = urljoin(base_url, href)
+                        full_url = canonicalize(href, base_url) or urljoin(base_url, href)
                         
                         tender_columns.append({
                             'title': link_text,
                             'url': full_url,
                             'section': self._identify_section_type(link_text, href),
-                            'source': 'content'
+                            'source': 'content',
+                            'confidence': self._column_confidence(link_text, href, 'content')
                         })
         
         # 去重并返回
@@ -161,36 +203,271 @@ class TenderExtractor:
         self.logger.info(f"找到 {len(unique_columns)} 个招投标栏目")
         return unique_columns
     
-    def extract_tender_info(self, html_content: str, url: str) -> List[Dict[str, Any]]:
+    def _is_tender_link(self, text: str, href: str) -> bool:
+        """链接文本或URL是否包含招投标关键词"""
+        return self.tender_matcher.contains_any(text) or self.tender_matcher.contains_any(href.lower())
+    
+    def _column_confidence(self, text: str, href: str, source: str) -> float:
+        """
+        估计栏目链接确实是招投标栏目的置信度（0~1）
+        
+        导航菜单中的链接高于正文链接；链接文本含关键词高于仅URL含关键词；
+        能识别出具体栏目类型的再加分。
+        """
+        confidence = 0.5 if source == 'navigation' else 0.3
+        if self.tender_matcher.contains_any(text):
+            confidence += 0.3
+        if self._identify_section_type(text, href) != '其他':
+            confidence += 0.2
+        return round(min(confidence, 1.0), 2)
+    
+    def find_pagination(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+        """识别列表页的分页结构（下一页链接、分页URL模式和最后一页页码）"""
+        return find_pagination(soup, url)
+    
+    def follow_pagination(self, pagination: Optional[Dict[str, Any]], max_pages: int = None,
+                          concurrency: int = None, template: Optional[Dict[str, Any]] = None,
+                          known_signatures: Optional[List[str]] = None,
+                          archive: Optional[Dict[str, Any]] = None,
+                          frontier=None) -> Iterator[Tuple[Dict[str, Any], Any]]:
+        """
+        跟随分页抓取并解析后续列表页（第2页起），按页码顺序逐页产出结果
+        
+        识别出分页URL模式时由模式直接生成后续页地址并发抓取；只有“下一页”链接时逐页跟随。
+        同时在途的页面不超过并发数，调用方逐页入库即可保持内存占用与总页数无关。
+        遇到抓取失败、空页、与上一页内容相同、增量截断或本次扫描已抓取过的页面时停止。
+        
+        Args:
+            pagination: 第1页的分页结构（ParseResult.pagination）
+            max_pages: 最多抓取的页数（含第1页）
+            concurrency: 同时抓取的页数
+            template: 选择器模板
+            known_signatures: 增量截断使用的已知签名，为None时不截断
+            archive: 页面来源信息，传入时归档抓取到的页面
+            frontier: 本次扫描中本医院的抓取边界（FrontierScope），传入时跳过已抓取过的分页
+            
+        Yields:
+            (页面抓取结果, ParseResult)
+        """
+        from app.services.parse_pool import parse_pool
+        
+        crawler_config = Config.CRAWLER_CONFIG
+        max_pages = max_pages or crawler_config.get('PAGINATION_MAX_PAGES', 5)
+        concurrency = max(1, concurrency or crawler_config.get('PAGINATION_CONCURRENCY', 2))
+        if not pagination or not pagination.get('next_url') or max_pages <= 1:
+            return
+        
+        def fetch_and_parse(url: str):
+            if frontier is not None and not frontier.admit(url):
+                # 其他栏目已抓取过该分页（栏目之间共享分页时常见）
+                return {'url': url, 'status': 'duplicate'}, None
+            page = self.fetch_page_conditional(url, decode=False)
+            content = page.pop('content', None)
+            if page['status'] != 'ok':
+                return page, None
+            parsed = parse_pool.parse(
+                content, page['encoding'], page['final_url'],
+                templated=True, template=template, known_signatures=known_signatures, paginate=True,
+                continued=True, archive=archive
+            )
+            return page, parsed
+        
+        remaining = max_pages - 1
+        previous_hash = None
+        
+        # 只有“下一页”链接：逐页跟随
+        if not pagination.get('template'):
+            url = pagination['next_url']
+            visited = set()
+            while url and remaining > 0 and url not in visited:
+                visited.add(url)
+                remaining -= 1
+                page, parsed = fetch_and_parse(url)
+                if not self._page_continues(parsed, previous_hash):
+                    return
+                previous_hash = parsed.html_hash
+                yield page, parsed
+                if parsed.stopped:
+                    return
+                url = (parsed.pagination or {}).get('next_url')
+            return
+        
+        # 分页URL模式：按页码生成地址，保持最多 concurrency 个页面在途
+        number = pagination['next_number']
+        last_number = pagination.get('last_number')
+        
+        def next_url() -> Optional[str]:
+            nonlocal number, remaining
+            if remaining <= 0 or (last_number is not None and number > last_number):
+                return None
+            url = page_url(pagination['template'], number)
+            number += 1
+            remaining -= 1
+            return url
+        
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        in_flight = deque()
+        try:
+            for _ in range(concurrency):
+                url = next_url()
+                if url is None:
+                    break
+                in_flight.append(executor.submit(fetch_and_parse, url))
+            
+            while in_flight:
+                page, parsed = in_flight.popleft().result()
+                if not self._page_continues(parsed, previous_hash):
+                    return
+                previous_hash = parsed.html_hash
+                yield page, parsed
+                if parsed.stopped:
+                    return
+                
+                url = next_url()
+                if url is not None:
+                    in_flight.append(executor.submit(fetch_and_parse, url))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _page_continues(self, parsed, previous_hash: Optional[str]) -> bool:
+        """后续分页是否有效：抓取成功、有列表条目且与上一页内容不同（越界页码常返回最后一页）"""
+        if parsed is None:
+            return False
+        if not parsed.tenders and not parsed.signatures:
+            return False
+        return parsed.html_hash != previous_hash
+    
+    def fetch_page(self, url: str) -> Optional[str]:
+        """
+        抓取招投标页面HTML
+        
+        Args:
+            url: 页面URL
+            
+        Returns:
+            页面HTML，抓取失败时返回None
+        """
+        page = self.fetch_page_conditional(url)
+        return page['html'] if page['status'] == 'ok' else None
+    
+    def fetch_page_conditional(self, url: str, etag: str = None, last_modified: str = None,
+                               decode: bool = True) -> Dict[str, Any]:
+        """
+        使用条件请求抓取招投标页面
+        
+        Args:
+            url: 页面URL
+            etag: 上次抓取返回的ETag（发送If-None-Match）
+            last_modified: 上次抓取返回的Last-Modified（发送If-Modified-Since）
+            decode: 是否解码为文本；交给解析进程处理时只需原始字节（content）和识别出的编码（encoding）
+            
+        Returns:
+            抓取结果，status为 ok / not_modified / error；url为请求地址，final_url为跳转后的地址；
+            body_hash为响应原始字节的哈希，用于判断页面内容是否与上次抓取相同
+        """
+        crawler_config = Config.CRAWLER_CONFIG
+        page = {
+            'url': url,
+            'final_url': url,
+            'status': 'error',
+            'status_code': None,
+            'html': None,
+            'content': None,
+            'encoding': None,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_length': None,
+            'body_hash': None,
+            'truncated': False,
+            'error': None
+        }
+        
+        headers = {'User-Agent': random.choice(crawler_config['USER_AGENTS'])}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        # 附件等非HTML链接不发起请求
+        if looks_binary_url(url):
+            page['error'] = '非HTML资源'
+            return page
+        
+        try:
+            # 按主机等待礼貌抓取间隔
+            politeness_scheduler.acquire(urlparse(url).netloc.lower())
+            
+            response = http_pool.get(
+                url,
+                headers=headers,
+                timeout=crawler_config['REQUEST_TIMEOUT'],
+                stream=True
+            )
+            page['status_code'] = response.status_code
+            
+            # 页面未变化，沿用上次的校验信息
+            if response.status_code == 304:
+                response.close()
+                page['status'] = 'not_modified'
+                page['etag'] = response.headers.get('ETag') or etag
+                page['last_modified'] = response.headers.get('Last-Modified') or last_modified
+                return page
+            
+            if response.status_code >= 400 or not is_html_response(response):
+                response.close()
+                response.raise_for_status()
+                page['error'] = f"非HTML内容: {response.headers.get('Content-Type')}"
+                return page
+            
+            # 按字节上限流式读取，读取到HTML结束标签后提前停止
+            body, truncated = read_body(response)
+            # 编码在抓取线程中确定（按主机缓存），页面只在需要时解码一次
+            encoding = html_decoder.resolve(
+                body, response.headers.get('Content-Type'), urlparse(response.url).netloc.lower()
+            )
+            
+            page.update({
+                'final_url': response.url,
+                'status': 'ok',
+                'html': decode(body, encoding) if decode else None,
+                'content': body,
+                'encoding': encoding,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_length': len(body),
+                'body_hash': hashlib.sha256(body).hexdigest(),
+                'truncated': truncated
+            })
+            
+        except requests.RequestException as e:
+            page['error'] = str(e)
+            self.logger.error(f"招投标页面抓取失败 {url}: {str(e)}")
+        
+        return page
+    
+    def extract_tender_info(self, html_content: str, url: str,
+                            soup: Optional[BeautifulSoup] = None) -> List[Dict[str, Any]]:
         """
         从HTML内容中提取招投标信息
         
         Args:
             html_content: HTML内容
             url: 来源URL
+            soup: 已解析的DOM，传入时不再重复解析（提取过程会移除其中的脚本和样式）
             
         Returns:
             提取的招投标信息列表
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = parse_html(html_content)
         
         # 移除脚本和样式元素
         for script in soup(["script", "style"]):
             script.decompose()
         
-        tenders = []
-        
-        # 方法1: 查找列表形式的招投标信息
-        list_tenders = self._extract_from_lists(soup, url)
-        tenders.extend(list_tenders)
-        
-        # 方法2: 查找表格形式的招投标信息
-        table_tenders = self._extract_from_tables(soup, url)
-        tenders.extend(table_tenders)
-        
-        # 方法3: 查找页面正文中的招投标信息
-        content_tenders = self._extract_from_content(soup, url)
-        tenders.extend(content_tenders)
+        # 单次遍历DOM，同时识别列表项、表格行和正文段落
+        buckets = self._walk_dom(soup, url)
+        tenders = buckets['list'] + buckets['table'] + buckets['content']
         
         # 去重和过滤
         unique_tenders = self._filter_and_deduplicate(tenders)
@@ -198,92 +475,304 @@ class TenderExtractor:
         self.logger.info(f"从 {url} 提取到 {len(unique_tenders)} 条招投标信息")
         return unique_tenders
     
-    def _extract_from_lists(self, soup: BeautifulSoup, url: str) -> List[Dict[str, Any]]:
-        """从列表中提取招投标信息"""
-        tenders = []
-        
-        # 查找可能的招投标列表
-        list_containers = soup.find_all(['ul', 'ol', 'div'], class_=re.compile(r'list|item|news|tender|bid'))
+    def extract_with_template(self, html_content: str, url: str, template: Optional[Dict[str, Any]] = None,
+                              soup: Optional[BeautifulSoup] = None, cutoff: Optional[IncrementalCutoff] = None
+                              ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]], bool]:
+        """
+        按选择器模板提取招投标信息，模板不再匹配时回退到完整的启发式提取并重新学习模板
         
-        for container in list_containers:
-            items = container.find_all(['li', 'div', 'a'])
+        Args:
+            html_content: HTML内容
+            url: 来源URL
+            template: 该医院已保存的模板（kind / selector）
+            soup: 已解析的DOM
+            cutoff: 增量截断状态；传入时列表、表格条目遇到连续的已知条目即停止解析，已知条目不输出
             
-            for item in items:
-                text = item.get_text(strip=True)
-                
-                # 检查是否包含招投标关键词
-                if any(keyword in text for keyword in self.tender_keywords):
-                    tender_info = self._parse_tender_text(text, url)
-                    if tender_info:
-                        tender_info['source_section'] = 'list'
-                        tenders.append(tender_info)
-        
-        return tenders
+        Returns:
+            (招投标信息列表, 模板, 是否命中已有模板)；回退时返回重新学习的模板（可能为None）
+        """
+        if soup is None:
+            soup = parse_html(html_content)
+        
+        for script in soup(["script", "style"]):
+            script.decompose()
+        
+        if template:
+            tenders = self._extract_rows(select_rows(soup, template), template['kind'], url, cutoff)
+            # 只遇到已知条目时模板同样视为命中
+            if tenders or (cutoff and cutoff.seen):
+                self.logger.info(f"按模板从 {url} 提取到 {len(tenders)} 条招投标信息")
+                return tenders, template, True
+            self.logger.info(f"模板不再匹配，回退到启发式提取: {url}")
+        
+        origins: List[Tuple[str, Tag]] = []
+        buckets = self._walk_dom(soup, url, origins, cutoff)
+        tenders = self._filter_and_deduplicate(buckets['list'] + buckets['table'] + buckets['content'])
+        
+        self.logger.info(f"从 {url} 提取到 {len(tenders)} 条招投标信息")
+        return tenders, learn_template(origins), False
     
-    def _extract_from_tables(self, soup: BeautifulSoup, url: str) -> List[Dict[str, Any]]:
-        """从表格中提取招投标信息"""
+    def _extract_rows(self, rows: List[Tag], kind: str, url: str,
+                      cutoff: Optional[IncrementalCutoff] = None) -> List[Dict[str, Any]]:
+        """从模板选出的行中提取招投标信息（规则与启发式提取中的列表项、表格行一致）"""
         tenders = []
+        seen = set()
+        parsed: Dict[str, Optional[Dict[str, Any]]] = {}
+        
+        def emit(section: str, tender_info: Dict[str, Any], element: Tag = None) -> bool:
+            if tender_info['content_hash'] in seen:
+                return False
+            seen.add(tender_info['content_hash'])
+            if cutoff is not None and cutoff.check(tender_info['content_hash']):
+                return False
+            tender_info['source_section'] = section
+            tenders.append(tender_info)
+            return True
+        
+        for row in rows:
+            if cutoff is not None and cutoff.stopped:
+                break
+            if kind == 'table':
+                self._handle_table_row(row, url, parsed, seen, emit)
+                continue
+            
+            text = row.get_text(strip=True)
+            if self.tender_matcher.contains_any(text):
+                tender_info = self._parse_tender_text_cached(text, url, parsed)
+                if tender_info:
+                    tender_info['detail_url'] = self._detail_url(row, url)
+                    emit('list', tender_info)
+        
+        return self._filter_and_deduplicate(tenders)
+    
+    def _walk_dom(self, soup: BeautifulSoup, url: str,
+                  origins: Optional[List[Tuple[str, Tag]]] = None,
+                  cutoff: Optional[IncrementalCutoff] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        单次先序遍历DOM，按元素类型分派到列表、表格、正文三类提取
         
-        tables = soup.find_all('table')
+        - 列表：class匹配list|item|news|tender|bid的ul/ol/div容器内的li/div/a
+        - 表格：table内的tr（至少两个单元格，第一列为标题）
+        - 正文：class匹配content|article|news|item的div/p/span
         
-        for table in tables:
-            rows = table.find_all('tr')
+        嵌套容器中的同一元素只处理一次，同一类中内容哈希重复的结果在遍历时直接丢弃；
+        三类结果的先后顺序与分别提取时一致。列表项内层的链接沿用所在列表项的增量截断判断，
+        每个列表项只计数一次。
+        
+        Args:
+            origins: 传入时记录产生列表、表格结果的 (类型, 行元素)，用于学习选择器模板
+            cutoff: 增量截断状态；列表、表格条目连续遇到已知条目时停止遍历
+        
+        Returns:
+            list / table / content 三类招投标信息
+        """
+        buckets = {'list': [], 'table': [], 'content': []}
+        seen = {'list': set(), 'table': set(), 'content': set()}
+        parsed: Dict[str, Optional[Dict[str, Any]]] = {}
+        # 已计入增量截断的行元素 -> 是否为已知条目
+        counted: Dict[int, bool] = {}
+        
+        def emit(section: str, tender_info: Dict[str, Any], element: Tag = None) -> bool:
+            if tender_info['content_hash'] in seen[section]:
+                return False
+            seen[section].add(tender_info['content_hash'])
+            if origins is not None and element is not None:
+                origins.append((section, element))
+            if cutoff is not None and section != 'content':
+                row = None
+                if element is not None:
+                    row = next((id(parent) for parent in element.parents if id(parent) in counted), None)
+                known = counted[row] if row is not None else cutoff.check(tender_info['content_hash'])
+                if element is not None:
+                    counted[id(element)] = known
+                if known:
+                    return False
+            tender_info['source_section'] = section
+            buckets[section].append(tender_info)
+            return True
+        
+        stack = [(soup, False, False)]
+        while stack:
+            if cutoff is not None and cutoff.stopped:
+                break
+            element, in_list, in_table = stack.pop()
+            name = element.name
             
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    # 提取第一列的标题和可能的链接
-                    first_cell = cells[0]
-                    title_text = first_cell.get_text(strip=True)
-                    
-                    # 检查是否包含招投标关键词
-                    if any(keyword in title_text for keyword in self.tender_keywords):
-                        tender_info = self._parse_tender_text(title_text, url)
+            if element is not soup:
+                if in_list and name in ('li', 'div', 'a'):
+                    text = element.get_text(strip=True)
+                    if self.tender_matcher.contains_any(text):
+                        tender_info = self._parse_tender_text_cached(text, url, parsed)
                         if tender_info:
-                            tender_info['source_section'] = 'table'
-                            
-                            # 尝试提取其他字段
-                            for i, cell in enumerate(cells[1:], 1):
-                                cell_text = cell.get_text(strip=True)
-                                
-                                # 提取日期
-                                if re.search(r'\d{4}[-年]\d{1,2}[-月]\d{1,2}', cell_text):
-                                    tender_info['publish_date'] = self._extract_date(cell_text)
-                                
-                                # 提取预算
-                                if re.search(r'\d+(?:\.\d+)?\s*万元', cell_text):
-                                    budget_match = re.search(r'(\d+(?:\.\d+)?)\s*万元', cell_text)
-                                    if budget_match:
-                                        tender_info['budget_amount'] = float(budget_match.group(1))
-                                        tender_info['budget_currency'] = 'CNY'
-                            
-                            tenders.append(tender_info)
-        
-        return tenders
+                            tender_info['detail_url'] = self._detail_url(element, url)
+                            emit('list', tender_info, element)
+                
+                if in_table and name == 'tr':
+                    self._handle_table_row(element, url, parsed, seen['table'], emit)
+                
+                if name in ('div', 'p', 'span') and self._class_matches(element, self.content_class_pattern):
+                    text = element.get_text(strip=True)
+                    if self.tender_matcher.contains_any(text):
+                        # 尝试提取多个招投标信息
+                        for sentence in self.sentence_split_pattern.split(text):
+                            if self.tender_matcher.contains_any(sentence):
+                                tender_info = self._parse_tender_text_cached(sentence, url, parsed)
+                                if tender_info:
+                                    emit('content', tender_info)
+            
+            child_in_list = in_list or (
+                name in ('ul', 'ol', 'div') and self._class_matches(element, self.list_class_pattern)
+            )
+            child_in_table = in_table or name == 'table'
+            children = [child for child in element.contents if isinstance(child, Tag)]
+            for child in reversed(children):
+                stack.append((child, child_in_list, child_in_table))
+        
+        return buckets
     
-    def _extract_from_content(self, soup: BeautifulSoup, url: str) -> List[Dict[str, Any]]:
-        """从页面正文中提取招投标信息"""
-        tenders = []
+    def _handle_table_row(self, row: Tag, url: str, parsed: Dict[str, Optional[Dict[str, Any]]],
+                          seen: set, emit) -> None:
+        """从表格行中提取招投标信息"""
+        cells = row.find_all(['td', 'th'])
+        if len(cells) < 2:
+            return
+        
+        # 提取第一列的标题和可能的链接
+        title_text = cells[0].get_text(strip=True)
+        
+        # 检查是否包含招投标关键词
+        if not self.tender_matcher.contains_any(title_text):
+            return
+        
+        tender_info = self._parse_tender_text_cached(title_text, url, parsed)
+        if not tender_info or tender_info['content_hash'] in seen:
+            return
+        tender_info['detail_url'] = self._detail_url(row, url)
+        
+        # 尝试提取其他字段
+        for cell in cells[1:]:
+            cell_text = cell.get_text(strip=True)
+            
+            # 提取日期
+            if self.cell_date_pattern.search(cell_text):
+                tender_info['publish_date'] = self._extract_date(cell_text)
+            
+            # 提取预算
+            budget_match = self.cell_budget_pattern.search(cell_text)
+            if budget_match:
+                tender_info['budget_amount'] = float(budget_match.group(1))
+                tender_info['budget_currency'] = 'CNY'
         
-        # 查找可能包含招投标信息的段落
-        content_divs = soup.find_all(['div', 'p', 'span'], class_=re.compile(r'content|article|news|item'))
+        emit('table', tender_info, row)
+    
+    def _detail_url(self, element: Tag, url: str) -> Optional[str]:
+        """列表行中第一个有效链接的完整地址（招投标详情页）"""
+        link = element if element.name == 'a' and element.get('href') else element.find('a', href=True)
+        if link is None:
+            return None
+        href = link.get('href', '').strip()
+        if not href or href.startswith(('#', 'javascript:', 'mailto:')):
+            return None
+        return (canonicalize(href, url) or urljoin(url, href))[:500]
+    
+    def extract_detail_fields(self, html_content: str, url: str,
+                              soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
+        """
+        从招投标详情页中提取字段
         
-        for div in content_divs:
-            text = div.get_text(strip=True)
-            
-            # 检查是否包含招投标关键词
-            if any(keyword in text for keyword in self.tender_keywords):
-                # 尝试提取多个招投标信息
-                sentences = re.split(r'[。！？\n]', text)
-                
-                for sentence in sentences:
-                    if any(keyword in sentence for keyword in self.tender_keywords):
-                        tender_info = self._parse_tender_text(sentence, url)
-                        if tender_info:
-                            tender_info['source_section'] = 'content'
-                            tenders.append(tender_info)
+        取正文区域（class匹配content|article的最长元素，找不到时为整个body）的完整文本，
+        重新执行字段提取；只返回提取到的字段。
+        
+        Returns:
+            title（页面标题）/ content / publish_date / deadline_date / budget_amount / budget_currency
+            中提取到的字段
+        """
+        if soup is None:
+            soup = parse_html(html_content)
         
-        return tenders
+        for script in soup(["script", "style"]):
+            script.decompose()
+        
+        # 页面标题：优先取正文大标题，其次取<title>
+        headline = soup.find('h1') or soup.find('title')
+        title = headline.get_text(strip=True)[:500] if headline else ''
+        
+        main = None
+        main_length = 0
+        for element in soup.find_all(['div', 'article', 'section', 'td']):
+            if not self._class_matches(element, self.content_class_pattern):
+                continue
+            length = len(element.get_text(strip=True))
+            if length > main_length:
+                main, main_length = element, length
+        if main is None:
+            main = soup.body or soup
+        
+        text = main.get_text('\n', strip=True)
+        if not text:
+            return {'title': title} if title else {}
+        
+        limit = Config.CRAWLER_CONFIG.get('DETAIL_CONTENT_LIMIT', 20000)
+        fields = {'content': text[:limit]}
+        if title:
+            fields['title'] = title
+        for key, value in self._extract_fields(text).items():
+            if key != 'title' and value is not None:
+                fields[key] = value
+        return fields
+    
+    def build_feed_tender(self, title: str, url: str, published: Optional[datetime] = None,
+                          fields: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        由站点地图/订阅源条目构建招投标信息
+        
+        Args:
+            title: 条目标题（订阅源条目）或详情页标题（站点地图条目）
+            url: 详情页地址
+            published: 条目的更新时间
+            fields: 已抓取的详情页字段（见 extract_detail_fields）
+        """
+        title = (title or '').strip()
+        if not title:
+            return None
+        
+        content = (fields or {}).get('content')
+        tender_info = self._parse_tender_text(f'{title}\n{content}' if content else title, url)
+        if tender_info is None:
+            return None
+        
+        for key in ('content', 'publish_date', 'deadline_date', 'budget_amount', 'budget_currency'):
+            if (fields or {}).get(key) is not None:
+                tender_info[key] = fields[key]
+        if not tender_info['publish_date'] and published:
+            tender_info['publish_date'] = published.strftime('%Y-%m-%d')
+        
+        tender_info.update({
+            'title': title[:500],
+            'detail_url': url[:500],
+            'source_section': self._identify_section_type(title, url),
+            'crawl_method': 'feed',
+            # 同一条目在多次读取之间标题和地址不变，据此去重
+            'content_hash': hashlib.sha256(f'{title}|{url}'.encode()).hexdigest(),
+        })
+        return tender_info
+    
+    def _class_matches(self, element: Tag, pattern) -> bool:
+        """元素的任一class是否匹配给定模式"""
+        classes = element.get('class')
+        if not classes:
+            return False
+        if isinstance(classes, str):
+            classes = classes.split()
+        return any(pattern.search(value) for value in classes)
+    
+    def _parse_tender_text_cached(self, text: str, url: str,
+                                  parsed: Dict[str, Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """解析招投标文本，同一文本只解析一次（返回副本，调用方可修改）"""
+        if text not in parsed:
+            parsed[text] = self._parse_tender_text(text, url)
+        tender_info = parsed[text]
+        return dict(tender_info) if tender_info else None
     
     def _parse_tender_text(self, text: str, url: str) -> Optional[Dict[str, Any]]:
         """
@@ -311,43 +800,12 @@ class TenderExtractor:
             'crawl_method': 'auto'
         }
         
-        # 提取标题
-        for pattern in self.content_patterns['title']:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                tender_info['title'] = match.group(1).strip()
-                break
+        tender_info.update(self._extract_fields(text))
         
         # 如果没有提取到标题，使用前50个字符作为标题
         if not tender_info['title']:
             tender_info['title'] = text[:50].strip()
         
-        # 提取发布日期
-        for pattern in self.content_patterns['date']:
-            match = re.search(pattern, text)
-            if match:
-                tender_info['publish_date'] = self._extract_date(match.group(1))
-                break
-        
-        # 提取截止日期
-        for pattern in self.content_patterns['deadline']:
-            match = re.search(pattern, text)
-            if match:
-                tender_info['deadline_date'] = self._extract_date(match.group(1))
-                break
-        
-        # 提取预算信息
-        for pattern in self.content_patterns['budget']:
-            match = re.search(pattern, text)
-            if match:
-                try:
-                    amount = float(match.group(1))
-                    tender_info['budget_amount'] = amount
-                    tender_info['budget_currency'] = 'CNY'
-                    break
-                except ValueError:
-                    continue
-        
         # 确定招标类型
         tender_info['tender_type'] = self._determine_tender_type(text)
         
@@ -360,27 +818,54 @@ class TenderExtractor:
         
         return tender_info if tender_info['title'] else None
     
+    def _extract_fields(self, text: str) -> Dict[str, Any]:
+        """
+        提取标题、发布日期、截止日期和预算字段
+        
+        每个字段的候选模式按content_patterns中的顺序确定优先级。
+        """
+        fields = {
+            'title': '',
+            'publish_date': None,
+            'deadline_date': None,
+        }
+        
+        # 提取标题
+        match = self.field_patterns['title'].search(text)
+        if match:
+            fields['title'] = match.group(1).strip()
+        
+        # 提取发布日期
+        match = self.field_patterns['date'].search(text)
+        if match:
+            fields['publish_date'] = self._extract_date(match.group(1))
+        
+        # 提取截止日期
+        match = self.field_patterns['deadline'].search(text)
+        if match:
+            fields['deadline_date'] = self._extract_date(match.group(1))
+        
+        # 提取预算信息
+        match = self.field_patterns['budget'].search(text)
+        if match:
+            fields['budget_amount'] = float(match.group(1))
+            fields['budget_currency'] = 'CNY'
+        
+        return fields
+    
     def _extract_date(self, date_str: str) -> Optional[str]:
         """提取并标准化日期"""
         try:
-            # 匹配各种日期格式
-            date_patterns = [
-                r'(\d{4})[-年](\d{1,2})[-月](\d{1,2})[日]?',
-                r'(\d{4})/(\d{1,2})/(\d{1,2})',
-                r'(\d{1,2})[-/\.](\d{1,2})[-/\.](\d{4})',
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, date_str)
-                if match:
-                    if len(match.groups()) == 3:
-                        year, month, day = match.groups()
-                        if len(year) == 4:  # YYYY-MM-DD 格式
-                            date_obj = datetime(int(year), int(month), int(day))
-                        else:  # MM-DD-YYYY 格式
-                            date_obj = datetime(int(year), int(month), int(day))
-                        
-                        return date_obj.strftime('%Y-%m-%d')
+            # 匹配各种日期格式（按date_formats中的顺序取第一个命中的格式）
+            match = self.date_formats.search(date_str)
+            if match:
+                year, month, day = match.groups()
+                if len(year) == 4:  # YYYY-MM-DD 格式
+                    date_obj = datetime(int(year), int(month), int(day))
+                else:  # MM-DD-YYYY 格式
+                    date_obj = datetime(int(year), int(month), int(day))
+                
+                return date_obj.strftime('%Y-%m-%d')
             
             return None
             
@@ -388,24 +873,12 @@ class TenderExtractor:
             return None
     
     def _determine_tender_type(self, text: str) -> str:
-        """确定招投标类型"""
-        text_lower = text.lower()
-        
-        for tender_type, keywords in self.type_keywords.items():
-            if any(keyword in text or keyword in text_lower for keyword in keywords):
-                return tender_type
-        
-        return 'other'
+        """确定招投标类型（按type_keywords的顺序取第一个命中的类型）"""
+        return self.type_matcher.first_group(text, 'other')
     
     def _determine_tender_category(self, text: str) -> str:
-        """确定招投标分类"""
-        text_lower = text.lower()
-        
-        for category, keywords in self.category_keywords.items():
-            if any(keyword in text or keyword in text_lower for keyword in keywords):
-                return category
-        
-        return 'other'
+        """确定招投标分类（按category_keywords的顺序取第一个命中的分类）"""
+        return self.category_matcher.first_group(text, 'other')
     
     def _identify_section_type(self, title: str, url: str) -> str:
         """识别栏目类型"""
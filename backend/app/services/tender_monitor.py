@@ -0,0 +1,1069 @@
+"""
+招投标监控服务
+
+定时扫描医院官网的招投标栏目并入库，包括：
+- 医院首页抓取与招投标栏目识别（识别结果按医院保存，定时监控直接抓取已知栏目，
+  按较慢的周期或连续未命中后重新识别）
+- 站点地图/订阅源发现与读取：有可用信息源时按lastmod只处理有更新的招投标条目，不再抓取列表页
+- 抓取边界：单次扫描内同一URL（规范化后）只抓取一次，已处理的详情页URL跨扫描持久化
+- 按医院的发布频率和列表变化频率安排下次扫描时间，定时任务只扫描已到期的医院
+- 栏目列表页条件请求（ETag / Last-Modified）增量抓取
+- 按URL记录上次抓取的内容哈希，页面内容未变化时跳过解析、提取和去重
+- 栏目列表页增量解析：记住每个栏目上次的列表头部条目，遇到已知条目即停止
+- 栏目分页跟随（定时扫描少量分页，首次补抓跟随全部分页并逐页入库）
+- 新招投标入库后将详情页交给后台抓取补全字段（扫描不等待）
+- 页面解析和招投标信息提取交给解析进程池，抓取线程只负责网络请求
+- 抓取到的页面压缩归档，提取规则改进后可离线重放归档页面重新提取
+- 按医院保存招投标列表的选择器模板，模板失效时回退到启发式提取
+- 招投标信息去重和入库
+- 扫描历史记录与统计
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from flask import current_app
+
+from config import Config
+from app import db
+from app.models import (
+    CrawledUrl, Hospital, PageFetchState, ScanHistory, SelectorTemplate, TenderColumn, TenderRecord
+)
+from app.services.crawl_frontier import CrawlFrontier, FrontierScope
+from app.services.detail_fetcher import detail_fetcher
+from app.services.feed_reader import FEED_SOURCES, feed_reader
+from app.services.fetch_engine import host_of, run_batch
+from app.services.page_archive import page_archive
+from app.services.parse_pool import column_from_tuple, parse_pool, tender_from_tuple
+from app.services.scan_planner import scan_planner
+from app.services.tender_extractor import tender_extractor
+from app.services.url_canonical import canonicalize, url_fingerprint
+
+
+class TenderMonitorService:
+    """招投标监控服务"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.max_columns = Config.SCHEDULER_CONFIG.get('MAX_TENDER_COLUMNS', 10)
+        self.rediscovery_interval = timedelta(hours=Config.SCHEDULER_CONFIG.get('COLUMN_REDISCOVERY_HOURS', 72))
+        self.max_column_misses = Config.SCHEDULER_CONFIG.get('COLUMN_MAX_MISSES', 3)
+        self.incremental = Config.CRAWLER_CONFIG.get('INCREMENTAL_MODE', True)
+        self.scan_pages = Config.CRAWLER_CONFIG.get('PAGINATION_MAX_PAGES', 5)
+        self.backfill_pages = Config.CRAWLER_CONFIG.get('BACKFILL_MAX_PAGES', 500)
+        self.feed_entries = Config.CRAWLER_CONFIG.get('FEED_MAX_ENTRIES', 20)
+
+    def run_due_scan(self, limit: int = None) -> Dict[str, Any]:
+        """
+        扫描下次扫描时间已到的医院（需要在应用上下文中调用）
+
+        没有到期医院时不创建扫描记录。
+
+        Args:
+            limit: 本次最多扫描的医院数，默认读取配置
+        """
+        hospitals = scan_planner.due_hospitals(datetime.utcnow(), limit)
+        if not hospitals:
+            return {'hospitals_scanned': 0, 'new_tenders': 0}
+        return self.run_scan(hospitals)
+
+    def run_scan(self, hospitals: List[Hospital] = None) -> Dict[str, Any]:
+        """
+        执行一次招投标扫描（需要在应用上下文中调用）
+
+        Args:
+            hospitals: 待扫描的医院列表，默认为所有已设置官网的在营医院
+
+        Returns:
+            扫描结果统计
+        """
+        if hospitals is None:
+            hospitals = Hospital.query.filter(
+                Hospital.website_url.isnot(None),
+                Hospital.website_url != '',
+                Hospital.status == 'active'
+            ).all()
+
+        started = time.time()
+        scan = ScanHistory(
+            task_id=f"tender_{uuid.uuid4().hex[:16]}",
+            task_name='招投标监控',
+            scan_type='tender_monitor',
+            target_type='region',
+            target_description=f'{len(hospitals)} 家医院',
+            start_time=datetime.utcnow(),
+            status='running',
+            total_count=len(hospitals)
+        )
+        db.session.add(scan)
+        db.session.commit()
+
+        stats = {
+            'hospitals_scanned': 0,
+            'failed_hospitals': 0,
+            'tenders_found': 0,
+            'new_tenders': 0,
+            'pages_fetched': 0,
+            'fetches_saved': 0,
+            'hash_checks': 0,
+            'pages_unchanged': 0,
+            'template_hits': 0,
+            'template_misses': 0,
+            'homepages_skipped': 0,
+            'incremental_stops': 0,
+            'pagination_pages': 0,
+            'feed_entries': 0,
+        }
+
+        frontier = self._build_frontier(hospitals)
+        jobs = self._build_jobs(hospitals, frontier)
+
+        applied = set()
+
+        # 在调用线程中逐个保存结果（数据库提交期间抓取任务照常调度）
+        def on_result(index, job, result):
+            if self._apply_result(job, result, stats):
+                applied.add(job['hospital_id'])
+
+        try:
+            run_batch(jobs, self._crawl_hospital, key_func=lambda job: job['host'], on_result=on_result)
+            # 抓取线程异常、未返回结果的医院也计入失败数
+            stats['failed_hospitals'] += len(jobs) - stats['hospitals_scanned']
+        except Exception as e:
+            scan.error_message = str(e)
+            self.logger.error(f'招投标扫描失败: {str(e)}')
+
+        scan_planner.defer([job['hospital_id'] for job in jobs if job['hospital_id'] not in applied],
+                           datetime.utcnow())
+
+        duration = int(time.time() - started)
+        scan.end_time = datetime.utcnow()
+        scan.duration_seconds = duration
+        scan.success_count = len(jobs) - stats['failed_hospitals']
+        scan.failed_count = stats['failed_hospitals']
+        scan.tenders_found = stats['tenders_found']
+        scan.records_found = stats['tenders_found']
+        scan.new_records = stats['new_tenders']
+        scan.pages_fetched = stats['pages_fetched']
+        scan.fetches_saved = stats['fetches_saved']
+        scan.pages_unchanged = stats['pages_unchanged']
+        if scan.error_message:
+            scan.status = 'failed'
+        elif stats['failed_hospitals']:
+            scan.status = 'partial'
+        else:
+            scan.status = 'success'
+        db.session.commit()
+
+        # 哈希命中率：下载的页面中内容与上次相同的比例；跳过率：请求的页面中无需解析的比例（304或哈希命中）
+        stats['hash_hit_rate'] = round(stats['pages_unchanged'] / stats['hash_checks'], 3) \
+            if stats['hash_checks'] else 0.0
+        stats['skip_rate'] = round((stats['fetches_saved'] + stats['pages_unchanged']) / stats['pages_fetched'], 3) \
+            if stats['pages_fetched'] else 0.0
+
+        stats['frontier_duplicates'] = frontier.stats['duplicates']
+        stats['known_urls_skipped'] = frontier.stats['known_skips']
+
+        stats['task_id'] = scan.task_id
+        stats['execution_time'] = time.strftime('%H:%M:%S', time.gmtime(duration))
+        self.logger.info(
+            f"招投标扫描完成: 医院 {stats['hospitals_scanned']}, 新增 {stats['new_tenders']}, "
+            f"请求页面 {stats['pages_fetched']}, 304节省 {stats['fetches_saved']}, "
+            f"内容未变化 {stats['pages_unchanged']} (命中率 {stats['hash_hit_rate']:.1%}, "
+            f"跳过率 {stats['skip_rate']:.1%}), "
+            f"模板命中 {stats['template_hits']}, 模板失效 {stats['template_misses']}, "
+            f"跳过首页识别 {stats['homepages_skipped']}, 增量截断 {stats['incremental_stops']}, "
+            f"分页 {stats['pagination_pages']}, 订阅源条目 {stats['feed_entries']}, "
+            f"重复URL {stats['frontier_duplicates']}, 已处理URL {stats['known_urls_skipped']}"
+        )
+        return stats
+
+    def start_backfill(self, app, hospital_id: int, max_pages: int = None) -> str:
+        """
+        在后台线程中补抓医院招投标栏目的全部分页
+
+        Returns:
+            任务ID（扫描历史的task_id）
+        """
+        task_id = f"backfill_{uuid.uuid4().hex[:16]}"
+
+        def run():
+            with app.app_context():
+                hospital = Hospital.query.get(hospital_id)
+                if hospital is None:
+                    return
+                try:
+                    self.backfill_hospital(hospital, max_pages=max_pages, task_id=task_id)
+                except Exception as e:
+                    db.session.rollback()
+                    self.logger.error(f'招投标补抓失败 {hospital_id}: {str(e)}')
+
+        threading.Thread(target=run, name=task_id, daemon=True).start()
+        return task_id
+
+    def backfill_hospital(self, hospital: Hospital, max_pages: int = None, task_id: str = None) -> Dict[str, Any]:
+        """
+        补抓单家医院招投标栏目的全部分页（需要在应用上下文中调用）
+
+        每个栏目从第1页开始跟随分页直到页数上限，不做条件请求和增量截断；
+        每页解析完成后立即入库并提交，内存占用与总页数无关。
+
+        Args:
+            hospital: 医院
+            max_pages: 每个栏目最多抓取的页数，默认读取配置
+            task_id: 扫描历史的任务ID
+
+        Returns:
+            补抓结果统计
+        """
+        max_pages = max_pages or self.backfill_pages
+        started = time.time()
+        scan = ScanHistory(
+            task_id=task_id or f"backfill_{uuid.uuid4().hex[:16]}",
+            task_name='招投标历史补抓',
+            scan_type='tender_monitor',
+            target_type='hospital',
+            target_id=hospital.id,
+            target_description=hospital.name,
+            start_time=datetime.utcnow(),
+            status='running',
+            total_count=0
+        )
+        db.session.add(scan)
+        db.session.commit()
+
+        stats = {'columns': 0, 'pages_fetched': 0, 'tenders_found': 0, 'new_tenders': 0, 'failed_columns': 0}
+        job = self._build_jobs([hospital], self._build_frontier([hospital]))[0]
+        now = datetime.utcnow()
+
+        try:
+            columns = job['columns']
+            if job['discover'] or not columns:
+                result = {'pages': [], 'tenders': [], 'error': None, 'discovered_columns': None,
+                          'column_outcomes': {}, 'column_signatures': {}, 'feed_updates': {},
+                          'hash_checks': 0, 'pages_unchanged': 0}
+                discovered = self._discover_columns(job, result)
+                if discovered is not None:
+                    columns = discovered
+                    self._update_columns(hospital.id, result, now)
+                    db.session.commit()
+                elif not columns:
+                    raise RuntimeError(result['error'] or '首页无法访问')
+
+            # 补抓只跟随HTML列表页的分页，站点地图/订阅源由定时扫描按lastmod读取
+            columns = [column for column in columns if column.get('source') not in FEED_SOURCES]
+            scan.total_count = len(columns[:self.max_columns])
+            for column in columns[:self.max_columns]:
+                stats['columns'] += 1
+                page = tender_extractor.fetch_page_conditional(column['url'], decode=False)
+                content = page.pop('content', None)
+                if page['status'] != 'ok':
+                    stats['failed_columns'] += 1
+                    continue
+
+                archive = self._archive_meta(hospital.id, column)
+                parsed = parse_pool.parse(
+                    content, page['encoding'], page['final_url'],
+                    templated=True, template=job['template'], paginate=True, archive=archive
+                )
+                self._store_page(hospital, parsed, column, stats)
+
+                for _, extra in tender_extractor.follow_pagination(
+                    parsed.pagination, max_pages=max_pages, template=parsed.template or job['template'],
+                    archive=archive, frontier=job['frontier']
+                ):
+                    self._store_page(hospital, extra, column, stats)
+
+            scan.status = 'partial' if stats['failed_columns'] else 'success'
+
+        except Exception as e:
+            db.session.rollback()
+            scan.status = 'failed'
+            scan.error_message = str(e)
+            self.logger.error(f'招投标补抓失败 {hospital.name}: {str(e)}')
+
+        scan.end_time = datetime.utcnow()
+        scan.duration_seconds = int(time.time() - started)
+        scan.success_count = stats['columns'] - stats['failed_columns']
+        scan.failed_count = stats['failed_columns']
+        scan.pages_fetched = stats['pages_fetched']
+        scan.tenders_found = stats['tenders_found']
+        scan.records_found = stats['tenders_found']
+        scan.new_records = stats['new_tenders']
+        db.session.commit()
+
+        stats['task_id'] = scan.task_id
+        self.logger.info(
+            f"招投标补抓完成 {hospital.name}: 栏目 {stats['columns']}, 页面 {stats['pages_fetched']}, "
+            f"新增 {stats['new_tenders']}"
+        )
+        return stats
+
+    def replay_archive(self, since: datetime = None, until: datetime = None,
+                       hospital_ids: List[int] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        离线重放归档页面：按当前提取规则重新提取并入库（需要在应用上下文中调用，不访问网络）
+
+        列表页和首页在解析进程池中并行重新提取，新出现的招投标按内容哈希去重后入库；
+        随后重放详情页，补全对应招投标记录的字段。重放产生的新记录不会触发详情页抓取。
+
+        Args:
+            since / until: 页面抓取时间范围（UTC）
+            hospital_ids: 只重放这些医院的页面
+            dry_run: 只统计不入库
+
+        Returns:
+            重放结果统计
+        """
+        started = time.time()
+        batch_size = Config.CRAWLER_CONFIG.get('REPLAY_COMMIT_BATCH_SIZE', 100)
+        stats = {'pages': 0, 'detail_pages': 0, 'failed_pages': 0, 'tenders_found': 0,
+                 'new_tenders': 0, 'details_updated': 0}
+        hospitals: Dict[int, Optional[Hospital]] = {}
+        pending = 0
+
+        def finish_batch():
+            if dry_run:
+                db.session.rollback()
+            else:
+                db.session.commit()
+
+        page_archive.flush()
+        entries = list(page_archive.entries(since, until, hospital_ids, kinds=('homepage', 'list')))
+        for entry, parsed in self._replay_pages(entries, parse_pool.submit, stats):
+            hospital_id = entry.get('hospital_id')
+            if hospital_id not in hospitals:
+                hospitals[hospital_id] = Hospital.query.get(hospital_id) if hospital_id else None
+            hospital = hospitals[hospital_id]
+            if hospital is None:
+                continue
+
+            column = {'title': entry.get('title'), 'section': entry.get('section')} \
+                if entry.get('kind') == 'list' else None
+            tenders = self._build_tenders(parsed.html_hash, parsed.tenders, column)
+            new_count = self._store_tenders(hospital, tenders)
+            hospital.tender_count = (hospital.tender_count or 0) + new_count
+            stats['pages'] += 1
+            stats['tenders_found'] += len(tenders)
+            stats['new_tenders'] += new_count
+
+            pending += 1
+            if pending >= batch_size:
+                finish_batch()
+                pending = 0
+        finish_batch()
+
+        # 详情页不记录来源医院，按医院过滤时跳过
+        detail_entries = [] if hospital_ids else list(page_archive.entries(since, until, kinds=('detail',)))
+        pending = 0
+        for entry, fields in self._replay_pages(detail_entries, parse_pool.submit_detail, stats):
+            stats['detail_pages'] += 1
+            for record in TenderRecord.query.filter_by(detail_url=entry['url'][:500]):
+                detail_fetcher.apply_fields(record, fields)
+                stats['details_updated'] += 1
+
+            pending += 1
+            if pending >= batch_size:
+                finish_batch()
+                pending = 0
+        finish_batch()
+
+        stats['dry_run'] = dry_run
+        stats['execution_time'] = time.strftime('%H:%M:%S', time.gmtime(int(time.time() - started)))
+        self.logger.info(
+            f"归档重放完成: 列表页 {stats['pages']}, 详情页 {stats['detail_pages']}, "
+            f"失败 {stats['failed_pages']}, 新增 {stats['new_tenders']}, 详情更新 {stats['details_updated']}"
+        )
+        return stats
+
+    def _replay_pages(self, entries: List[Dict[str, Any]], submit, stats: Dict[str, Any]):
+        """
+        按归档文件顺序读取页面并提交解析，按提交顺序产出 (索引项, 解析结果)
+
+        同时在途的页面数为解析进程数的数倍，内存占用与归档大小无关。
+        """
+        window = max(4, parse_pool.max_workers * 4)
+        in_flight = deque()
+
+        def drain():
+            entry, future = in_flight.popleft()
+            try:
+                return entry, future.result()
+            except Exception as e:
+                stats['failed_pages'] += 1
+                self.logger.error(f"归档页面解析失败 {entry['url']}: {str(e)}")
+                return entry, None
+
+        for entry, content in page_archive.iter_pages(entries):
+            in_flight.append((entry, submit(content, entry.get('encoding'), entry['url'])))
+            if len(in_flight) >= window:
+                entry, parsed = drain()
+                if parsed is not None:
+                    yield entry, parsed
+
+        while in_flight:
+            entry, parsed = drain()
+            if parsed is not None:
+                yield entry, parsed
+
+    def _store_page(self, hospital: Hospital, parsed, column: Dict[str, Any], stats: Dict[str, Any]):
+        """保存单个列表页的招投标信息并提交"""
+        tenders = self._build_tenders(parsed.html_hash, parsed.tenders, column)
+        added: List[TenderRecord] = []
+        new_count = self._store_tenders(hospital, tenders, added)
+        hospital.tender_count = (hospital.tender_count or 0) + new_count
+        self._record_crawled(hospital.id, [record.detail_url for record in added])
+        db.session.commit()
+        self._enqueue_details(added)
+
+        stats['pages_fetched'] += 1
+        stats['tenders_found'] += len(tenders)
+        stats['new_tenders'] += new_count
+
+    def _build_frontier(self, hospitals: List[Hospital]) -> CrawlFrontier:
+        """构建本次扫描的抓取边界（预先加载各医院已处理的详情页URL指纹）"""
+        hospital_ids = [hospital.id for hospital in hospitals]
+        known = []
+        if hospital_ids:
+            known = [
+                (row.hospital_id, row.fingerprint) for row in
+                db.session.query(CrawledUrl.hospital_id, CrawledUrl.fingerprint).filter(
+                    CrawledUrl.hospital_id.in_(hospital_ids))
+            ]
+        return CrawlFrontier(known)
+
+    def _build_jobs(self, hospitals: List[Hospital], frontier: CrawlFrontier) -> List[Dict[str, Any]]:
+        """构建抓取任务（预先加载条件请求所需的校验信息、已知栏目和选择器模板，抓取线程不访问数据库）"""
+        hospital_ids = [hospital.id for hospital in hospitals]
+        validators: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        templates: Dict[int, Dict[str, Any]] = {}
+        columns: Dict[int, List[TenderColumn]] = {}
+        if hospital_ids:
+            known = TenderColumn.query.filter(
+                TenderColumn.hospital_id.in_(hospital_ids),
+                TenderColumn.active.is_(True)
+            ).order_by(TenderColumn.confidence.desc(), TenderColumn.id)
+            for column in known:
+                columns.setdefault(column.hospital_id, []).append(column)
+
+            for template in SelectorTemplate.query.filter(SelectorTemplate.hospital_id.in_(hospital_ids)):
+                templates[template.hospital_id] = template.to_template()
+
+            states = PageFetchState.query.filter(PageFetchState.hospital_id.in_(hospital_ids)).all()
+            for state in states:
+                validators.setdefault(state.hospital_id, {})[state.url] = {
+                    'etag': state.etag,
+                    'last_modified': state.last_modified,
+                    'body_hash': state.body_hash,
+                }
+
+        now = datetime.utcnow()
+        jobs = []
+        for hospital in hospitals:
+            url = hospital.website_url
+            if not url.startswith(('http://', 'https://')):
+                url = 'http://' + url
+            url = canonicalize(url) or url
+            known = columns.get(hospital.id, [])
+            jobs.append({
+                'hospital_id': hospital.id,
+                'url': url,
+                'host': host_of(url),
+                'validators': validators.get(hospital.id, {}),
+                'template': templates.get(hospital.id),
+                'columns': [column.to_column() for column in known],
+                'discover': self._needs_discovery(known, now),
+                # 去重范围限于本医院，其他医院共用的栏目页面仍各自抓取
+                'frontier': frontier.scope(hospital.id),
+            })
+        return jobs
+
+    def _needs_discovery(self, columns: List[TenderColumn], now: datetime) -> bool:
+        """是否需要重新抓取首页识别栏目：没有已知栏目、超过识别周期或有栏目连续未命中"""
+        if not columns:
+            return True
+
+        last_discovered = max((column.last_discovered_at for column in columns if column.last_discovered_at),
+                              default=None)
+        if last_discovered is None or now - last_discovered >= self.rediscovery_interval:
+            return True
+
+        return any((column.miss_count or 0) >= self.max_column_misses for column in columns)
+
+    def _crawl_hospital(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        抓取单家医院的首页和招投标栏目（在抓取线程中执行，不访问数据库）
+
+        已知栏目仍然有效时直接抓取栏目页，不再请求首页；需要重新识别时抓取首页识别栏目。
+        有可用的站点地图/订阅源时只读取其中有更新的招投标条目，不再抓取HTML列表页。
+        页面解析和招投标提取交给解析进程池，抓取线程只负责网络请求：
+        栏目页下载完成后立即提交解析，继续抓取下一个栏目，最后统一收集结果。
+        栏目页按医院的选择器模板提取，模板不匹配时回退到启发式提取并重新学习。
+        """
+        result = {
+            'pages': [],
+            'tenders': [],
+            'error': None,
+            'template': None,
+            'template_hits': 0,
+            'template_misses': 0,
+            'discovered_columns': None,
+            'column_outcomes': {},
+            'column_signatures': {},
+            'feed_updates': {},
+            'hash_checks': 0,
+            'pages_unchanged': 0,
+            'incremental_stops': 0,
+            'pagination_pages': 0,
+            'feed_entries': 0,
+            'crawled_urls': [],
+        }
+
+        if job['discover']:
+            columns = self._discover_columns(job, result)
+            if columns is None:
+                if not job['columns']:
+                    return result
+                # 首页暂时无法访问，本次仍抓取已知栏目
+                self.logger.warning(f"首页识别失败，沿用已知栏目 {job['url']}: {result['error']}")
+                result['error'] = None
+                columns = job['columns']
+        else:
+            columns = job['columns']
+
+        # 重新识别出的栏目沿用已保存的列表头部签名
+        known_signatures = {
+            column['url']: (column.get('signatures') or []) if self.incremental else None
+            for column in job['columns']
+        }
+
+        feeds = [column for column in columns if column.get('source') in FEED_SOURCES]
+        columns = [column for column in columns if column.get('source') not in FEED_SOURCES]
+        failed = self._crawl_feeds(job, feeds, result) if feeds else 0
+        if feeds and failed < len(feeds):
+            # 至少一个信息源可用，代替HTML列表页抓取
+            columns = []
+
+        pending = []
+        for column in columns[:self.max_columns]:
+            # 本医院的其他栏目在本次扫描中已抓取过同一页面
+            if not job['frontier'].admit(column['url']):
+                result['column_outcomes'][column['url']] = 'unchanged'
+                continue
+            validator = job['validators'].get(column['url'], {})
+            page = tender_extractor.fetch_page_conditional(
+                column['url'],
+                etag=validator.get('etag'),
+                last_modified=validator.get('last_modified'),
+                decode=False
+            )
+            # 提交解析后不再保留原始字节
+            content = page.pop('content', None)
+            result['pages'].append(page)
+
+            # 列表页未变化，跳过整个提取流程
+            if page['status'] == 'not_modified':
+                result['column_outcomes'][column['url']] = 'unchanged'
+                continue
+            if page['status'] != 'ok':
+                result['column_outcomes'][column['url']] = 'miss'
+                failed += 1
+                continue
+            # 内容与上次抓取相同（服务器不支持条件请求时常见），同样跳过整个提取流程
+            if self._page_unchanged(page, validator, result):
+                result['column_outcomes'][column['url']] = 'unchanged'
+                continue
+
+            future = parse_pool.submit(
+                content, page['encoding'], page['final_url'],
+                templated=True, template=job['template'],
+                known_signatures=known_signatures.get(column['url'], [] if self.incremental else None),
+                paginate=self.scan_pages > 1,
+                archive=self._archive_meta(job['hospital_id'], column)
+            )
+            pending.append((column, page, future))
+
+        for column, page, future in pending:
+            try:
+                parsed = future.result()
+            except Exception as e:
+                self.logger.error(f"栏目页解析失败 {page['final_url']}: {str(e)}")
+                # 不保存验证信息和内容哈希，下次扫描重新抓取解析
+                page['parse_failed'] = True
+                result['column_outcomes'][column['url']] = 'miss'
+                continue
+            result['tenders'].extend(self._build_tenders(parsed.html_hash, parsed.tenders, column))
+            # 只有已知条目（增量截断）同样说明栏目有效
+            result['column_outcomes'][column['url']] = 'hit' if parsed.tenders or parsed.signatures else 'miss'
+            if parsed.signatures:
+                result['column_signatures'][column['url']] = parsed.signatures
+            if parsed.stopped:
+                result['incremental_stops'] += 1
+            else:
+                # 第1页没有遇到已知条目，继续跟随少量分页
+                for _, extra in tender_extractor.follow_pagination(
+                    parsed.pagination,
+                    max_pages=self.scan_pages,
+                    template=parsed.template,
+                    known_signatures=known_signatures.get(column['url'], [] if self.incremental else None),
+                    archive=self._archive_meta(job['hospital_id'], column),
+                    frontier=job['frontier']
+                ):
+                    result['pagination_pages'] += 1
+                    result['tenders'].extend(self._build_tenders(extra.html_hash, extra.tenders, column))
+                    if extra.stopped:
+                        result['incremental_stops'] += 1
+
+            if parsed.template_hit:
+                result['template_hits'] += 1
+            else:
+                if job['template']:
+                    result['template_misses'] += 1
+                # 保留覆盖行数最多的新模板
+                template = parsed.template
+                if template and (result['template'] is None
+                                 or template['row_count'] > result['template']['row_count']):
+                    result['template'] = template
+
+        # 直接抓取已知栏目时，全部栏目（含信息源）都无法访问视为本次扫描失败
+        crawled = len(feeds) + len(columns[:self.max_columns])
+        if result['discovered_columns'] is None and crawled and failed == crawled:
+            result['error'] = '已知栏目均无法访问'
+
+        return result
+
+    def _discover_columns(self, job: Dict[str, Any], result: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """抓取首页识别招投标栏目（同时提取首页上的招投标信息），首页无法访问时返回None"""
+        homepage = tender_extractor.fetch_page_conditional(job['url'], decode=False)
+        result['pages'].append(homepage)
+        if homepage['status'] != 'ok':
+            result['error'] = homepage['error'] or '首页无法访问'
+            return None
+
+        # 首页内容未变化，栏目和首页上的招投标与上次识别结果相同，沿用已知栏目
+        if job['columns'] and self._page_unchanged(homepage, job['validators'].get(job['url'], {}), result):
+            homepage.pop('content', None)
+            result['discovered_columns'] = job['columns']
+            return job['columns']
+
+        # 首页需要先识别栏目，同步等待解析结果
+        try:
+            parsed = parse_pool.parse(
+                homepage.pop('content'), homepage['encoding'], homepage['final_url'], find_columns=True,
+                archive=self._archive_meta(job['hospital_id'], None)
+            )
+        except Exception as e:
+            homepage['parse_failed'] = True
+            result['error'] = f'首页解析失败: {str(e)}'
+            return None
+
+        result['tenders'].extend(self._build_tenders(parsed.html_hash, parsed.tenders, None))
+        # 置信度高的栏目优先抓取（超过栏目数上限时舍弃置信度低的）
+        columns = sorted((column_from_tuple(row) for row in parsed.columns),
+                         key=lambda column: -(column.get('confidence') or 0))
+        # 站点地图/订阅源与HTML栏目一起保存，有可用信息源时代替栏目页抓取
+        columns = feed_reader.discover(job['url']) + columns
+        result['discovered_columns'] = columns
+        return columns
+
+    def _crawl_feeds(self, job: Dict[str, Any], feeds: List[Dict[str, Any]], result: Dict[str, Any]) -> int:
+        """
+        读取站点地图/订阅源中上次读取之后有更新的招投标条目（在抓取线程中执行）
+
+        Returns:
+            无法读取的信息源数量
+        """
+        failed = 0
+        frontier = job['frontier']
+        for column in feeds:
+            if not frontier.admit(column['url']):
+                result['column_outcomes'][column['url']] = 'unchanged'
+                continue
+            validator = job['validators'].get(column['url'], {})
+            since = column.get('feed_updated_at')
+            # 刚发现的信息源直接使用发现时的读取结果
+            feed = column.pop('feed', None) or feed_reader.read(
+                column['url'],
+                etag=validator.get('etag'),
+                last_modified=validator.get('last_modified'),
+                since=since,
+                validators=job['validators']
+            )
+            page = feed['page']
+            result['pages'].append(page)
+            result['pages'].extend(feed['children'])
+            # 子站点地图的哈希比较统计（是否跳过已由读取器按同样的校验信息判断）
+            for child in feed['children']:
+                self._page_unchanged(child, job['validators'].get(child['url'], {}), result)
+
+            if feed['index']:
+                # 站点地图索引本身未变化时子站点地图仍可能有更新，只按子站点地图判断
+                if all(child.get('unchanged') for child in feed['children']):
+                    result['column_outcomes'][column['url']] = 'unchanged'
+                    continue
+            elif page['status'] == 'not_modified' or self._page_unchanged(page, validator, result):
+                result['column_outcomes'][column['url']] = 'unchanged'
+                continue
+            if page['status'] != 'ok' or feed['kind'] is None:
+                page['parse_failed'] = page['status'] == 'ok'
+                result['column_outcomes'][column['url']] = 'miss'
+                failed += 1
+                continue
+
+            result['column_outcomes'][column['url']] = 'hit'
+            # 已处理过的详情页（包括列表页入库的招投标和没有更新时间的条目）不再处理
+            entries = [entry for entry in feed_reader.tender_entries(feed['entries'], since)
+                       if not frontier.is_known(entry['url'])]
+            watermark = feed['latest']
+            if since is not None and len(entries) > self.feed_entries:
+                # 新条目超过单次上限时从旧到新处理，下次扫描从已处理的位置继续
+                entries = entries[::-1][:self.feed_entries]
+                watermark = max((entry['lastmod'] for entry in entries if entry['lastmod']), default=None)
+            else:
+                # 首次读取只处理最新的条目，历史条目由补抓负责
+                entries = entries[:self.feed_entries]
+            if watermark:
+                result['feed_updates'][column['url']] = watermark
+
+            for entry in entries:
+                tender = self._feed_tender(entry, column, frontier, result)
+                if tender:
+                    result['tenders'].append(tender)
+                    result['feed_entries'] += 1
+        return failed
+
+    def _feed_tender(self, entry: Dict[str, Any], column: Dict[str, Any], frontier: FrontierScope,
+                     result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """由信息源条目构建招投标；站点地图条目没有标题，抓取详情页获取标题和字段"""
+        fields = None
+        title = entry['title']
+        if not title:
+            if not frontier.admit(entry['url']):
+                return None
+            page = tender_extractor.fetch_page_conditional(entry['url'], decode=False)
+            if page['status'] != 'ok':
+                return None
+            # 详情页已处理（不是招投标的页面同样记录，下次扫描不再抓取）
+            frontier.remember(entry['url'])
+            result['crawled_urls'].append(entry['url'])
+            try:
+                fields = parse_pool.parse_detail(page['content'], page['encoding'], page['final_url'],
+                                                 archive={'kind': 'detail'})
+            except Exception as e:
+                self.logger.error(f"详情页解析失败 {entry['url']}: {str(e)}")
+                return None
+            title = fields.get('title')
+            # 入库后详情页抓取直接使用已提取的字段
+            detail_fetcher.remember(entry['url'], fields)
+
+        tender = tender_extractor.build_feed_tender(title, entry['url'], entry['lastmod'], fields)
+        if tender:
+            tender['source_url'] = column['url']
+            tender['source_page_title'] = column['title']
+        return tender
+
+    def _page_unchanged(self, page: Dict[str, Any], validator: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """页面内容哈希是否与上次抓取相同（并累计哈希比较统计）"""
+        previous = validator.get('body_hash')
+        if not previous or not page.get('body_hash'):
+            return False
+        result['hash_checks'] += 1
+        if page['body_hash'] != previous:
+            return False
+        result['pages_unchanged'] += 1
+        return True
+
+    def _archive_meta(self, hospital_id: int, column: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """页面归档的来源信息（重放时按此还原招投标的来源栏目）"""
+        if column is None:
+            return {'kind': 'homepage', 'hospital_id': hospital_id}
+        return {'kind': 'list', 'hospital_id': hospital_id,
+                'title': column['title'], 'section': column['section']}
+
+    def _build_tenders(self, html_hash: str, rows: List[tuple],
+                       column: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """将解析进程返回的招投标元组还原为字典并补充来源信息"""
+        tenders = []
+        for row in rows:
+            tender = tender_from_tuple(row)
+            tender['html_hash'] = html_hash
+            if column:
+                tender['source_page_title'] = column['title']
+                tender['source_section'] = column['section']
+            tenders.append(tender)
+        return tenders
+
+    def _apply_result(self, job: Dict[str, Any], result: Dict[str, Any], stats: Dict[str, Any]) -> bool:
+        """保存单家医院的抓取结果并安排下次扫描，返回是否保存成功"""
+        try:
+            hospital = Hospital.query.get(job['hospital_id'])
+            if hospital is None:
+                return False
+
+            for page in result['pages']:
+                self._update_fetch_state(hospital.id, page, stats)
+
+            now = datetime.utcnow()
+            hospital.last_scan_time = now
+            if result['error']:
+                hospital.scan_failed_count = (hospital.scan_failed_count or 0) + 1
+            else:
+                hospital.scan_success_count = (hospital.scan_success_count or 0) + 1
+                hospital.last_success_scan_time = now
+
+            self._update_columns(hospital.id, result, now)
+            self._update_template(hospital.id, result, now)
+            stats['template_hits'] += result['template_hits']
+            stats['template_misses'] += result['template_misses']
+            stats['incremental_stops'] += result['incremental_stops']
+            stats['pagination_pages'] += result['pagination_pages']
+            stats['feed_entries'] += result['feed_entries']
+            stats['hash_checks'] += result['hash_checks']
+            stats['pages_unchanged'] += result['pages_unchanged']
+
+            added: List[TenderRecord] = []
+            new_count = self._store_tenders(hospital, result['tenders'], added)
+            hospital.tender_count = (hospital.tender_count or 0) + new_count
+            self._record_crawled(hospital.id, result['crawled_urls'] + [record.detail_url for record in added])
+
+            # 无法访问时不计入变化统计，只按已有频率安排下次扫描
+            if not result['error']:
+                changes = new_count or (1 if self._lists_changed(job, result) else 0)
+                scan_planner.observe(hospital, changes, now)
+            scan_planner.plan(hospital, now)
+
+            db.session.commit()
+            self._enqueue_details(added)
+
+            stats['hospitals_scanned'] += 1
+            if not job['discover']:
+                stats['homepages_skipped'] += 1
+            if result['error']:
+                stats['failed_hospitals'] += 1
+            stats['tenders_found'] += len(result['tenders'])
+            stats['new_tenders'] += new_count
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"保存医院扫描结果失败 {job['url']}: {str(e)}")
+            return False
+
+    def _lists_changed(self, job: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """栏目列表头部签名是否与上次扫描不同（列表出现新条目，不受页面上计数器等动态内容影响）"""
+        known = {column['url']: column.get('signatures') for column in job['columns']}
+        return any(
+            url in known and signatures[:1] != (known[url] or [])[:1]
+            for url, signatures in result['column_signatures'].items()
+        )
+
+    def _update_fetch_state(self, hospital_id: int, page: Dict[str, Any], stats: Dict[str, Any]):
+        """更新页面抓取状态"""
+        if page['status'] == 'error':
+            return
+
+        url = page['url'][:500]
+        state = PageFetchState.query.filter_by(url=url).first()
+        if state is None:
+            state = PageFetchState(url=url, hospital_id=hospital_id, fetch_count=0, not_modified_count=0)
+            db.session.add(state)
+
+        now = datetime.utcnow()
+        state.hospital_id = hospital_id
+        state.last_status = page['status_code']
+        state.last_fetched_at = now
+        state.fetch_count = (state.fetch_count or 0) + 1
+        stats['pages_fetched'] += 1
+        if page.get('parse_failed') or page.get('index'):
+            # 解析失败的页面清除验证信息和内容哈希，否则下次扫描会当作未变化跳过；
+            # 站点地图索引每次完整读取，才能检查其中的子站点地图
+            state.etag = None
+            state.last_modified = None
+            state.body_hash = None
+            return
+        state.etag = page['etag']
+        state.last_modified = page['last_modified']
+
+        if page['status'] == 'not_modified':
+            state.not_modified_count = (state.not_modified_count or 0) + 1
+            stats['fetches_saved'] += 1
+        else:
+            if page.get('body_hash'):
+                if state.body_hash != page['body_hash']:
+                    state.last_changed_at = now
+                state.body_hash = page['body_hash']
+            elif state.content_length != page['content_length']:
+                state.last_changed_at = now
+            state.content_length = page['content_length']
+
+    def _update_columns(self, hospital_id: int, result: Dict[str, Any], now: datetime):
+        """保存重新识别的栏目，并按本次抓取结果更新各栏目的连续未命中次数"""
+        records = {column.url: column for column in TenderColumn.query.filter_by(hospital_id=hospital_id)}
+
+        discovered = result['discovered_columns']
+        if discovered is not None:
+            found = set()
+            for column in discovered:
+                url = column['url'][:500]
+                if url in found:
+                    continue
+                found.add(url)
+
+                record = records.get(url)
+                if record is None:
+                    record = TenderColumn(hospital_id=hospital_id, url=url, miss_count=0, discovered_at=now)
+                    db.session.add(record)
+                    records[url] = record
+                record.title = (column.get('title') or '')[:200]
+                record.section = column.get('section')
+                record.source = column.get('source')
+                record.confidence = column.get('confidence') or 0
+                record.active = True
+                record.last_discovered_at = now
+
+            # 首页上已不存在的栏目不再直接抓取
+            for url, record in records.items():
+                if url not in found:
+                    record.active = False
+
+        for url, outcome in result['column_outcomes'].items():
+            record = records.get(url[:500])
+            if record is None:
+                continue
+            if outcome == 'hit':
+                record.miss_count = 0
+                record.last_hit_at = now
+            elif outcome == 'miss':
+                record.miss_count = (record.miss_count or 0) + 1
+            elif discovered is not None:
+                # 刚重新识别过且页面未变化，清零未命中计数
+                record.miss_count = 0
+
+        for url, signatures in result['column_signatures'].items():
+            record = records.get(url[:500])
+            if record is not None:
+                record.seen_signatures = json.dumps(signatures)
+
+        for url, updated_at in result['feed_updates'].items():
+            record = records.get(url[:500])
+            if record is not None and (record.feed_updated_at is None or updated_at > record.feed_updated_at):
+                record.feed_updated_at = updated_at
+
+    def _update_template(self, hospital_id: int, result: Dict[str, Any], now: datetime):
+        """更新医院的选择器模板（命中时累计统计，失效或首次识别时保存新学习的模板）"""
+        if not (result['template'] or result['template_hits'] or result['template_misses']):
+            return
+
+        record = SelectorTemplate.query.filter_by(hospital_id=hospital_id).first()
+        if record is None:
+            if not result['template']:
+                return
+            record = SelectorTemplate(hospital_id=hospital_id, hit_count=0, miss_count=0)
+            db.session.add(record)
+
+        record.hit_count = (record.hit_count or 0) + result['template_hits']
+        record.miss_count = (record.miss_count or 0) + result['template_misses']
+        if result['template_hits']:
+            record.last_matched_at = now
+
+        # 已有模板仍然命中时保留原模板
+        learned = result['template']
+        if learned and not result['template_hits']:
+            record.kind = learned['kind']
+            record.selector = learned['selector'][:500]
+            record.row_count = learned['row_count']
+            record.learned_at = now
+
+    def _record_crawled(self, hospital_id: int, urls: List[Optional[str]]):
+        """持久化已处理的详情页URL（抓取边界的精确集合），已记录的URL跳过"""
+        fingerprints: Dict[int, str] = {}
+        for url in urls:
+            fingerprint = url_fingerprint(url) if url else None
+            if fingerprint is not None:
+                fingerprints.setdefault(fingerprint, canonicalize(url) or url)
+        if not fingerprints:
+            return
+
+        existing = {
+            row.fingerprint for row in
+            db.session.query(CrawledUrl.fingerprint).filter(
+                CrawledUrl.hospital_id == hospital_id,
+                CrawledUrl.fingerprint.in_(list(fingerprints))
+            )
+        }
+        for fingerprint, url in fingerprints.items():
+            if fingerprint not in existing:
+                db.session.add(CrawledUrl(hospital_id=hospital_id, fingerprint=fingerprint, url=url[:500]))
+
+    def _enqueue_details(self, records: List[TenderRecord]):
+        """将已提交的新招投标记录的详情页交给后台抓取（不等待）"""
+        items = [(record.id, record.detail_url) for record in records if record.detail_url]
+        if items:
+            detail_fetcher.enqueue(current_app._get_current_object(), items)
+
+    def _store_tenders(self, hospital: Hospital, tenders: List[Dict[str, Any]],
+                       added: List[TenderRecord] = None) -> int:
+        """保存新的招投标记录，返回新增数量（传入added时收集新增的记录对象）"""
+        unique = {}
+        for tender in tenders:
+            if tender.get('content_hash'):
+                unique.setdefault(tender['content_hash'], tender)
+        if not unique:
+            return 0
+
+        existing = {
+            row.content_hash for row in
+            db.session.query(TenderRecord.content_hash).filter(TenderRecord.content_hash.in_(list(unique)))
+        }
+
+        new_count = 0
+        for content_hash, tender in unique.items():
+            if content_hash in existing:
+                continue
+
+            record = TenderRecord(
+                hospital_id=hospital.id,
+                title=tender['title'][:500],
+                content=tender.get('content'),
+                tender_type=tender.get('tender_type', 'other'),
+                tender_category=tender.get('tender_category', 'other'),
+                budget_amount=tender.get('budget_amount'),
+                budget_currency=tender.get('budget_currency', 'CNY'),
+                publish_date=self._parse_date(tender.get('publish_date')),
+                deadline_date=self._parse_date(tender.get('deadline_date')),
+                source_url=(tender.get('source_url') or '')[:500],
+                detail_url=tender.get('detail_url'),
+                content_hash=content_hash,
+                html_hash=tender.get('html_hash'),
+                source_page_title=tender.get('source_page_title'),
+                source_section=tender.get('source_section'),
+                crawl_method=tender.get('crawl_method', 'auto')
+            )
+            db.session.add(record)
+            if added is not None:
+                added.append(record)
+            new_count += 1
+
+        return new_count
+
+    def _parse_date(self, value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d')
+        except (ValueError, TypeError):
+            return None
+
+
+# 创建全局招投标监控服务实例
+tender_monitor = TenderMonitorService()
@@ -0,0 +1,203 @@
+"""
+TLS证书检查
+
+从HTTPS抓取所用的连接中直接读取证书信息，避免为证书检查再建立一次连接，包括：
+- 从响应连接读取对端证书
+- 证书有效期、签发者、SAN域名匹配解析
+- 独立探测结果按域名缓存（TTL不超过证书剩余有效期）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import socket
+import ssl
+import threading
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from app.services.dns_cache import dns_cache
+
+
+def get_peer_certificate(response) -> Optional[Dict[str, Any]]:
+    """
+    读取响应所用连接的对端证书
+
+    需要在响应体读取完成之前调用（stream=True），读取完成后连接会归还连接池。
+
+    Args:
+        response: requests响应对象
+
+    Returns:
+        ssl.getpeercert()格式的证书字典，非HTTPS连接时返回None
+    """
+    raw = getattr(response, 'raw', None)
+    connection = getattr(raw, 'connection', None) or getattr(raw, '_connection', None)
+    sock = getattr(connection, 'sock', None)
+    if sock is None or not hasattr(sock, 'getpeercert'):
+        return None
+
+    try:
+        return sock.getpeercert() or None
+    except (ValueError, OSError):
+        return None
+
+
+def _hostname_matches(hostname: str, names: List[str]) -> bool:
+    """按RFC 6125规则（仅最左侧标签通配）匹配主机名"""
+    hostname = hostname.lower().rstrip('.')
+    for name in names:
+        name = name.lower().rstrip('.')
+        if name == hostname:
+            return True
+        if name.startswith('*.'):
+            suffix = name[1:]
+            if hostname.endswith(suffix) and '.' not in hostname[:-len(suffix)]:
+                return True
+    return False
+
+
+def parse_certificate(cert: Optional[Dict[str, Any]], hostname: str) -> Dict[str, Any]:
+    """
+    解析证书信息
+
+    Args:
+        cert: ssl.getpeercert()格式的证书字典
+        hostname: 访问的主机名（不含端口）
+
+    Returns:
+        证书信息：是否有效、有效期、签发者、SAN及域名是否匹配
+    """
+    info = {
+        'valid': False,
+        'hostname': hostname,
+        'issuer': None,
+        'subject': None,
+        'not_before': None,
+        'not_after': None,
+        'days_remaining': None,
+        'san': [],
+        'hostname_match': False,
+    }
+
+    if not cert:
+        return info
+
+    issuer = dict(item for rdn in cert.get('issuer', ()) for item in rdn)
+    subject = dict(item for rdn in cert.get('subject', ()) for item in rdn)
+    info['issuer'] = issuer.get('organizationName') or issuer.get('commonName')
+    info['subject'] = subject.get('commonName')
+    info['san'] = [value for kind, value in cert.get('subjectAltName', ()) if kind == 'DNS']
+
+    now = time.time()
+    not_before = ssl.cert_time_to_seconds(cert['notBefore']) if cert.get('notBefore') else None
+    not_after = ssl.cert_time_to_seconds(cert['notAfter']) if cert.get('notAfter') else None
+    if not_before is not None:
+        info['not_before'] = datetime.utcfromtimestamp(not_before).isoformat()
+    if not_after is not None:
+        info['not_after'] = datetime.utcfromtimestamp(not_after).isoformat()
+        info['days_remaining'] = int((not_after - now) // 86400)
+
+    names = info['san'] or ([info['subject']] if info['subject'] else [])
+    info['hostname_match'] = _hostname_matches(hostname, names)
+
+    in_validity = (not_before is None or not_before <= now) and (not_after is None or now < not_after)
+    info['valid'] = in_validity and info['hostname_match']
+
+    return info
+
+
+class TlsInspector:
+    """TLS证书检查器（独立探测结果按域名缓存）"""
+
+    def __init__(self, ttl: int = None, failure_ttl: int = None, max_entries: int = None):
+        self.logger = logging.getLogger(__name__)
+
+        crawler_config = Config.CRAWLER_CONFIG
+        self.ttl = ttl or crawler_config.get('SSL_CACHE_TTL', 86400)
+        self.failure_ttl = failure_ttl or crawler_config.get('SSL_FAILURE_TTL', 3600)
+        self.max_entries = max_entries or crawler_config.get('SSL_CACHE_SIZE', 10000)
+
+        # 域名 -> (证书信息, 过期时间)
+        self._cache: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def from_response(self, response, hostname: str) -> Optional[Dict[str, Any]]:
+        """
+        从抓取响应中获取证书信息，并更新该域名的缓存
+
+        Returns:
+            证书信息；响应不是通过HTTPS获取时返回None
+        """
+        cert = getattr(response, 'peer_certificate', None)
+        if not cert:
+            return None
+
+        info = parse_certificate(cert, hostname)
+        self._store(hostname, info)
+        return info
+
+    def probe(self, hostname: str, port: int = 443, timeout: int = 10) -> Dict[str, Any]:
+        """
+        独立握手探测证书（结果缓存，TTL不超过证书剩余有效期）
+
+        Args:
+            hostname: 主机名
+            port: 端口
+            timeout: 超时时间（秒）
+
+        Returns:
+            证书信息
+        """
+        cached = self._get_cached(hostname)
+        if cached is not None:
+            return cached
+
+        info = parse_certificate(None, hostname)
+        try:
+            context = ssl.create_default_context()
+            address = dns_cache.resolve_address(hostname)
+            with socket.create_connection((address, port), timeout=timeout) as sock:
+                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                    info = parse_certificate(ssock.getpeercert(), hostname)
+        except (OSError, ssl.SSLError, ValueError) as e:
+            self.logger.debug(f'SSL证书探测失败 {hostname}: {str(e)}')
+
+        self._store(hostname, info)
+        return info
+
+    def _get_cached(self, hostname: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self._cache.get(hostname)
+            if cached is None:
+                return None
+
+            info, expires_at = cached
+            if expires_at <= time.time():
+                del self._cache[hostname]
+                return None
+
+            self._cache.move_to_end(hostname)
+            return info
+
+    def _store(self, hostname: str, info: Dict[str, Any]):
+        ttl = self.ttl if info['valid'] else self.failure_ttl
+        if info['valid'] and info['not_after']:
+            # 证书即将过期时缩短缓存时间，过期后立即重新探测
+            remaining = (datetime.fromisoformat(info['not_after']) - datetime.utcnow()).total_seconds()
+            ttl = max(0, min(ttl, remaining))
+
+        with self._lock:
+            self._cache[hostname] = (info, time.time() + ttl)
+            self._cache.move_to_end(hostname)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+
+# 创建全局TLS证书检查器实例
+tls_inspector = TlsInspector()
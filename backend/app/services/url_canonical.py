@@ -0,0 +1,151 @@
+"""
+URL规范化
+
+同一页面会以多种等价形式出现在抓取流程中（http/https、末尾斜杠、跟踪参数、
+相对链接拼接、主机名大小写等），统一规范化后再用于抓取和去重，包括：
+- 规范化地址：补全协议、小写协议和主机名、去掉默认端口和片段、
+  解析 . / .. 路径段、统一百分号编码、去掉跟踪参数和会话参数、按参数名排序
+- 去重键：在规范化地址的基础上忽略协议、末尾斜杠和默认首页文件名（index.html等）
+- 指纹：去重键的64位哈希，用于布隆过滤器和持久化的已抓取集合
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import hashlib
+import posixpath
+import re
+from typing import Optional
+from urllib.parse import quote, unquote, urljoin, urlsplit, urlunsplit
+
+# 不影响页面内容的跟踪参数和会话参数
+TRACKING_PARAMS = {
+    'spm', 'fbclid', 'gclid', 'msclkid', 'yclid', 'isappinstalled', 'nsukey', 'clicktime', 'enterid', '_',
+    'jsessionid', 'phpsessid', 'aspsessionid', 'sessionid',
+}
+TRACKING_PREFIXES = ('utm_', 'hmsr', 'hmpl', 'hmcu', 'hmkw', 'hmci')
+
+# 路径参数形式的会话ID：/list.jsp;jsessionid=ABC123
+SESSION_PATH_PATTERN = re.compile(r';(?:jsessionid|phpsessid|sid)=[^/?#]*', re.IGNORECASE)
+
+# 目录的默认首页文件名（去重键中视为目录本身）
+DEFAULT_PAGE_PATTERN = re.compile(r'/(?:index|default)\.(?:s?html?|php|aspx?|jsp)$', re.IGNORECASE)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# 路径和查询参数中不需要编码的字符（RFC 3986 非保留字符和子分隔符）
+PATH_SAFE = "/:@!$&'()*+,;=-._~"
+QUERY_SAFE = "/:@!$'()*+,;=?-._~"
+
+# RFC 3986 非保留字符，编码与否等价
+UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+ESCAPE_PATTERN = re.compile(r'%([0-9A-Fa-f]{2})')
+
+
+def canonicalize(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    规范化URL
+
+    Args:
+        url: 原始地址（可以是相对链接）
+        base: 相对链接所在页面的地址
+
+    Returns:
+        规范化后的地址，不是http/https地址或无法解析时返回None
+    """
+    url = (url or '').strip()
+    if not url or url.startswith(('#', 'javascript:', 'mailto:', 'tel:', 'data:')):
+        return None
+    if base:
+        url = urljoin(base, url)
+    elif url.startswith('//'):
+        url = 'http:' + url
+    elif '://' not in url:
+        url = 'http://' + url
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if scheme not in DEFAULT_PORTS or not host or re.search(r'\s', host):
+        return None
+    try:
+        # 国际化域名统一为punycode
+        host = host.encode('idna').decode('ascii')
+    except UnicodeError:
+        pass
+
+    netloc = f'[{host}]' if ':' in host else host
+    if port and port != DEFAULT_PORTS[scheme]:
+        netloc = f'{netloc}:{port}'
+
+    return urlunsplit((scheme, netloc, _normalize_path(parts.path), _normalize_query(parts.query), ''))
+
+
+def url_key(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    URL去重键：规范化地址去掉协议、末尾斜杠和默认首页文件名
+
+    http/https、/list/ 与 /list、/list/index.html 视为同一页面。
+    """
+    canonical = canonicalize(url, base)
+    if canonical is None:
+        return None
+    parts = urlsplit(canonical)
+    path = DEFAULT_PAGE_PATTERN.sub('/', parts.path).rstrip('/')
+    return f"//{parts.netloc}{path}{'?' + parts.query if parts.query else ''}"
+
+
+def url_fingerprint(url: str, base: Optional[str] = None) -> Optional[int]:
+    """去重键的64位哈希（有符号整数，可直接保存到BIGINT列）"""
+    key = url_key(url, base)
+    if key is None:
+        return None
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def _normalize_escapes(text: str, safe: str) -> str:
+    """统一百分号编码：非保留字符的编码还原，其余编码统一为大写，未编码的非ASCII字符按UTF-8编码"""
+    text = ESCAPE_PATTERN.sub(
+        lambda match: chr(int(match.group(1), 16)) if chr(int(match.group(1), 16)) in UNRESERVED
+        else '%' + match.group(1).upper(),
+        text
+    )
+    # 已有的编码保持原样（可能是GBK等非UTF-8编码）
+    return quote(text, safe=safe + '%')
+
+
+def _normalize_path(path: str) -> str:
+    path = _normalize_escapes(SESSION_PATH_PATTERN.sub('', path), PATH_SAFE)
+    path = re.sub(r'/{2,}', '/', path or '/')
+
+    # 解析 . 和 .. 路径段，保留末尾斜杠
+    normalized = posixpath.normpath(path)
+    if not normalized.startswith('/'):
+        normalized = '/' + normalized.lstrip('.')
+    if normalized.startswith('//'):
+        normalized = '/' + normalized.lstrip('/')
+    if path.endswith('/') and not normalized.endswith('/'):
+        normalized += '/'
+    return normalized
+
+
+def _normalize_query(query: str) -> str:
+    params = []
+    for param in query.split('&'):
+        if not param:
+            continue
+        name, sep, value = param.partition('=')
+        lowered = unquote(name).lower()
+        if lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES):
+            continue
+        params.append((_normalize_escapes(name, QUERY_SAFE), sep, _normalize_escapes(value, QUERY_SAFE)))
+    # 按参数名排序（同名参数保持原有顺序）
+    params.sort(key=lambda item: item[0])
+    return '&'.join(name + sep + value for name, sep, value in params)
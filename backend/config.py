@@ -44,7 +44,63 @@ class Config:
         'MAX_RETRY': 3,         # 最大重试次数
         'DELAY_RANGE': (1, 5),  # 请求延迟范围（秒）
         'MAX_CONCURRENT': 5,    # 最大并发数
+        'BATCH_CONCURRENCY': 50,   # 批量验证全局并发数
+        'PER_HOST_CONCURRENT': 2,  # 单主机并发数
+        'SESSION_POOL_MAX_HOSTS': 1000,  # 会话池保留的主机数
+        'SESSION_POOL_CONNECTIONS': 4,   # 每个会话缓存的连接池数
+        'SESSION_POOL_MAXSIZE': 4,       # 每个主机保持的keep-alive连接数
         'ROBOTS_TXT_CHECK': True,  # 是否检查robots.txt
+        'ROBOTS_CACHE_TTL': 86400,      # robots.txt缓存有效期（秒）
+        'ROBOTS_NEGATIVE_TTL': 21600,   # robots.txt不存在时的缓存有效期（秒）
+        'ROBOTS_ERROR_TTL': 600,        # robots.txt抓取失败时的缓存有效期（秒）
+        'ROBOTS_CACHE_SIZE': 10000,     # robots.txt缓存最大主机数
+        'ROBOTS_CACHE_PERSIST': False,  # 是否将robots.txt缓存持久化到数据库
+        'SSL_CACHE_TTL': 86400,         # SSL证书探测结果缓存有效期（秒）
+        'SSL_FAILURE_TTL': 3600,        # SSL证书探测失败的缓存有效期（秒）
+        'SSL_CACHE_SIZE': 10000,        # SSL证书缓存最大域名数
+        'DNS_CACHE_TTL': 300,           # DNS解析结果缓存时间（秒）
+        'DNS_NEGATIVE_TTL': 60,         # DNS解析失败缓存时间（秒）
+        'DNS_CACHE_SIZE': 20000,        # DNS缓存最大域名数
+        'MAX_CONTENT_BYTES': 2 * 1024 * 1024,  # 单个页面最大读取字节数
+        'STREAM_CHUNK_SIZE': 16384,     # 流式读取块大小（字节）
+        'HTML_CONTENT_TYPES': ('text/html', 'application/xhtml+xml'),  # 允许下载的内容类型
+        'HTML_PARSER': 'lxml',          # HTML解析后端：lxml / html5lib / html.parser
+        'ENCODING_CACHE_SIZE': 10000,   # 页面编码识别结果缓存的主机数
+        'ENCODING_DETECT_BYTES': 32768, # 统计检测编码时读取的文档开头字节数
+        'VERIFY_JOB_CONCURRENCY': 20,   # 批量验证任务并发数
+        'VERIFY_COMMIT_BATCH_SIZE': 50, # 批量验证结果每批提交数量
+        'PARSE_WORKERS': None,          # 页面解析进程数（None为CPU核数，0为在抓取线程内解析）
+        'TEMPLATE_MIN_ROWS': 3,         # 学习选择器模板时至少覆盖的招投标行数
+        'INCREMENTAL_MODE': True,       # 栏目列表页增量解析（遇到上次已知的条目即停止）
+        'INCREMENTAL_SIGNATURES': 10,   # 每个栏目记录的列表头部条目签名数
+        'INCREMENTAL_STOP_AFTER': 2,    # 连续遇到多少条已知条目后停止（避免置顶条目导致过早停止）
+        'PAGINATION_MAX_PAGES': 5,      # 定时扫描时每个栏目最多跟随的分页数（含第1页）
+        'BACKFILL_MAX_PAGES': 500,      # 首次补抓时每个栏目最多跟随的分页数（含第1页）
+        'PAGINATION_CONCURRENCY': 2,    # 分页并发抓取数（同一主机）
+        'DETAIL_FETCH_ENABLED': True,   # 是否在后台抓取新招投标的详情页补全字段
+        'DETAIL_CONCURRENCY': 10,       # 详情页抓取全局并发数
+        'DETAIL_PER_HOST_CONCURRENT': 1,  # 详情页抓取单主机并发数
+        'DETAIL_BATCH_SIZE': 50,        # 详情页每批抓取和更新的记录数
+        'DETAIL_QUEUE_SIZE': 10000,     # 详情页待抓取队列上限（超出时丢弃）
+        'DETAIL_CACHE_SIZE': 5000,      # 详情页提取结果缓存的URL数
+        'DETAIL_CACHE_TTL': 86400,      # 详情页提取结果缓存有效期（秒）
+        'DETAIL_IDLE_TIMEOUT': 60,      # 详情页抓取线程空闲多久后退出（秒）
+        'DETAIL_CONTENT_LIMIT': 20000,  # 详情页正文保存的最大字符数
+        'ARCHIVE_ENABLED': True,        # 是否压缩归档抓取到的页面（供提取规则改进后离线重放）
+        'ARCHIVE_DIR': os.environ.get('ARCHIVE_DIR') or \
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive'),  # 归档目录
+        'ARCHIVE_FILE_MAX_SIZE': 256 * 1024 * 1024,  # 单个归档文件大小上限（字节），超出后滚动到新文件
+        'ARCHIVE_COMPRESS_LEVEL': 6,    # 归档压缩级别（zlib 1-9）
+        'ARCHIVE_QUEUE_SIZE': 1000,     # 待写入归档的页面队列上限（超出时丢弃）
+        'REPLAY_COMMIT_BATCH_SIZE': 100,  # 归档重放每批提交的页面数
+        'FEED_DISCOVERY_ENABLED': True,  # 识别栏目时是否同时发现站点地图和订阅源（有可用信息源时代替列表页抓取）
+        'FEED_PROBE_PATHS': ('/sitemap.xml', '/sitemap_index.xml', '/rss.xml', '/feed', '/atom.xml'),  # robots.txt未声明站点地图时探测的路径
+        'FEED_MAX_BYTES': 50 * 1024 * 1024,  # 单个站点地图最多读取的字节数（解压后）
+        'FEED_MAX_SITEMAPS': 10,        # 站点地图索引中每次最多读取的子站点地图数
+        'FEED_MAX_ENTRIES': 20,         # 每个信息源每次扫描最多处理的新招投标条目数
+        'FRONTIER_ENABLED': True,       # 是否启用抓取边界（单次扫描内URL去重、跨扫描记录已处理的详情页）
+        'FRONTIER_BLOOM_CAPACITY': 200000,  # 单次扫描布隆过滤器的预计URL数（超过后误判率上升）
+        'FRONTIER_BLOOM_ERROR_RATE': 0.001,  # 布隆过滤器误判率（误判的URL本次扫描跳过，下次扫描重新判断）
     }
     
     # 搜索引擎API配置
@@ -56,9 +112,20 @@ class Config:
     
     # 定时任务配置
     SCHEDULER_CONFIG = {
-        'TENDER_SCAN_INTERVAL': 6,  # 招投标扫描间隔（小时）
+        'TENDER_SCAN_INTERVAL': 6,  # 尚无扫描历史的医院的招投标扫描间隔（小时）
         'HOSPITAL_SCAN_INTERVAL': 24,  # 医院扫描间隔（小时）
         'DAILY_REPORT_TIME': '02:00',  # 每日报告时间
+        'MAX_TENDER_COLUMNS': 10,  # 每家医院最多扫描的招投标栏目数
+        'COLUMN_REDISCOVERY_HOURS': 72,  # 重新抓取首页识别招投标栏目的周期（小时）
+        'COLUMN_MAX_MISSES': 3,    # 栏目连续未命中多少次后提前重新识别
+        'TENDER_SCAN_TICK_MINUTES': 15,  # 检查到期医院的周期（分钟）
+        'SCAN_MIN_INTERVAL_HOURS': 1,    # 单家医院最小扫描间隔（小时）
+        'SCAN_MAX_INTERVAL_HOURS': 168,  # 单家医院最大扫描间隔（小时）
+        'SCAN_TARGET_EVENTS': 0.5,       # 每次扫描预计出现的新数据数，据此由发布/变化频率换算扫描间隔
+        'SCAN_RATE_WINDOW_DAYS': 90,     # 统计发布频率的时间窗口（天）
+        'SCAN_CHANGE_SMOOTHING': 0.3,    # 变化数和扫描间隔的指数滑动平均系数
+        'SCAN_JITTER': 0.1,              # 扫描间隔的随机抖动比例
+        'SCAN_MAX_DUE_HOSPITALS': 500,   # 每次最多扫描的到期医院数
     }
     
     # 文件上传配置
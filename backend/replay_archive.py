@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+归档页面重放脚本
+
+提取规则改进后，按当前规则离线重新提取归档页面中的招投标信息并入库，
+不访问网络，也不需要重新抓取医院网站。
+
+用法：
+    python replay_archive.py [--since 2025-11-01] [--until 2025-12-01] [--hospital 1 --hospital 2] [--dry-run]
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.services.task_scheduler import stop_scheduler
+from app.services.tender_monitor import tender_monitor
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='归档页面离线重放')
+    arg_parser.add_argument('--since', type=parse_date, help='起始抓取日期（含），格式YYYY-MM-DD')
+    arg_parser.add_argument('--until', type=parse_date, help='截止抓取日期（不含），格式YYYY-MM-DD')
+    arg_parser.add_argument('--hospital', type=int, action='append', dest='hospital_ids', help='医院ID，可重复指定')
+    arg_parser.add_argument('--dry-run', action='store_true', help='只统计不入库')
+    args = arg_parser.parse_args()
+
+    app = create_app(os.environ.get('FLASK_CONFIG', 'development'))
+    # 重放不需要定时任务
+    stop_scheduler()
+
+    with app.app_context():
+        stats = tender_monitor.replay_archive(
+            since=args.since,
+            until=args.until,
+            hospital_ids=args.hospital_ids,
+            dry_run=args.dry_run
+        )
+
+    for key, value in stats.items():
+        print(f'{key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
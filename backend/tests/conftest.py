@@ -0,0 +1,33 @@
+"""
+测试配置：将backend目录加入模块搜索路径，并提供只初始化数据库的应用
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from flask import Flask
+
+from app import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    """只初始化数据库的应用（不启动任务调度器）；文件数据库供后台线程共享"""
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'test.db'}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
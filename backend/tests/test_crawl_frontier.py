@@ -0,0 +1,50 @@
+"""
+抓取边界测试（按医院划分范围）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import threading
+
+from app.services.crawl_frontier import CrawlFrontier
+from app.services.url_canonical import url_fingerprint
+
+SHARED = 'http://group.example.cn/zbcg/index.html'
+
+
+def test_shared_column_admitted_once_per_hospital():
+    frontier = CrawlFrontier(capacity=1000)
+    first, second = frontier.scope(1), frontier.scope(2)
+
+    assert first.admit(SHARED)
+    assert second.admit('https://group.example.cn/zbcg/')
+    assert not first.admit('http://group.example.cn/zbcg')
+    assert frontier.stats == {'admitted': 2, 'duplicates': 1, 'known_skips': 0}
+
+
+def test_known_urls_scoped_to_hospital():
+    frontier = CrawlFrontier([(1, url_fingerprint(SHARED))], capacity=1000)
+
+    assert frontier.scope(1).is_known(SHARED)
+    assert not frontier.scope(2).is_known(SHARED)
+    frontier.scope(2).remember(SHARED)
+    assert frontier.scope(2).is_known(SHARED)
+
+
+def test_stats_consistent_across_threads():
+    frontier = CrawlFrontier(capacity=100000)
+    scope = frontier.scope(1)
+
+    def worker(offset):
+        for number in range(2000):
+            scope.admit(f'http://a.example.cn/{number % 1000}?worker={offset}')
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert frontier.stats['admitted'] + frontier.stats['duplicates'] == 8000
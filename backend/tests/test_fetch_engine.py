@@ -0,0 +1,57 @@
+"""
+异步批量抓取引擎测试（结果回调）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import threading
+import time
+
+from app.services.fetch_engine import run_batch
+
+
+def test_on_result_runs_in_calling_thread():
+    caller = threading.get_ident()
+    threads = []
+
+    results = run_batch(range(5), lambda item: item * 2, key_func=lambda item: f'engine-caller-{item}',
+                        on_result=lambda index, item, result: threads.append(threading.get_ident()))
+
+    assert results == [0, 2, 4, 6, 8]
+    assert threads == [caller] * 5
+
+
+def test_slow_on_result_does_not_block_dispatch():
+    finished = []
+
+    def worker(item):
+        finished.append(time.monotonic())
+        return item
+
+    def on_result(index, item, result):
+        # 模拟数据库提交
+        time.sleep(0.2)
+
+    started = time.monotonic()
+    run_batch(range(6), worker, max_concurrency=2, key_func=lambda item: f'engine-slow-{item}',
+              on_result=on_result)
+
+    # 全部任务在第一批回调处理完之前就已执行
+    assert max(finished) - started < 0.2
+
+
+def test_on_result_exception_does_not_abort_batch():
+    handled = []
+
+    def on_result(index, item, result):
+        if item == 1:
+            raise RuntimeError('提交失败')
+        handled.append(item)
+
+    results = run_batch(range(4), lambda item: item, key_func=lambda item: f'engine-error-{item}',
+                        on_result=on_result)
+
+    assert results == [0, 1, 2, 3]
+    assert sorted(handled) == [0, 2, 3]
@@ -0,0 +1,55 @@
+"""
+HTML编码识别测试（声明与内容不一致）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import pytest
+
+from app.services.html_decoder import HtmlDecoder
+
+TEXT = '某某市人民医院医疗设备采购项目招标公告，投标截止时间为2025年11月18日。'
+
+
+def page(encoding, meta=None):
+    head = f'<meta charset="{meta}">' if meta else ''
+    return f'<html><head>{head}<title>招标公告</title></head><body><p>{TEXT * 5}</p></body></html>'.encode(encoding)
+
+
+@pytest.fixture
+def decoder():
+    return HtmlDecoder()
+
+
+def test_gbk_header_on_utf8_body(decoder):
+    assert decoder.resolve(page('utf-8'), 'text/html; charset=GBK') == 'utf-8'
+
+
+def test_gbk_meta_on_utf8_body(decoder):
+    assert decoder.resolve(page('utf-8', meta='gb2312'), 'text/html') == 'utf-8'
+
+
+def test_gbk_header_and_meta_on_utf8_body(decoder):
+    assert decoder.resolve(page('utf-8', meta='gbk'), 'text/html; charset=gbk') == 'utf-8'
+
+
+def test_gbk_header_on_gbk_body(decoder):
+    assert decoder.resolve(page('gbk'), 'text/html; charset=gbk') == 'gb18030'
+    assert decoder.stats['header'] == 1
+
+
+def test_utf8_header_on_gbk_body_uses_meta(decoder):
+    content = page('gbk', meta='gbk')
+    assert decoder.resolve(content, 'text/html; charset=utf-8') == 'gb18030'
+    assert decoder.stats['meta'] == 1
+
+
+def test_ascii_body_keeps_declared_encoding(decoder):
+    assert decoder.resolve(b'<html><body>2025-11-18</body></html>', 'text/html; charset=gbk') == 'gb18030'
+
+
+def test_cached_gbk_not_applied_to_utf8_page(decoder):
+    decoder.resolve(page('gbk'), 'text/html; charset=gbk', host='hospital.example.cn')
+    assert decoder.resolve(page('utf-8'), 'text/html', host='hospital.example.cn') == 'utf-8'
@@ -0,0 +1,34 @@
+"""
+HTTP会话池测试（会话淘汰）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import gc
+import weakref
+
+from app.services.http_pool import HttpSessionPool
+
+
+def test_evicted_session_stays_usable_while_referenced():
+    pool = HttpSessionPool(max_hosts=1)
+    in_use = pool.get_session('http://a.example.cn/')
+    closed = []
+    in_use.close = lambda: closed.append(True)
+
+    pool.get_session('http://b.example.cn/')
+
+    assert pool.get_stats()['sessions_evicted'] == 1
+    assert closed == []
+
+
+def test_evicted_session_released_when_unused():
+    pool = HttpSessionPool(max_hosts=1)
+    evicted = weakref.ref(pool.get_session('http://a.example.cn/'))
+
+    pool.get_session('http://b.example.cn/')
+    gc.collect()
+
+    assert evicted() is None
@@ -0,0 +1,117 @@
+"""
+列表增量截断测试（置顶条目）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import pytest
+
+from app.services.incremental_cutoff import IncrementalCutoff
+from app.services.parse_pool import parse_page
+
+URL = 'http://hospital.example.cn/zbcg/'
+PINNED = (0, '【置顶】医院采购管理办法招标公告', 1)
+OLD = [(number, f'设备采购项目{number}招标公告', number) for number in range(1, 5)]
+NEW = (9, '新增设备采购项目9招标公告', 9)
+
+# 不匹配页面结构的模板（医院只保存一个模板，其他栏目会回退到启发式提取）
+STALE_TEMPLATE = {'kind': 'table', 'selector': 'table.nomatch > tr', 'row_count': 5}
+
+
+def build_page(rows):
+    items = ''.join(
+        f'<li><a href="/zbcg/{number}.html">{title}</a><span>2025-11-{day:02d}</span></li>'
+        for number, title, day in rows
+    )
+    return f'<html><body><ul class="news-list">{items}</ul></body></html>'.encode('utf-8')
+
+
+def parse(rows, template, known):
+    return parse_page(build_page(rows), 'utf-8', URL, templated=True, template=template, known_signatures=known)
+
+
+@pytest.fixture(scope='module')
+def first_scan():
+    return parse([PINNED] + OLD, None, [])
+
+
+def titles(result):
+    return [row[0] for row in result.tenders]
+
+
+@pytest.mark.parametrize('template_kind', ['learned', 'none', 'stale'])
+def test_new_row_below_pinned_row_is_extracted(first_scan, template_kind):
+    template = {'learned': first_scan.template, 'none': None, 'stale': STALE_TEMPLATE}[template_kind]
+    result = parse([PINNED, NEW] + OLD, template, first_scan.signatures)
+
+    assert any('9' in title for title in titles(result))
+    assert not any('置顶' in title for title in titles(result))
+    assert result.stopped
+
+
+@pytest.mark.parametrize('template_kind', ['learned', 'none'])
+def test_unchanged_list_stops_without_new_rows(first_scan, template_kind):
+    template = first_scan.template if template_kind == 'learned' else None
+    result = parse([PINNED] + OLD, template, first_scan.signatures)
+
+    assert result.tenders == []
+    assert result.stopped
+
+
+def test_each_heuristic_row_counted_once(first_scan):
+    # 列表项和其中的链接只登记一个签名
+    assert len(first_scan.signatures) == len(OLD) + 1
+
+
+def test_leading_known_rows_do_not_stop():
+    cutoff = IncrementalCutoff(['pinned-1', 'pinned-2', 'old-1', 'old-2'], stop_after=2)
+    assert cutoff.check('pinned-1') and cutoff.check('pinned-2')
+    assert not cutoff.stopped
+    assert not cutoff.check('new-1')
+    cutoff.check('old-1')
+    cutoff.check('old-2')
+    assert cutoff.stopped
+
+
+def test_finish_stops_page_with_only_known_rows():
+    cutoff = IncrementalCutoff(['a', 'b'], stop_after=2)
+    cutoff.check('a')
+    cutoff.check('b')
+    assert not cutoff.stopped
+    cutoff.finish()
+    assert cutoff.stopped
+
+
+def test_pagination_after_all_new_first_page(monkeypatch):
+    from app.services.parse_pool import parse_pool
+    from app.services.tender_extractor import tender_extractor
+
+    previous = parse(OLD, None, [])
+    # 本次扫描第1页全部是新条目，上次的头部条目被挤到第2页开头，其后是更早的条目
+    newer = [(number, f'新增设备采购项目{number}招标公告', number) for number in range(10, 15)]
+    older = [(number, f'历史设备采购项目{number}招标公告', number) for number in range(20, 25)]
+    first = parse(newer, None, previous.signatures)
+    assert not first.stopped and first.tenders
+
+    second_url = URL + 'index_1.html'
+    content = build_page(OLD + older)
+    monkeypatch.setattr(parse_pool, 'max_workers', 0)
+    monkeypatch.setattr(tender_extractor, 'fetch_page_conditional', lambda url, decode=True: {
+        'url': url, 'final_url': url, 'status': 'ok', 'encoding': 'utf-8', 'content': content})
+
+    pages = list(tender_extractor.follow_pagination({'next_url': second_url}, max_pages=5,
+                                                    known_signatures=previous.signatures))
+
+    assert len(pages) == 1
+    _, parsed = pages[0]
+    assert parsed.stopped
+    assert parsed.tenders == []
+
+
+def test_continued_page_counts_leading_known_rows():
+    cutoff = IncrementalCutoff(['old-1', 'old-2'], stop_after=2, continued=True)
+    cutoff.check('old-1')
+    cutoff.check('old-2')
+    assert cutoff.stopped
@@ -0,0 +1,71 @@
+"""
+礼貌抓取调度器测试（挑选主机时占用时间片）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import threading
+import time
+
+from app.services import politeness
+from app.services.politeness import PolitenessScheduler
+
+
+def test_picked_host_not_picked_again():
+    scheduler = PolitenessScheduler(delay_range=(5, 5))
+
+    host, wait = scheduler.pick_and_claim(['a.example.cn', 'b.example.cn'])
+    assert (host, wait) == ('a.example.cn', 0.0)
+    host, wait = scheduler.pick_and_claim(['a.example.cn', 'b.example.cn'])
+    assert (host, wait) == ('b.example.cn', 0.0)
+    host, wait = scheduler.pick_and_claim(['a.example.cn', 'b.example.cn'])
+    assert host is None and 4 < wait <= 5
+
+
+def test_claimed_slot_used_by_picking_task():
+    scheduler = PolitenessScheduler(delay_range=(5, 5))
+    scheduler.pick_and_claim(['a.example.cn'])
+
+    with scheduler.claimed('a.example.cn'):
+        started = time.monotonic()
+        scheduler.acquire('a.example.cn')
+        assert time.monotonic() - started < 0.5
+        # 时间片只能使用一次
+        assert scheduler.try_acquire('a.example.cn') > 4
+
+
+def test_claimed_slot_not_used_by_other_threads():
+    scheduler = PolitenessScheduler(delay_range=(5, 5))
+    scheduler.pick_and_claim(['a.example.cn'])
+    waits = []
+
+    with scheduler.claimed('a.example.cn'):
+        # 详情页抓取、医院搜索等其他线程不能使用任务占用的时间片
+        other = threading.Thread(target=lambda: waits.append(scheduler.try_acquire('a.example.cn')))
+        other.start()
+        other.join()
+        assert waits[0] > 4
+        assert scheduler.try_acquire('a.example.cn') == 0.0
+
+
+def test_unused_claim_released_after_task():
+    scheduler = PolitenessScheduler(delay_range=(5, 5))
+    scheduler.pick_and_claim(['a.example.cn'])
+    with scheduler.claimed('a.example.cn'):
+        pass
+    assert scheduler.try_acquire('a.example.cn') > 4
+
+
+def test_idle_hosts_pruned_automatically(monkeypatch):
+    scheduler = PolitenessScheduler(delay_range=(0, 0))
+    for number in range(100):
+        scheduler.try_acquire(f'h{number}.example.cn')
+
+    monkeypatch.setattr(politeness, 'MAX_IDLE_SECONDS', 0)
+    monkeypatch.setattr(politeness, 'CLEANUP_INTERVAL', 0)
+    time.sleep(0.01)
+    scheduler.pick_and_claim(['new.example.cn'])
+
+    assert list(scheduler._next_allowed) == ['new.example.cn']
@@ -0,0 +1,117 @@
+"""
+招投标扫描计划测试
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import Hospital, Region, TenderRecord
+from app.services.scan_planner import ScanPlanner
+
+NOW = datetime(2025, 11, 18, 8, 0)
+
+
+@pytest.fixture
+def planner():
+    planner = ScanPlanner()
+    planner.jitter = 0
+    planner.default_hours, planner.min_hours, planner.max_hours = 6, 1, 168
+    planner.target_events, planner.smoothing = 0.5, 0.3
+    return planner
+
+
+def scanned(planner, hospital, changes_per_scan, hours, scans=30):
+    """按固定间隔连续扫描，每次发现相同数量的变化"""
+    now = NOW
+    planner.observe(hospital, 0, now)
+    for _ in range(scans):
+        now += timedelta(hours=hours)
+        planner.observe(hospital, changes_per_scan, now)
+    return now
+
+
+def test_first_scan_uses_default_interval(planner):
+    hospital = Hospital()
+    planner.observe(hospital, 3, NOW)
+
+    assert hospital.last_tender_scan_at == NOW
+    assert hospital.change_rate is None
+    assert planner.interval_hours(hospital) == 6
+
+
+def test_prior_damps_single_observation(planner):
+    hospital = Hospital()
+    planner.observe(hospital, 0, NOW)
+    planner.observe(hospital, 0, NOW + timedelta(hours=6))
+
+    # 一次没有变化的扫描不会直接把间隔推到上限
+    assert 6 < planner.interval_hours(hospital) < 168
+
+
+def test_rate_is_changes_over_elapsed_time(planner):
+    hospital = Hospital()
+    scanned(planner, hospital, 1, hours=12)
+
+    assert float(hospital.change_rate) == pytest.approx(2.0, rel=0.01)
+    assert planner.interval_hours(hospital) == pytest.approx(6, rel=0.01)
+
+
+def test_every_scan_changing_clamps_to_min_interval(planner):
+    hospital = Hospital()
+    scanned(planner, hospital, 20, hours=1)
+
+    assert planner.interval_hours(hospital) == 1
+
+
+def test_no_changes_clamps_to_max_interval(planner):
+    hospital = Hospital()
+    scanned(planner, hospital, 0, hours=48)
+
+    assert planner.interval_hours(hospital) == 168
+
+
+def test_publish_rate_used_when_higher(planner):
+    hospital = Hospital(change_rate=0.01, publish_rate=4)
+    assert planner.interval_hours(hospital) == pytest.approx(3)
+
+
+def test_plan_counts_recent_publications(app, planner):
+    region = Region(name='测试市', code='990001', level='city')
+    db.session.add(region)
+    db.session.flush()
+    hospital = Hospital(name='测试医院', region_id=region.id, website_url='http://plan.example.cn')
+    db.session.add(hospital)
+    db.session.flush()
+    for day in range(45):
+        db.session.add(TenderRecord(hospital_id=hospital.id, title=f'招标公告{day}', content_hash=f'plan-{day}',
+                                    publish_date=NOW - timedelta(days=day)))
+    db.session.commit()
+
+    next_scan = planner.plan(hospital, NOW)
+
+    assert float(hospital.publish_rate) == pytest.approx(0.5)
+    assert next_scan == NOW + timedelta(hours=24)
+
+
+def test_due_hospitals_skip_empty_urls_and_future_scans(app, planner):
+    region = Region(name='测试市', code='990002', level='city')
+    db.session.add(region)
+    db.session.flush()
+    db.session.add_all([
+        Hospital(name='从未扫描', region_id=region.id, website_url='http://a.example.cn'),
+        Hospital(name='已到期', region_id=region.id, website_url='http://b.example.cn',
+                 next_scan_at=NOW - timedelta(hours=1)),
+        Hospital(name='未到期', region_id=region.id, website_url='http://c.example.cn',
+                 next_scan_at=NOW + timedelta(hours=1)),
+        Hospital(name='空地址', region_id=region.id, website_url=''),
+        Hospital(name='无地址', region_id=region.id),
+    ])
+    db.session.commit()
+
+    assert [hospital.name for hospital in planner.due_hospitals(NOW)] == ['从未扫描', '已到期']
@@ -0,0 +1,76 @@
+"""
+URL规范化测试
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import pytest
+
+from app.services.url_canonical import canonicalize, url_fingerprint, url_key
+
+
+@pytest.mark.parametrize('url, expected', [
+    # 跟踪参数和会话参数去掉，其余参数按名称排序
+    ('http://example.cn/list?utm_source=wx&b=2&spm=a.b&a=1', 'http://example.cn/list?a=1&b=2'),
+    ('http://example.cn/list?fbclid=x&_=1700000000', 'http://example.cn/list'),
+    ('http://example.cn/detail?id=5&JSESSIONID=abc', 'http://example.cn/detail?id=5'),
+    # 路径参数形式的会话ID
+    ('https://example.cn/list.jsp;jsessionid=ABC123?id=5', 'https://example.cn/list.jsp?id=5'),
+    # . 和 .. 路径段
+    ('http://example.cn/a/./b/../c', 'http://example.cn/a/c'),
+    ('http://example.cn/a/../../b', 'http://example.cn/b'),
+    ('http://example.cn//zbcg///list/', 'http://example.cn/zbcg/list/'),
+    # 默认端口、主机名大小写、片段
+    ('HTTP://Example.CN:80/zbcg/#top', 'http://example.cn/zbcg/'),
+    ('https://example.cn:443/', 'https://example.cn/'),
+    ('http://example.cn:8080/', 'http://example.cn:8080/'),
+    # 国际化域名
+    ('http://医院.中国/zbcg/', 'http://xn--ekrs67m.xn--fiqs8s/zbcg/'),
+    # GBK编码的参数保持原有字节，编码统一为大写
+    ('http://example.cn/search?q=%d5%d0%b1%ea', 'http://example.cn/search?q=%D5%D0%B1%EA'),
+    # 非保留字符的编码还原，未编码的中文按UTF-8编码
+    ('http://example.cn/%7Euser/%41', 'http://example.cn/~user/A'),
+    ('http://example.cn/招标/', 'http://example.cn/%E6%8B%9B%E6%A0%87/'),
+    # 缺少协议
+    ('//example.cn/a', 'http://example.cn/a'),
+    ('example.cn/a', 'http://example.cn/a'),
+])
+def test_canonicalize(url, expected):
+    assert canonicalize(url) == expected
+
+
+@pytest.mark.parametrize('url', ['', '#top', 'javascript:void(0)', 'mailto:a@example.cn', 'ftp://example.cn/a',
+                                 'http://exa mple.cn/'])
+def test_canonicalize_rejects(url):
+    assert canonicalize(url) is None
+
+
+def test_relative_link_resolved_against_base():
+    assert canonicalize('../list_2.html', 'http://example.cn/zbcg/list/index.html') == \
+        'http://example.cn/zbcg/list_2.html'
+
+
+@pytest.mark.parametrize('url', [
+    'http://example.cn/zbcg/',
+    'https://example.cn/zbcg',
+    'http://example.cn/zbcg/index.html',
+    'http://EXAMPLE.cn:80/zbcg/default.aspx',
+    'http://example.cn/zbcg/index.htm?utm_medium=feed',
+])
+def test_index_pages_fold_to_one_key(url):
+    assert url_key(url) == '//example.cn/zbcg'
+    assert url_fingerprint(url) == url_fingerprint('http://example.cn/zbcg')
+
+
+def test_distinct_pages_keep_distinct_fingerprints():
+    assert url_fingerprint('http://example.cn/zbcg/?page=2') != url_fingerprint('http://example.cn/zbcg/')
+    assert url_fingerprint('http://example.cn/zbcg/list.html') != url_fingerprint('http://example.cn/zbcg/')
+    assert url_fingerprint('http://example.cn:8080/zbcg/') != url_fingerprint('http://example.cn/zbcg/')
+
+
+def test_fingerprint_fits_signed_bigint():
+    fingerprint = url_fingerprint('http://example.cn/zbcg/1.html')
+    assert -2 ** 63 <= fingerprint < 2 ** 63
+    assert url_fingerprint('javascript:void(0)') is None
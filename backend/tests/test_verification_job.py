@@ -0,0 +1,51 @@
+"""
+医院官网批量验证任务测试（验证结果提交）
+
+作者：MiniMax Agent
+版本：v1.0
+日期：2025-11-18
+"""
+
+import threading
+
+from app import db
+from app.models import Hospital, Region
+from app.services import verification_job as verification_module
+from app.services.verification_job import VerificationJob, VerificationJobManager
+
+
+def add_hospitals(count):
+    region = Region(name='测试市', code='990000', level='city')
+    db.session.add(region)
+    db.session.flush()
+    for number in range(count):
+        db.session.add(Hospital(name=f'测试医院{number}', region_id=region.id,
+                                website_url=f'http://h{number}.verify.example.cn'))
+    db.session.commit()
+
+
+def test_results_committed_on_job_thread(app, monkeypatch):
+    add_hospitals(5)
+    manager = VerificationJobManager()
+    manager.commit_batch_size = 2
+
+    job_thread = threading.get_ident()
+    flush_threads = []
+    flush = manager._flush
+
+    def record_flush(job, pending):
+        flush_threads.append(threading.get_ident())
+        flush(job, pending)
+
+    monkeypatch.setattr(manager, '_flush', record_flush)
+    monkeypatch.setattr(verification_module.crawler_service, 'verify_website',
+                        lambda url: {'is_valid': '1' in url or '3' in url, 'url': url})
+
+    job = VerificationJob('verify_test', {})
+    manager._run_job(app, job)
+
+    assert job.status == 'success'
+    assert (job.processed, job.verified_count, job.failed_count, job.committed) == (5, 2, 3, 5)
+    assert set(flush_threads) == {job_thread}
+    assert Hospital.query.filter(Hospital.verified.is_(True)).count() == 2
+    assert Hospital.query.filter(Hospital.verification_date.isnot(None)).count() == 5